@@ -56,11 +56,15 @@ DEFAULT_INSTALLED_APPS = [
     "coltrane",
 ]
 
-COLTRANE_SETTINGS_THAT_ARE_ARRAYS = ("EXTRA_FILE_NAMES",)
+COLTRANE_SETTINGS_THAT_ARE_ARRAYS = (
+    "EXTRA_FILE_NAMES",
+    "CONTENT_IGNORE_PATTERNS",
+)
 COLTRANE_SETTINGS_THAT_ARE_BOOLEANS = (
     "DISABLE_WILDCARD_TEMPLATES",
     "IS_SECURE",
     "DATA_JSON5",
+    "SERVE_OUTPUT",
 )
 
 
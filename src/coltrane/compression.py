@@ -0,0 +1,177 @@
+"""
+Pre-compresses generated HTML and XML files when building so that the compressed files can be served
+as-is instead of compressing every response.
+"""
+
+import gzip
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import cache
+from pathlib import Path
+
+from coltrane.module_finder import is_brotli_installed, is_zstandard_installed
+
+# Suffixes of generated files that get pre-compressed; static files are compressed by `whitenoise`
+COMPRESSIBLE_SUFFIXES = (".html", ".xml")
+
+
+@dataclass
+class Encoding:
+    # The value of the `Accept-Encoding` and `Content-Encoding` headers, i.e. "gzip"
+    name: str
+
+    # Appended to the name of the generated file for the compressed file, i.e. ".gz"
+    suffix: str
+
+    compress: Callable[[bytes], bytes]
+
+    def get_compressed_path(self, path: Path) -> Path:
+        return path.with_name(f"{path.name}{self.suffix}")
+
+
+def _compress_with_gzip(content: bytes) -> bytes:
+    # Set `mtime` so that the same content always compresses to the same bytes
+    return gzip.compress(content, compresslevel=9, mtime=0)
+
+
+def _compress_with_brotli(content: bytes) -> bytes:
+    import brotli  # type: ignore
+
+    return brotli.compress(content, quality=11)
+
+
+def _compress_with_zstandard(content: bytes) -> bytes:
+    import zstandard  # type: ignore
+
+    return zstandard.ZstdCompressor(level=19).compress(content)
+
+
+@cache
+def get_encodings() -> list[Encoding]:
+    """
+    Gets the encodings that are available, in order of preference. `gzip` is always available;
+    `brotli` and `zstd` require the `compression` extras.
+    """
+
+    encodings = []
+
+    if is_brotli_installed():
+        encodings.append(Encoding(name="br", suffix=".br", compress=_compress_with_brotli))
+
+    if is_zstandard_installed():
+        encodings.append(Encoding(name="zstd", suffix=".zst", compress=_compress_with_zstandard))
+
+    encodings.append(Encoding(name="gzip", suffix=".gz", compress=_compress_with_gzip))
+
+    return encodings
+
+
+def compress_file(path: Path, encodings: list[Encoding]) -> int:
+    """
+    Writes a compressed file next to `path` for each encoding. Compressed files that are newer than `path`
+    are skipped. Returns the number of compressed files that were written.
+    """
+
+    mtime_ns = path.stat().st_mtime_ns
+    content = None
+    compressed_count = 0
+
+    for encoding in encodings:
+        compressed_path = encoding.get_compressed_path(path)
+
+        if compressed_path.exists() and compressed_path.stat().st_mtime_ns >= mtime_ns:
+            continue
+
+        if content is None:
+            content = path.read_bytes()
+
+        compressed_path.write_bytes(encoding.compress(content))
+        compressed_count += 1
+
+    return compressed_count
+
+
+def get_compressible_paths(output_directory: Path, static_directory: Path | None = None) -> list[Path]:
+    """
+    Gets the generated files in the output directory that should be pre-compressed.
+    """
+
+    paths = []
+
+    for suffix in COMPRESSIBLE_SUFFIXES:
+        for path in output_directory.rglob(f"*{suffix}"):
+            if static_directory and path.is_relative_to(static_directory):
+                continue
+
+            paths.append(path)
+
+    return paths
+
+
+def compress_output(output_directory: Path, static_directory: Path | None = None, threads_count: int = 1) -> int:
+    """
+    Pre-compresses all generated files in the output directory. The compression libraries release the GIL
+    while compressing, so files are compressed on multiple cores with a pool of threads. Returns the
+    number of compressed files that were written.
+    """
+
+    encodings = get_encodings()
+    paths = get_compressible_paths(output_directory, static_directory=static_directory)
+
+    with ThreadPoolExecutor(max_workers=max(threads_count, 1)) as executor:
+        return sum(executor.map(lambda path: compress_file(path, encodings), paths))
+
+
+def _get_accepted_encodings(accept_encoding: str) -> set[str]:
+    accepted_encodings = set()
+
+    for value in accept_encoding.split(","):
+        (name, _, parameters) = value.partition(";")
+        name = name.strip().lower()
+
+        if not name:
+            continue
+
+        (key, _, quality) = parameters.partition("=")
+
+        # Encodings with a quality of 0 are not acceptable
+        if key.strip() == "q":
+            try:
+                if float(quality) == 0:
+                    continue
+            except ValueError:
+                continue
+
+        accepted_encodings.add(name)
+
+    return accepted_encodings
+
+
+def get_precompressed_path(path: Path, accept_encoding: str) -> tuple[Path, str | None]:
+    """
+    Gets the pre-compressed file for `path` that matches the `Accept-Encoding` header and its encoding. Falls
+    back to `path` and `None` if there isn't an acceptable and up-to-date pre-compressed file.
+    """
+
+    accepted_encodings = _get_accepted_encodings(accept_encoding)
+
+    if not accepted_encodings:
+        return (path, None)
+
+    mtime_ns = path.stat().st_mtime_ns
+
+    for encoding in get_encodings():
+        if encoding.name not in accepted_encodings:
+            continue
+
+        compressed_path = encoding.get_compressed_path(path)
+
+        # Skip compressed files that are older than the generated file
+        try:
+            if compressed_path.stat().st_mtime_ns >= mtime_ns:
+                return (compressed_path, encoding.name)
+        except FileNotFoundError:
+            pass
+
+    return (path, None)
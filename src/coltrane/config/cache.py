@@ -1,13 +1,20 @@
 from dataclasses import dataclass
+from hashlib import md5 as md5_hash
+from pathlib import Path
 
 from django.core.cache import caches
 from django.core.cache.backends.base import BaseCache
+from django.http import HttpRequest
 
-from coltrane.config.settings import get_coltrane_settings
+from coltrane.config.settings import get_coltrane_settings, get_markdown_renderer, get_mistune_plugins
 
 AVAILABLE_CACHE_SETTINGS_KEYS = [
     "VIEW_CACHE",
     "DATA_CACHE",
+    "MARKDOWN_CACHE",
+    "RESPONSE_CACHE",
+    "HIGHLIGHT_CACHE",
+    "METADATA_CACHE",
 ]
 
 
@@ -51,5 +58,82 @@ class ViewCache(Cache):
 
 @dataclass
 class DataCache(Cache):
+    """
+    Deprecated: only used by `coltrane.retriever.get_data`.
+    """
+
     def __init__(self):
         super().__init__("DATA_CACHE")
+
+
+@dataclass
+class MarkdownCache(Cache):
+    """
+    Caches the HTML and metadata rendered from a markdown file, i.e. before the HTML is rendered
+    with Django. The cache key changes whenever the markdown file or markdown renderer settings change.
+    """
+
+    def __init__(self):
+        super().__init__("MARKDOWN_CACHE")
+
+    def get_cache_key(self, path: Path) -> str:
+        stat_result = path.stat()
+        markdown_renderer_settings = f"{get_markdown_renderer()}:{','.join(get_mistune_plugins())}"
+
+        key = f"{path}:{stat_result.st_mtime_ns}:{stat_result.st_size}:{markdown_renderer_settings}"
+        hashed_key = md5_hash(key.encode()).hexdigest()  # noqa: S324
+
+        return f"{self.cache_key_namespace}{hashed_key}"
+
+
+@dataclass
+class ResponseCache(Cache):
+    """
+    Caches the final rendered response of a page along with the fingerprints of the files that were
+    used to render it. The cached response is only used while none of those files have changed.
+    """
+
+    def __init__(self):
+        super().__init__("RESPONSE_CACHE")
+
+    def get_cache_key(self, request: HttpRequest) -> str:
+        key = f"{request.get_host()}{request.get_full_path()}"
+        hashed_key = md5_hash(key.encode()).hexdigest()  # noqa: S324
+
+        return f"{self.cache_key_namespace}{hashed_key}"
+
+
+@dataclass
+class HighlightCache(Cache):
+    """
+    Caches the HTML of code blocks that were highlighted with `pygments`. The cache key is based on the
+    code and its language, so the same code block is only highlighted once across pages and builds.
+    """
+
+    def __init__(self):
+        super().__init__("HIGHLIGHT_CACHE")
+
+    def get_cache_key(self, code: str, language: str) -> str:
+        import pygments
+
+        key = f"{pygments.__version__}:{language}:{code}"
+        hashed_key = md5_hash(key.encode()).hexdigest()  # noqa: S324
+
+        return f"{self.cache_key_namespace}{hashed_key}"
+
+
+@dataclass
+class MetadataCache(Cache):
+    """
+    Caches the parsed frontmatter of a markdown file. The cache key changes whenever the markdown file
+    changes, so with a persistent cache the frontmatter is not parsed again in the next process or build.
+    """
+
+    def __init__(self):
+        super().__init__("METADATA_CACHE")
+
+    def get_cache_key(self, path: Path, mtime_ns: int, size: int) -> str:
+        key = f"{path}:{mtime_ns}:{size}"
+        hashed_key = md5_hash(key.encode()).hexdigest()  # noqa: S324
+
+        return f"{self.cache_key_namespace}{hashed_key}"
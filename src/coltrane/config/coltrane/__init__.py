@@ -128,19 +128,63 @@ class Config(Base):
     def has_custom_sites(self) -> bool:
         return self.site_type == Config.SiteType.SITES
 
+    def _get_sites_index(self) -> tuple[dict[str, tuple[int, Site]], tuple[int, Site] | None]:
+        """
+        Gets the sites indexed by their lowercase hosts and the first wildcard site, so the site for a
+        request can be looked up without checking every site. When more than one site matches, the first
+        one wins, the same as when checking every site in order.
+
+        The index is built again whenever `sites` or their hosts change.
+        """
+
+        sites_key = tuple((id(site), tuple(site.hosts)) for site in self.sites)
+
+        if getattr(self, "_sites_index_key", None) != sites_key:
+            sites_by_host: dict[str, tuple[int, Site]] = {}
+            wildcard_site: tuple[int, Site] | None = None
+
+            for idx, site in enumerate(self.sites):
+                for host in site.hosts:
+                    if host == "*":
+                        if wildcard_site is None:
+                            wildcard_site = (idx, site)
+                    else:
+                        sites_by_host.setdefault(host.lower(), (idx, site))
+
+            self._sites_index = (sites_by_host, wildcard_site)
+            self._sites_index_key = sites_key
+
+        return self._sites_index
+
     def get_site(self, request: HttpRequest) -> Site:
+        # The site is stored on the request because it is needed multiple times for every request
+        if (request_site := getattr(request, "_coltrane_site", None)) and request_site[0] is self:
+            return request_site[1]
+
         request_host = request.headers.get("X-Forwarded-Host") or request.headers.get("Host")
 
-        for site in self.sites:
-            if site.has_host(request_host):
-                return site
+        if not request_host:
+            logger.warning("The host for the request could not be determined")
 
-        if self.sites:
+        site = None
+        (sites_by_host, wildcard_site) = self._get_sites_index()
+        host_site = sites_by_host.get(request_host.lower()) if request_host else None
+
+        if host_site and (wildcard_site is None or host_site[0] < wildcard_site[0]):
+            site = host_site[1]
+        elif wildcard_site:
+            site = wildcard_site[1]
+        elif self.sites:
             # The first site is considered the default
-            return self.sites[0]
+            site = self.sites[0]
+
+        if site is None:
+            logger.error("Unknown site for request headers: {request.headers}")
+            raise AssertionError(f"Missing default site; current sites: {self.sites}")
+
+        request._coltrane_site = (self, site)  # type: ignore
 
-        logger.error("Unknown site for request headers: {request.headers}")
-        raise AssertionError(f"Missing default site; current sites: {self.sites}")
+        return site
 
     def get_templates_settings(self) -> list[dict]:
         return TemplatesConfigurator(self).get_settings()
@@ -21,6 +21,23 @@ DEFAULT_MISTUNE_PLUGINS = [
     "subscript",
 ]
 
+# Strict formats that are tried before `dateparser` when parsing a `publish_date` that isn't ISO 8601
+DEFAULT_PUBLISH_DATE_FORMATS = [
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%d %H:%M",
+    "%Y-%m-%d",
+    "%Y/%m/%d",
+    "%B %d, %Y",
+    "%b %d, %Y",
+    "%d %B %Y",
+]
+
+# Names of files and directories in the content directory that are never content
+DEFAULT_CONTENT_IGNORE_PATTERNS = [
+    ".git",
+    "node_modules",
+]
+
 # Used to look at environment variables to merge into settings
 DEFAULT_COLTRANE_SETTINGS = {
     "TITLE": "",
@@ -34,6 +51,8 @@ DEFAULT_COLTRANE_SETTINGS = {
     "DISABLE_WILDCARD_TEMPLATES": False,
     "IS_SECURE": False,
     "DATA_JSON5": False,
+    "SERVE_OUTPUT": False,
+    "CONTENT_IGNORE_PATTERNS": DEFAULT_CONTENT_IGNORE_PATTERNS,
 }
 
 
@@ -130,6 +149,26 @@ def get_data_json_5() -> bool:
     return get_coltrane_settings().get("DATA_JSON5", False)
 
 
+def get_serve_output() -> bool:
+    return get_coltrane_settings().get("SERVE_OUTPUT", False)
+
+
+def get_content_ignore_patterns() -> list[str]:
+    """
+    Get the patterns of names of files and directories in the content directory that are ignored.
+    """
+
+    return get_coltrane_settings().get("CONTENT_IGNORE_PATTERNS", DEFAULT_CONTENT_IGNORE_PATTERNS)
+
+
+def get_publish_date_formats() -> list[str]:
+    """
+    Get the strict formats that are tried when parsing a `publish_date`.
+    """
+
+    return get_coltrane_settings().get("PUBLISH_DATE_FORMATS", DEFAULT_PUBLISH_DATE_FORMATS)
+
+
 # Global config object that is cached in the module
 config: Config | None = None
 
@@ -149,9 +149,11 @@ def play(config, port):
 @cli.command(help="Generates HTML output. Aliases: rec, build.", aliases=["rec", "build"])
 @click.option("--force/--no-force", default=False, help="Force HTML generation")
 @click.option("--threads", type=int, help="Number of threads to use when generating static files")
+@click.option("--processes", type=int, help="Number of processes to use when generating static files")
 @click.option("--output", help="Output directory")
 @click.option("--ignore/--no-ignore", default=False, help="Ignore errors")
-def record(force, threads, output, ignore):
+@click.option("--precompress/--no-precompress", default=False, help="Write compressed versions of the HTML files")
+def record(force, threads, processes, output, ignore, precompress):  # noqa: PLR0917
     args = []
 
     if force:
@@ -165,7 +167,14 @@ def record(force, threads, output, ignore):
         args.append("--threads")
         args.append(str(threads))
 
+    if processes:
+        args.append("--processes")
+        args.append(str(processes))
+
     if ignore:
         args.append("--ignore")
 
+    if precompress:
+        args.append("--precompress")
+
     _run_management_command("build", *args)
@@ -0,0 +1,223 @@
+import os
+from collections.abc import Iterable
+from dataclasses import dataclass
+from fnmatch import fnmatch
+from pathlib import Path
+from threading import Lock
+
+from coltrane.config.settings import get_content_ignore_patterns
+
+
+@dataclass
+class ContentTree:
+    # The paths of all markdown files, in the same order as `directory.rglob("*.md")`
+    paths: tuple[Path, ...]
+
+    # The last modified time of every directory that was walked, or `None` if the directory does not exist
+    directory_mtimes: dict[Path, int | None]
+
+
+@dataclass
+class ContentIndexEntry:
+    # The slugs of all markdown files, i.e. `blog/first-post` for `content/blog/first-post.md`
+    slugs: frozenset[str]
+
+    # The last modified time of every directory in the content directory, or `None` if the content
+    # directory does not exist
+    directory_mtimes: dict[Path, int | None]
+
+    # Whether the file system ignores the case of file names, e.g. on macOS
+    is_case_insensitive: bool
+
+
+def _get_directory_mtime(directory: Path) -> int | None:
+    try:
+        return directory.stat().st_mtime_ns
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+
+
+def _is_ignored(name: str, ignore_patterns: Iterable[str]) -> bool:
+    return any(fnmatch(name, ignore_pattern) for ignore_pattern in ignore_patterns)
+
+
+def walk_content_directory(directory: Path, ignore_patterns: Iterable[str] = ()) -> ContentTree:
+    """
+    Gets all markdown files in a directory and its subdirectories. Uses `os.scandir` so that the file type
+    of each entry comes from the directory listing instead of an extra `stat` call per file like
+    `rglob("*.md")` and `is_file()`. Files and directories whose names match one of the `ignore_patterns`
+    are skipped, e.g. `node_modules`. Symlinked directories are not followed, same as `rglob`.
+    """
+
+    ignore_patterns = tuple(ignore_patterns)
+    paths = []
+    directory_mtimes: dict[Path, int | None] = {directory: _get_directory_mtime(directory)}
+
+    if directory_mtimes[directory] is None:
+        return ContentTree(paths=(), directory_mtimes=directory_mtimes)
+
+    # Walk depth-first and list the markdown files of a directory before its subdirectories
+    directories = [directory]
+
+    while directories:
+        current_directory = directories.pop()
+        subdirectories = []
+
+        try:
+            with os.scandir(current_directory) as entries:
+                for entry in entries:
+                    if ignore_patterns and _is_ignored(entry.name, ignore_patterns):
+                        continue
+
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirectory = current_directory / entry.name
+                            directory_mtimes[subdirectory] = entry.stat(follow_symlinks=False).st_mtime_ns
+                            subdirectories.append(subdirectory)
+                        elif entry.name.endswith(".md") and entry.is_file():
+                            paths.append(current_directory / entry.name)
+                    except FileNotFoundError:
+                        # The entry was removed while walking
+                        continue
+        except (FileNotFoundError, NotADirectoryError, PermissionError):
+            continue
+
+        directories.extend(reversed(subdirectories))
+
+    return ContentTree(paths=tuple(paths), directory_mtimes=directory_mtimes)
+
+
+class ContentTreeCache:
+    """
+    Stores the markdown files of content directories, so they don't have to be listed again for every
+    request or page. Adding, removing, or renaming a file or directory changes the last modified time of
+    its directory, so a tree is current as long as none of its directories changed.
+    """
+
+    def __init__(self):
+        self._trees: dict[tuple[Path, tuple[str, ...]], ContentTree] = {}
+        self._lock = Lock()
+
+    def _is_current(self, tree: ContentTree) -> bool:
+        return all(
+            _get_directory_mtime(directory) == mtime_ns for (directory, mtime_ns) in tree.directory_mtimes.items()
+        )
+
+    def get(self, directory: Path) -> ContentTree:
+        """
+        Gets the markdown files of a directory. Only stats the directories unless one of them changed.
+        """
+
+        key = (directory, tuple(get_content_ignore_patterns()))
+        tree = self._trees.get(key)
+
+        if tree is not None and self._is_current(tree):
+            return tree
+
+        with self._lock:
+            tree = self._trees.get(key)
+
+            if tree is None or not self._is_current(tree):
+                tree = walk_content_directory(directory, ignore_patterns=key[1])
+                self._trees[key] = tree
+
+        return tree
+
+    def clear(self) -> None:
+        with self._lock:
+            self._trees.clear()
+
+
+# Global content tree cache that is cached in the module
+content_tree_cache = ContentTreeCache()
+
+
+def _is_case_insensitive(directory: Path) -> bool:
+    swapped_case_directory = directory.with_name(directory.name.swapcase())
+
+    if swapped_case_directory == directory:
+        return False
+
+    return swapped_case_directory.exists()
+
+
+def _build_entry(content_directory: Path) -> ContentIndexEntry:
+    tree = walk_content_directory(content_directory, ignore_patterns=get_content_ignore_patterns())
+    is_case_insensitive = False
+
+    if tree.directory_mtimes[content_directory] is not None:
+        is_case_insensitive = _is_case_insensitive(content_directory)
+
+    slugs = set()
+
+    for path in tree.paths:
+        slug = path.relative_to(content_directory).as_posix()[:-3]
+        slugs.add(slug.casefold() if is_case_insensitive else slug)
+
+    return ContentIndexEntry(
+        slugs=frozenset(slugs),
+        directory_mtimes=tree.directory_mtimes,
+        is_case_insensitive=is_case_insensitive,
+    )
+
+
+class ContentIndex:
+    """
+    Stores the slugs of all markdown files in a content directory, so whether a slug is markdown can
+    be answered without trying to open files that don't exist.
+
+    Adding or removing a markdown file changes the last modified time of its directory. Only the
+    directories that a slug could be in get checked for a lookup. The whole content directory is
+    indexed again when one of them changed.
+    """
+
+    def __init__(self):
+        self._entries: dict[Path, ContentIndexEntry] = {}
+        self._lock = Lock()
+
+    def _is_current(self, entry: ContentIndexEntry, content_directory: Path, slug_pieces: list[str]) -> bool:
+        # The directory of `slug.md` and of `slug/index.md`
+        for pieces_count in (len(slug_pieces) - 1, len(slug_pieces)):
+            directory = content_directory.joinpath(*slug_pieces[:pieces_count])
+
+            # A directory that didn't exist is checked with the closest directory that did exist, because
+            # creating it changes the last modified time of that directory
+            while directory not in entry.directory_mtimes:
+                directory = directory.parent
+
+            if _get_directory_mtime(directory) != entry.directory_mtimes[directory]:
+                return False
+
+        return True
+
+    def has_slug(self, content_directory: Path, slug: str) -> bool:
+        """
+        Whether there is a markdown file for the slug, i.e. `content_directory / f"{slug}.md"` exists.
+        """
+
+        slug_pieces = [piece for piece in slug.split("/") if piece not in ("", ".")]
+
+        if not slug_pieces or ".." in slug_pieces:
+            return False
+
+        entry = self._entries.get(content_directory)
+
+        if entry is None or not self._is_current(entry, content_directory, slug_pieces):
+            with self._lock:
+                entry = _build_entry(content_directory)
+                self._entries[content_directory] = entry
+
+        slug = "/".join(slug_pieces)
+
+        if entry.is_case_insensitive:
+            slug = slug.casefold()
+
+        return slug in entry.slugs
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+# Global content index that is cached in the module
+content_index = ContentIndex()
@@ -0,0 +1,279 @@
+import logging
+import mmap
+from collections.abc import Iterator, Mapping
+from dataclasses import dataclass
+from pathlib import Path
+from stat import S_ISREG
+from threading import Lock
+from typing import Any
+
+import msgspec
+
+from coltrane.config.settings import get_data_json_5
+from coltrane.dependencies import add_data_dependency
+
+logger = logging.getLogger(__name__)
+
+DATA_SUFFIXES = (".json5", ".json")
+
+# Files larger than this are memory-mapped instead of read into memory before decoding
+MEMORY_MAP_THRESHOLD = 16 * 1024 * 1024
+
+
+def _decode_json(path: Path) -> Any:
+    """
+    Decodes a JSON file with `msgspec`. Large files are memory-mapped, so the file doesn't get copied
+    into memory before it is decoded.
+    """
+
+    with path.open("rb") as f:
+        size = path.stat().st_size
+
+        if size < MEMORY_MAP_THRESHOLD:
+            return msgspec.json.decode(f.read())
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped_file:
+            with memoryview(mapped_file) as buffer:
+                return msgspec.json.decode(buffer)
+
+
+def load_data_file(path: Path, *, is_json5: bool = False) -> Any:
+    """
+    Parses a JSON or JSON5 data file. Returns `None` if the file is invalid.
+    """
+
+    file_name = path.name.replace(".json5", "").replace(".json", "")
+
+    if is_json5:
+        try:
+            import pyjson5
+
+            try:
+                return pyjson5.decode_buffer(path.read_bytes(), wordlength=0)
+            except pyjson5.Json5DecoderException:
+                logger.exception(f"Invalid JSON5: '{file_name}'")
+        except ImportError:
+            pass
+    else:
+        try:
+            return _decode_json(path)
+        except msgspec.DecodeError:
+            logger.exception(f"Invalid JSON: '{file_name}'")
+
+    return None
+
+
+def _merge(source: dict, destination: dict, path: list[str]) -> dict:
+    """
+    Deep merges `destination` into a copy of `source`. Unlike `coltrane.utils.dict_merge`, neither dictionary
+    is changed because the values are shared with the parsed data files.
+    """
+
+    merged = dict(source)
+
+    for key, value in destination.items():
+        if key in merged:
+            if isinstance(merged[key], dict) and isinstance(value, dict):
+                merged[key] = _merge(merged[key], value, [*path, str(key)])
+            elif merged[key] == value:
+                pass  # same leaf value
+            else:
+                msg = "Conflict at {}".format(".".join([*path, str(key)]))
+                raise Exception(msg)
+        else:
+            merged[key] = value
+
+    return merged
+
+
+@dataclass
+class DataFile:
+    mtime_ns: int
+    size: int
+    is_json5: bool
+    value: Any
+
+
+class DataStore:
+    """
+    Stores the parsed value of each data file. A file is only parsed the first time and whenever its last
+    modified time or size change.
+
+    The values are shared, so they must not be changed by callers.
+    """
+
+    def __init__(self):
+        self._files: dict[Path, DataFile] = {}
+        self._path_locks: dict[Path, Lock] = {}
+        self._lock = Lock()
+
+    def _get_path_lock(self, path: Path) -> Lock:
+        with self._lock:
+            return self._path_locks.setdefault(path, Lock())
+
+    def _forget(self, path: Path) -> None:
+        with self._lock:
+            self._files.pop(path, None)
+            self._path_locks.pop(path, None)
+
+    def load(self, path: Path, *, is_json5: bool = False) -> Any:
+        """
+        Gets the parsed value of one data file. The file is only parsed again if it changed. Returns `None`
+        if the file does not exist or is invalid.
+
+        Each file has its own lock, so parsing a large file doesn't block getting other files.
+        """
+
+        try:
+            stat_result = path.stat()
+        except FileNotFoundError:
+            self._forget(path)
+
+            return None
+
+        if not S_ISREG(stat_result.st_mode):
+            return None
+
+        key = (stat_result.st_mtime_ns, stat_result.st_size, is_json5)
+        data_file = self._files.get(path)
+
+        if data_file is not None and (data_file.mtime_ns, data_file.size, data_file.is_json5) == key:
+            return data_file.value
+
+        with self._get_path_lock(path):
+            data_file = self._files.get(path)
+
+            if data_file is None or (data_file.mtime_ns, data_file.size, data_file.is_json5) != key:
+                data_file = DataFile(
+                    mtime_ns=stat_result.st_mtime_ns,
+                    size=stat_result.st_size,
+                    is_json5=is_json5,
+                    value=load_data_file(path, is_json5=is_json5),
+                )
+                self._files[path] = data_file
+
+        return data_file.value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._files.clear()
+            self._path_locks.clear()
+
+
+# Global data store that is cached in the module
+data_store = DataStore()
+
+
+def _has_data_files(directory: Path) -> bool:
+    """
+    Whether there is a JSON or JSON5 file in the directory or one of its subdirectories.
+    """
+
+    return any(path.suffix in DATA_SUFFIXES and path.is_file() for path in directory.rglob("*.json*"))
+
+
+class LazyData(Mapping):
+    """
+    A read-only mapping of the data in a data directory that only parses a data file the first time
+    its key is accessed, e.g. `data/posts/first.json` gets parsed when a template uses `data.posts.first`
+    and no other file in `data` gets parsed.
+
+    Only stores the directory (and the already parsed values from a JSON file with the same name as
+    the directory), so it can be pickled and cached without copying the data.
+    """
+
+    def __init__(self, directory: Path, value: dict | None = None, is_root: bool = False):  # noqa: FBT001, FBT002
+        self._directory = directory
+        self._value = value or {}
+        self._is_root = is_root
+        self._is_json5 = get_data_json_5()
+        self._items: dict[str, Any] = {}
+
+    def _get_names(self) -> list[str]:
+        names = dict.fromkeys(self._value)
+
+        if self._directory.is_dir():
+            paths = sorted(self._directory.iterdir())
+
+            for suffix in DATA_SUFFIXES:
+                for path in paths:
+                    if path.name.endswith(suffix) and path.is_file():
+                        names[path.name[: -len(suffix)]] = None
+
+            # Directories without data files are not in `data`
+            for path in paths:
+                if path.is_dir() and _has_data_files(path):
+                    names[path.name] = None
+
+        return list(names)
+
+    def _load(self, key: str) -> Any:
+        values = []
+
+        if key in self._value:
+            values.append(self._value[key])
+
+        for suffix in DATA_SUFFIXES:
+            if value := data_store.load(self._directory / f"{key}{suffix}", is_json5=self._is_json5):
+                values.append(value)
+
+        merged: dict = {}
+
+        for value in values:
+            merged = _merge(merged, {key: value}, [])
+
+        subdirectory = self._directory / key
+
+        if subdirectory.is_dir() and isinstance(merged.get(key, {}), dict) and _has_data_files(subdirectory):
+            return LazyData(subdirectory, merged.get(key))
+
+        if key not in merged:
+            raise KeyError(key)
+
+        return merged[key]
+
+    def __getitem__(self, key):
+        key = str(key)
+
+        if self._is_root:
+            # Keep track of the data that the page uses for incremental builds
+            add_data_dependency(self._directory / key)
+
+        if key not in self._items:
+            self._items[key] = self._load(key)
+
+        return self._items[key]
+
+    def __iter__(self) -> Iterator[str]:
+        names = self._get_names()
+
+        if self._is_root:
+            for name in names:
+                add_data_dependency(self._directory / name)
+
+        # Files that are invalid or empty are not in `data`, so they are parsed to find out
+        return iter([name for name in names if name in self])
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __contains__(self, key) -> bool:
+        try:
+            self[key]
+        except KeyError:
+            return False
+
+        return True
+
+    def to_dict(self) -> dict:
+        """
+        Parses every data file and gets all of the data as dictionaries.
+        """
+
+        return {key: value.to_dict() if isinstance(value, LazyData) else value for (key, value) in self.items()}
+
+    def __repr__(self) -> str:
+        return repr(dict(self.items()))
+
+    def __reduce__(self):
+        return (self.__class__, (self._directory, self._value, self._is_root))
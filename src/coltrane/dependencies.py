@@ -0,0 +1,204 @@
+"""
+Records the files that a page depends on while it is being rendered so that incremental builds
+can re-render only the pages whose dependencies changed.
+
+Dependencies are strings in the form of `kind:path`:
+- `content:/site/content/about.md`: a markdown file that was rendered or looked for
+- `template:/site/templates/base.html`: a template that was rendered, extended, or included
+- `data:/site/data/posts`: a top-level key in `data`, i.e. `data/posts.json` or everything in `data/posts/`
+- `directory:/site/content/blog`: a content directory that was listed with `directory_contents`
+- `static:static/css/styles.css`: a static file whose URL was resolved with the `static` templatetag
+"""
+
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from hashlib import md5 as md5_hash
+from pathlib import Path
+
+CONTENT_DEPENDENCY = "content"
+TEMPLATE_DEPENDENCY = "template"
+DATA_DEPENDENCY = "data"
+DIRECTORY_DEPENDENCY = "directory"
+STATIC_DEPENDENCY = "static"
+
+# Context variables are local to each thread, so pages can be rendered concurrently
+_dependencies: ContextVar[set[str] | None] = ContextVar("coltrane_dependencies", default=None)
+
+
+@contextmanager
+def record_dependencies() -> Iterator[set[str]]:
+    """
+    Records all dependencies that are added while the context manager is active.
+
+    ```python
+    with record_dependencies() as dependencies:
+        rendered_html = item.render_html()
+    ```
+    """
+
+    token = _dependencies.set(set())
+
+    try:
+        yield _dependencies.get()  # type: ignore
+    finally:
+        _dependencies.reset(token)
+
+
+def is_recording_dependencies() -> bool:
+    return _dependencies.get() is not None
+
+
+def _add_dependency(kind: str, path: str | Path) -> None:
+    if (dependencies := _dependencies.get()) is not None:
+        dependencies.add(f"{kind}:{path}")
+
+
+def add_content_dependency(content_path: Path) -> None:
+    """
+    Adds the path of a markdown file that was rendered. Files that do not exist are added as well, so
+    creating them is a change.
+    """
+
+    _add_dependency(CONTENT_DEPENDENCY, content_path)
+
+
+def add_template_dependency(template_path: str | Path | None) -> None:
+    """
+    Adds the path of a template file that was used to render the page.
+    """
+
+    # Templates created from strings do not have a file
+    if template_path and str(template_path) != "<unknown source>":
+        _add_dependency(TEMPLATE_DEPENDENCY, template_path)
+
+
+def add_data_dependency(data_path: Path) -> None:
+    """
+    Adds a top-level key of `data`, i.e. `data_directory / key`.
+    """
+
+    _add_dependency(DATA_DEPENDENCY, data_path)
+
+
+def add_directory_dependency(directory: Path) -> None:
+    """
+    Adds a content directory that was listed to render the page.
+    """
+
+    _add_dependency(DIRECTORY_DEPENDENCY, directory)
+
+
+def add_static_dependency(static_path: str) -> None:
+    """
+    Adds the name of a static file, i.e. the key in the `paths` of `staticfiles.json`.
+    """
+
+    _add_dependency(STATIC_DEPENDENCY, static_path)
+
+
+def _get_file_fingerprint(path: Path) -> str:
+    try:
+        stat_result = path.stat()
+    except FileNotFoundError:
+        return "missing"
+
+    return f"{stat_result.st_mtime}:{stat_result.st_size}"
+
+
+def _get_files_fingerprint(paths: Iterator[Path], base_path: Path) -> str:
+    lines = []
+
+    for path in paths:
+        if path.is_file():
+            lines.append(f"{path.relative_to(base_path)}:{_get_file_fingerprint(path)}")
+
+    if not lines:
+        return "missing"
+
+    lines.sort()
+
+    return md5_hash("\n".join(lines).encode()).hexdigest()  # noqa: S324
+
+
+def _get_paths(kind: str, path: Path) -> list[Path]:
+    """
+    Gets the files of a data or directory dependency.
+    """
+
+    if kind == DATA_DEPENDENCY:
+        data_paths = [path.with_name(f"{path.name}.json"), path.with_name(f"{path.name}.json5")]
+
+        if path.is_dir():
+            data_paths.extend(path.rglob("*.json*"))
+
+        return data_paths
+
+    if not path.is_dir():
+        return []
+
+    from coltrane.content_index import content_tree_cache
+
+    return list(content_tree_cache.get(path).paths)
+
+
+def get_fingerprint(dependency: str, static_paths: dict[str, str] | None = None) -> str:
+    """
+    Gets a string that changes whenever the dependency changes. Based on the last modified time
+    and size of the files, so no files are read.
+
+    Args:
+        dependency: The dependency to get a fingerprint for.
+        static_paths: The `paths` from `staticfiles.json` which map static file names to their hashed
+            names. The hashed name is the fingerprint for static dependencies.
+    """
+
+    (kind, path_str) = dependency.split(":", 1)
+
+    if kind == STATIC_DEPENDENCY:
+        return (static_paths or {}).get(path_str, "missing")
+
+    path = Path(path_str)
+
+    if kind in (CONTENT_DEPENDENCY, TEMPLATE_DEPENDENCY):
+        return _get_file_fingerprint(path)
+
+    if kind == DATA_DEPENDENCY:
+        return _get_files_fingerprint(iter(_get_paths(kind, path)), path.parent)
+
+    if kind == DIRECTORY_DEPENDENCY:
+        if not path.is_dir():
+            return "missing"
+
+        return _get_files_fingerprint(iter(_get_paths(kind, path)), path)
+
+    raise AssertionError(f"Unknown dependency: {dependency}")
+
+
+def get_last_modified(dependencies: Iterable[str]) -> float | None:
+    """
+    Gets the newest last modified time of the files of the dependencies. `None` if none of the files
+    exist. Static dependencies are not files, so they are skipped.
+    """
+
+    last_modified = None
+
+    for dependency in dependencies:
+        (kind, path_str) = dependency.split(":", 1)
+
+        if kind == STATIC_DEPENDENCY:
+            continue
+
+        path = Path(path_str)
+        paths = [path] if kind in (CONTENT_DEPENDENCY, TEMPLATE_DEPENDENCY) else _get_paths(kind, path)
+
+        for file_path in paths:
+            try:
+                mtime = file_path.stat().st_mtime
+            except FileNotFoundError:
+                continue
+
+            if last_modified is None or mtime > last_modified:
+                last_modified = mtime
+
+    return last_modified
@@ -0,0 +1,213 @@
+import os
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from pathlib import Path
+from threading import Lock
+from time import monotonic
+
+from django.utils.timezone import now
+
+from coltrane.content_index import ContentTree, content_tree_cache
+from coltrane.metadata import metadata_index
+from coltrane.renderer import DEFAULT_TEMPLATE
+
+# Keys whose orderings are sorted when a directory is indexed, because listings are usually ordered by them;
+# orderings for other keys get sorted the first time they are used
+PRESORTED_KEYS = ("publish_date", "-publish_date", "title", "-title")
+
+# Seconds that an entry is used before the last modified time and size of its files are checked again;
+# added and removed files are noticed right away because they change the content tree
+FILE_CHECK_SECONDS = 1
+
+
+def _get_stat(path: Path) -> tuple[int, int] | None:
+    try:
+        stat_result = os.stat(path)
+    except FileNotFoundError:
+        return None
+
+    return (stat_result.st_mtime_ns, stat_result.st_size)
+
+
+def _get_sort_value(metadata: dict, key: str) -> str:
+    return str(metadata.get(key, "") or "")
+
+
+@dataclass
+class DirectoryIndexEntry:
+    # The content tree that the entry was built from; a different tree means that files were added or removed
+    tree: ContentTree
+
+    # The markdown files other than `index.md` and their last modified time and size
+    paths: tuple[Path, ...]
+    stats: tuple[tuple[int, int] | None, ...]
+
+    # The metadata of each markdown file, along with its `slug` and `template`; shared, so it must not be changed
+    items: tuple[dict, ...]
+
+    # The indexes of `items` sorted by a key, i.e. "publish_date" or "-publish_date" for the reverse order
+    orderings: dict[str, tuple[int, ...]] = field(default_factory=dict)
+
+    # When the files were last checked for changes
+    checked_at: float = field(default_factory=monotonic)
+
+    def get_ordering(self, order_by: str) -> tuple[int, ...]:
+        ordering = self.orderings.get(order_by)
+
+        if ordering is None:
+            key = order_by.removeprefix("-")
+
+            # Sort with `reverse` instead of reversing the ascending order, so that items with the same value
+            # stay in the same order as the files
+            ordering = tuple(
+                sorted(
+                    range(len(self.items)),
+                    key=lambda idx: _get_sort_value(self.items[idx], key),
+                    reverse=order_by.startswith("-"),
+                )
+            )
+            self.orderings[order_by] = ordering
+
+        return ordering
+
+    def get_item(self, idx: int) -> dict:
+        """
+        Gets a copy of the metadata of one markdown file.
+        """
+
+        item = dict(self.items[idx])
+        item["now"] = now()
+
+        return item
+
+    def get_items(
+        self,
+        *,
+        order_by: str | None = None,
+        exclude: set[str] | None = None,
+        limit: int | None = None,
+        offset: int = 0,
+    ) -> list[dict]:
+        """
+        Gets copies of the metadata of the markdown files. Only the items that are returned get copied.
+        """
+
+        indexes: Sequence[int] = range(len(self.items))
+
+        if order_by:
+            indexes = self.get_ordering(order_by)
+
+        items = []
+        skipped_count = 0
+
+        for idx in indexes:
+            if limit is not None and len(items) >= limit:
+                break
+
+            if exclude and self.items[idx]["slug"] in exclude:
+                continue
+
+            if skipped_count < offset:
+                skipped_count += 1
+                continue
+
+            items.append(self.get_item(idx))
+
+        return items
+
+
+def _build_entry(tree: ContentTree, directory_slug: str) -> DirectoryIndexEntry:
+    paths = tuple(path for path in tree.paths if path.name != "index.md")
+    stats = tuple(_get_stat(path) for path in paths)
+    items = []
+
+    for path, stat in zip(paths, stats, strict=True):
+        # Files that were removed since the tree was walked get skipped
+        if stat is None:
+            continue
+
+        # Only parse the frontmatter instead of rendering the whole markdown file
+        metadata = metadata_index.get(path)
+
+        metadata.setdefault("template", DEFAULT_TEMPLATE)
+
+        path_slug = path.name[:-3]
+        metadata["slug"] = f"{directory_slug}/{path_slug}" if directory_slug else path_slug
+
+        # The table of contents requires rendering the markdown, so it is not available in listings
+        metadata["toc"] = None
+
+        items.append(metadata)
+
+    entry = DirectoryIndexEntry(tree=tree, paths=paths, stats=stats, items=tuple(items))
+
+    for order_by in PRESORTED_KEYS:
+        entry.get_ordering(order_by)
+
+    return entry
+
+
+class DirectoryIndex:
+    """
+    Stores the metadata of the markdown files in a content directory (and its subdirectories) along with
+    orderings that are already sorted, so listing a directory doesn't parse or sort every file again.
+
+    An entry is built again when a file is added or removed (based on the cached content tree), or when
+    the last modified time or size of one of its files changes. Checking the files requires a `stat` per
+    file, so it happens at most once every `FILE_CHECK_SECONDS` for each entry.
+    """
+
+    def __init__(self):
+        self._entries: dict[tuple[Path, str], DirectoryIndexEntry] = {}
+        self._lock = Lock()
+
+    def _is_current(self, entry: DirectoryIndexEntry, tree: ContentTree) -> bool:
+        if entry.tree is not tree:
+            return False
+
+        if monotonic() - entry.checked_at < FILE_CHECK_SECONDS:
+            return True
+
+        if all(_get_stat(path) == stat for (path, stat) in zip(entry.paths, entry.stats, strict=True)):
+            entry.checked_at = monotonic()
+
+            return True
+
+        return False
+
+    def get(self, directory: Path, directory_slug: str = "") -> DirectoryIndexEntry:
+        """
+        Gets the indexed markdown files of a directory.
+
+        Args:
+            directory: The directory in the content directory.
+            directory_slug: The slug of the directory, i.e. "articles", which is the prefix of each item's `slug`.
+        """
+
+        tree = content_tree_cache.get(directory)
+
+        if tree.directory_mtimes[directory] is None:
+            raise FileNotFoundError(f"Directory does not exist: {directory}")
+
+        key = (directory, directory_slug)
+        entry = self._entries.get(key)
+
+        if entry is not None and self._is_current(entry, tree):
+            return entry
+
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None or not self._is_current(entry, tree):
+                entry = _build_entry(tree, directory_slug)
+                self._entries[key] = entry
+
+        return entry
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+# Global directory index that is cached in the module
+directory_index = DirectoryIndex()
@@ -1,21 +1,24 @@
 import logging
 import sys
 import time
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from contextlib import redirect_stdout
 from io import StringIO
-from multiprocessing import cpu_count
+from multiprocessing import cpu_count, get_context
 from pathlib import Path
 from shutil import copy2
+from threading import Lock
 from types import SimpleNamespace
 
+from django import setup as django_setup
 from django.conf import settings
-from django.contrib.sitemaps.views import sitemap
+from django.contrib.sites.shortcuts import get_current_site
 from django.core import management
 from django.core.management.base import BaseCommand
 from halo import Halo  # type: ignore
 from log_symbols.symbols import LogSymbols  # type: ignore
 
+from coltrane.compression import compress_output
 from coltrane.config.paths import (
     get_base_directory,
     get_extra_file_paths,
@@ -23,24 +26,118 @@ from coltrane.config.paths import (
     get_output_json,
     get_output_static_directory,
 )
-from coltrane.feeds import ContentFeed
+from coltrane.config.settings import get_config
 from coltrane.manifest import Manifest, ManifestItem
 from coltrane.module_finder import is_django_compressor_installed
 from coltrane.renderer import StaticRequest
 from coltrane.retriever import get_content_paths
-from coltrane.urls import sitemaps
+from coltrane.sitemaps import get_sitemap_urls, write_sitemaps
 from coltrane.utils import threadpool
 
 logger = logging.getLogger(__name__)
 
+# Number of batches to give each process so that slow files don't leave other processes idle
+BATCHES_PER_PROCESS = 4
+
+
+def _get_error_message(path: Path, exception: BaseException) -> str:
+    """
+    Gets a formatted error message for a markdown file that could not be rendered.
+    """
+
+    error_detail = f"{exception.__class__.__name__}: {exception}"
+
+    if exception.__class__.__name__ == "FastDevVariableDoesNotExist":
+        error_detail = (
+            str(exception)
+            .replace("\n    ", ", ")
+            .replace(":\n, ", ": ")
+            .replace(
+                " does not exist in context.",
+                "' does not exist in template context.",
+            )
+        )[:-1]
+        error_detail = f"'{error_detail}"
+
+    return f"Rendering {path} failed. {error_detail}"
+
+
+def _initialize_process(django_settings: dict) -> None:
+    """
+    Initializes Django once for each process in the process pool. Forked processes inherit the
+    configured settings, but spawned processes have to configure them from scratch, so this module must
+    be importable before settings are configured.
+    """
+
+    if not settings.configured:
+        settings.configure(**django_settings)
+
+    django_setup()
+
+
+def _write_html(item: ManifestItem) -> None:
+    """
+    Renders a markdown file and writes the generated HTML. Markdown files that paginate a directory get
+    a file for every page, i.e. `blog/page/2/index.html`; pages that don't exist anymore get removed
+    along with their pre-compressed files.
+    """
+
+    item.generated_file_path.write_text(item.render_html())
+
+    for page_number in range(2, item.page_count + 1):
+        page_file_path = item.get_page_file_path(page_number)
+        page_file_path.parent.mkdir(parents=True, exist_ok=True)
+        page_file_path.write_text(item.render_html(page_number=page_number))
+
+    page_number = item.page_count + 1
+
+    while (page_file_path := item.get_page_file_path(page_number)).exists():
+        for path in page_file_path.parent.glob(f"{page_file_path.name}*"):
+            path.unlink()
+
+        page_number += 1
+
+
+def _output_markdown_files(
+    markdown_files: list[tuple[Path, ManifestItem]],
+) -> list[tuple[Path, ManifestItem | None, str | None]]:
+    """
+    Renders a batch of markdown files in a separate process. Returns a result for each markdown file with
+    either the `ManifestItem` to add to the manifest or an error message.
+    """
+
+    results: list[tuple[Path, ManifestItem | None, str | None]] = []
+
+    for markdown_file, item in markdown_files:
+        try:
+            _write_html(item)
+
+            results.append((markdown_file, item, None))
+        except Exception as e:
+            results.append((markdown_file, None, _get_error_message(markdown_file, e)))
+
+    return results
+
+
+def _batch(items: list, size: int) -> list[list]:
+    """
+    Splits a list into lists of `size` items.
+    """
+
+    return [items[idx : idx + size] for idx in range(0, len(items), size)]
+
 
 class Command(BaseCommand):
     help = "Build all static HTML files and put them into a directory named output."
 
     is_force = False
     threads_count = 2
+    processes_count = 0
+    # How processes get started, i.e. "spawn"; `None` is the default start method of the platform
+    process_start_method: str | None = None
     manifest = None
     output_result_counts = SimpleNamespace(create_count=0, update_count=0, skip_count=0)
+    output_result_counts_lock = Lock()
     request = StaticRequest("/")
 
     def add_arguments(self, parser):
@@ -56,6 +153,18 @@ class Command(BaseCommand):
             help="Number of threads to use when generating static files",
         )
 
+        parser.add_argument(
+            "--processes",
+            action="store",
+            help="Number of processes to use when generating static files; overrides --threads",
+        )
+
+        parser.add_argument(
+            "--precompress",
+            action="store_true",
+            help="Write gzip, brotli, and zstd compressed versions of the HTML and XML files",
+        )
+
         parser.add_argument(
             "--output",
             action="store",
@@ -75,14 +184,20 @@ class Command(BaseCommand):
         if not self.output_directory:
             raise AssertionError("Missing output directory")
 
-        sitemap_response = sitemap(request=self.request, sitemaps=sitemaps)
-        sitemap_xml = sitemap_response.render().content.decode()
-        (self.output_directory / "sitemap.xml").write_text(sitemap_xml)
+        base_url = f"{self.request.scheme}://{get_current_site(self.request).domain}"
+        site = get_config().get_site(self.request)
+
+        urls = get_sitemap_urls(base_url, site=site, output_directory=self.output_directory)
+        write_sitemaps(self.output_directory, urls, base_url)
 
     def _generate_rss(self) -> None:
         if not self.output_directory:
             raise AssertionError("Missing output directory")
 
+        # Imported here because the feed reads settings when it is imported, which spawned processes
+        # haven't configured yet when they import this module
+        from coltrane.feeds import ContentFeed
+
         content_feed = ContentFeed()
         feed = content_feed.get_feed(None, request=self.request)  # type: ignore
         rss_xml = feed.writeString("utf-8")
@@ -147,36 +262,120 @@ class Command(BaseCommand):
 
         return compress_stdout
 
-    def _output_markdown_file(self, markdown_file: Path) -> None:
+    def _increment_output_result_count(self, count_name: str) -> None:
+        """
+        Increments one of the output result counts. Guarded by a lock because files are output
+        from multiple threads at the same time.
+        """
+
+        with self.output_result_counts_lock:
+            count = getattr(self.output_result_counts, count_name)
+            setattr(self.output_result_counts, count_name, count + 1)
+
+    def _get_item_to_render(self, markdown_file: Path) -> ManifestItem | None:
+        """
+        Checks the manifest to see whether the markdown file needs to be rendered. Returns the `ManifestItem`
+        if it does, otherwise `None`.
+        """
+
         if not self.manifest:
             raise AssertionError("Manifest must be loaded first")
 
-        is_skipped = False
-
         item = ManifestItem.create(markdown_file)
         existing_item = self.manifest.get(markdown_file)
 
-        if existing_item and not self.is_force:
-            if item.mtime == existing_item.mtime:
-                is_skipped = True
-                self.output_result_counts.skip_count += 1
+        # Always re-render if a template, data, or directory that was used to render the file changed
+        if existing_item and not self.is_force and not self.manifest.has_changed_dependencies(existing_item):
+            if item.is_stat_unchanged(existing_item):
+                # Skip without reading the file because the last modified time and size are the same
+                self._increment_output_result_count("skip_count")
+
+                return None
             elif item.md5 == existing_item.md5:
-                # Update item in manifest to get newest mtime
-                self.manifest.add(markdown_file)
+                # Update item in manifest to get newest mtime; re-use the already calculated hash
+                item.dependencies = existing_item.dependencies
+                self.manifest.add(markdown_file, item=item)
+                self._increment_output_result_count("skip_count")
+
+                return None
+
+        if existing_item:
+            self._increment_output_result_count("update_count")
+        else:
+            self._increment_output_result_count("create_count")
 
-                is_skipped = True
-                self.output_result_counts.skip_count += 1
+        return item
 
-        if not is_skipped:
-            if existing_item:
-                self.output_result_counts.update_count += 1
-            else:
-                self.output_result_counts.create_count += 1
+    def _output_markdown_file(self, markdown_file: Path) -> None:
+        if not self.manifest:
+            raise AssertionError("Manifest must be loaded first")
+
+        if item := self._get_item_to_render(markdown_file):
+            _write_html(item)
+            self.manifest.add(markdown_file, item=item)
+
+    def _output_markdown_files_with_threads(self, spinner: Halo) -> None:
+        if not self.manifest:
+            raise AssertionError("Manifest must be loaded first")
 
-            rendered_html = item.render_html()
+        with ThreadPoolExecutor(max_workers=self.threads_count) as executor:
+            logger.debug(f"Multithread with {self.threads_count} threads")
+            pluralized_threads = "s" if self.threads_count > 1 else ""
+            spinner.text = f"Create HTML files (use {self.threads_count} thread{pluralized_threads})"
+
+            # Submit every markdown file up-front so that they are all rendered concurrently
+            futures = {
+                executor.submit(self._output_markdown_file, path): path
+                for path in get_content_paths(request=self.request)
+            }
+
+            for future in as_completed(futures):
+                if exception := future.exception():
+                    error_message = _get_error_message(futures[future], exception)
+                    self.errors.append(error_message)
+                    self.manifest.remove(futures[future])
+
+    def _output_markdown_files_with_processes(self, spinner: Halo) -> None:
+        if not self.manifest:
+            raise AssertionError("Manifest must be loaded first")
 
-            item.generated_file_path.write_text(rendered_html)
-            self.manifest.add(markdown_file)
+        logger.debug(f"Multiprocess with {self.processes_count} processes")
+        pluralized_processes = "es" if self.processes_count > 1 else ""
+        spinner.text = f"Create HTML files (use {self.processes_count} process{pluralized_processes})"
+
+        # Check the manifest in this process so that only files that need rendering get sent to the pool
+        items_to_render = []
+
+        for path in get_content_paths(request=self.request):
+            if item := self._get_item_to_render(path):
+                items_to_render.append((path, item))
+
+        if not items_to_render:
+            return
+
+        batch_size = max(len(items_to_render) // (self.processes_count * BATCHES_PER_PROCESS), 1)
+        django_settings = {name: getattr(settings, name) for name in dir(settings) if name.isupper()}
+
+        # Stop the spinner while the pool starts its processes, so they don't get forked while the
+        # spinner's thread is running
+        spinner.stop()
+
+        with ProcessPoolExecutor(
+            max_workers=self.processes_count,
+            mp_context=get_context(self.process_start_method),
+            initializer=_initialize_process,
+            initargs=(django_settings,),
+        ) as executor:
+            futures = [executor.submit(_output_markdown_files, batch) for batch in _batch(items_to_render, batch_size)]
+            spinner.start()
+
+            for future in as_completed(futures):
+                for path, item, error_message in future.result():
+                    if item:
+                        self.manifest.add(path, item=item)
+                    elif error_message:
+                        self.errors.append(error_message)
+                        self.manifest.remove(path)
 
     def _success(self, text: str, ending="\n") -> None:
         self.stdout.write(LogSymbols.SUCCESS.value, ending=" ")
@@ -206,6 +405,7 @@ class Command(BaseCommand):
 
     def handle(self, *args, **options):  # noqa: ARG002
         self.is_force: bool = False
+        self.processes_count = 0
         self.manifest: Manifest | None = None
         self.output_result_counts.create_count = 0
         self.output_result_counts.update_count = 0
@@ -258,10 +458,15 @@ class Command(BaseCommand):
             extra_file_count += 1
         spinner.succeed(f"Copy {extra_file_count} extra files")
 
-        if not self.is_force and self.manifest.static_files_manifest_changed:
-            # At least one static file has changed, so re-render all files because
-            # we don't have granularity to know which static files are used in
-            # particular markdown or template files
+        if (
+            not self.is_force
+            and self.manifest.static_files_manifest_changed
+            and self.manifest.has_items_without_dependencies
+        ):
+            # At least one static file has changed, so re-render all files because manifests
+            # from before dependencies were stored don't know which static files are used in
+            # particular markdown or template files; otherwise, only the markdown files that
+            # use a changed static file get re-rendered
             self.is_force = True
             self._success("Force update because static file(s) updated")
 
@@ -272,38 +477,22 @@ class Command(BaseCommand):
                 pass
         else:
             try:
-                self.threads_count = (cpu_count() // 2) - 1
+                self.threads_count = max((cpu_count() // 2) - 1, 1)
             except Exception as ex:
                 logger.exception(ex)
 
-        spinner.start("Create HTML files")
+        if options.get("processes"):
+            try:
+                self.processes_count = int(options["processes"])
+            except ValueError:
+                pass
 
-        with ThreadPoolExecutor(max_workers=self.threads_count) as executor:
-            logger.debug(f"Multithread with {self.threads_count} threads")
-            pluralized_threads = "s" if self.threads_count > 1 else ""
-            spinner.text = f"Create HTML files (use {self.threads_count} thread{pluralized_threads})"
+        spinner.start("Create HTML files")
 
-            for path in get_content_paths(request=self.request):
-                future = executor.submit(self._output_markdown_file, path)
-                exception = future.exception()
-
-                if exception:
-                    error_detail = f"{exception.__class__.__name__}: {exception}"
-
-                    if exception.__class__.__name__ == "FastDevVariableDoesNotExist":
-                        error_detail = (
-                            str(exception)
-                            .replace("\n    ", ", ")
-                            .replace(":\n, ", ": ")
-                            .replace(
-                                " does not exist in context.",
-                                "' does not exist in template context.",
-                            )
-                        )[:-1]
-                        error_detail = f"'{error_detail}"
-
-                    error_message = f"Rendering {path} failed. {error_detail}"
-                    self.errors.append(error_message)
+        if self.processes_count > 0:
+            self._output_markdown_files_with_processes(spinner)
+        else:
+            self._output_markdown_files_with_threads(spinner)
 
         result_msg = f"Create {self.output_result_counts.create_count} HTML files, \
 {self.output_result_counts.skip_count} unmodified, {self.output_result_counts.update_count} updated"
@@ -323,6 +512,15 @@ class Command(BaseCommand):
             self.manifest.write_data()
             spinner.succeed()
 
+        if options.get("precompress"):
+            spinner.start("Pre-compress HTML and XML files")
+            compressed_count = compress_output(
+                self.output_directory,
+                static_directory=get_output_static_directory(),
+                threads_count=cpu_count(),
+            )
+            spinner.succeed(f"Pre-compress {compressed_count} files")
+
         elapsed_time = time.time() - start_time
 
         for error_message in self.errors:
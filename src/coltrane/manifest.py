@@ -2,28 +2,54 @@ import json
 from dataclasses import dataclass
 from hashlib import md5 as md5_hash
 from pathlib import Path
+from threading import Lock
 
-from django.template.loader import render_to_string
+from django.template.loader import get_template
 
 from coltrane.config.paths import get_output_directory, get_staticfiles_json
+from coltrane.dependencies import add_template_dependency, get_fingerprint, record_dependencies
+from coltrane.pagination import get_page_count, get_page_path
 from coltrane.renderer import MarkdownRenderer, StaticRequest
 
+# Key in the manifest file that stores the fingerprints of all dependencies
+DEPENDENCIES_KEY = "__dependencies__"
+
 
 @dataclass
 class ManifestItem:
     """
-    Stores information about a markdown file: the name, last modified time, and an MD5
-    hash of the file contents.
+    Stores information about a markdown file: the name, last modified time, size, an MD5
+    hash of the file contents, and the dependencies used to render it.
+
+    The MD5 hash is only calculated the first time it is needed when the item was created
+    from a `Path`, so that comparing the last modified time and size never reads the file.
     """
 
     _name: str
     _mtime: float
-    _md5: str
-
-    def __init__(self, name: str, mtime: float, md5: str):
+    _md5: str | None
+    _size: int | None
+    _path: Path | None
+    dependencies: list[str] | None
+    page_count: int
+
+    def __init__(
+        self,
+        name: str,
+        mtime: float,
+        *,
+        md5: str | None = None,
+        size: int | None = None,
+        path: Path | None = None,
+        dependencies: list[str] | None = None,
+    ):
         self._name = name
         self._mtime = mtime
         self._md5 = md5
+        self._size = size
+        self._path = path
+        self.dependencies = dependencies
+        self.page_count = 1
 
     @property
     def slug(self) -> str:
@@ -74,13 +100,36 @@ class ManifestItem:
         return self._mtime
 
     @property
-    def md5(self):
+    def size(self) -> int | None:
+        """
+        Size of the file in bytes. `None` for items loaded from a manifest that was written before
+        sizes were stored.
+        """
+
+        return self._size
+
+    @property
+    def md5(self) -> str | None:
         """
-        MD5 hash of the file contents.
+        MD5 hash of the file contents. Read and hashed from the file the first time it is accessed.
         """
 
+        if self._md5 is None and self._path is not None:
+            self._md5 = md5_hash(self._path.read_bytes()).hexdigest()  # noqa: S324
+
         return self._md5
 
+    def is_stat_unchanged(self, other: "ManifestItem") -> bool:
+        """
+        Whether the last modified time and size match another item without reading either file. Items
+        without a size match on the last modified time alone.
+        """
+
+        if self.mtime != other.mtime:
+            return False
+
+        return self.size is None or other.size is None or self.size == other.size
+
     @property
     def generated_file_path(self) -> Path:
         """
@@ -111,30 +160,54 @@ class ManifestItem:
 
         return url_slug
 
-    def render_html(self):
+    def render_html(self, page_number: int = 1):
         """
-        Renders the markdown file into HTML.
+        Renders the markdown file into HTML. Stores the templates, data, and directories that were
+        used while rendering in `dependencies`, and the number of pages if the markdown file paginates
+        a directory in `page_count`.
+
+        Args:
+            page_number: The page to render for markdown files that paginate a directory.
         """
 
         # Mock an HttpRequest when generating the HTML for static sites
-        request = StaticRequest(path=self.url_slug)
+        request = StaticRequest(path=get_page_path(self.url_slug, page_number))
 
-        (template, context) = MarkdownRenderer.instance().render_markdown(self.slug, request)
-        rendered_html = render_to_string(template, context)
+        with record_dependencies() as dependencies:
+            (template_name, context) = MarkdownRenderer.instance().render_markdown(self.slug, request)
+
+            template = get_template(template_name)
+            add_template_dependency(template.origin.name)
+
+            rendered_html = template.render(context)
+
+        if page_number == 1:
+            self.dependencies = sorted(dependencies)
+            self.page_count = get_page_count(request) or 1
+        else:
+            self.dependencies = sorted(set(self.dependencies or []) | dependencies)
 
         return rendered_html
 
+    def get_page_file_path(self, page_number: int) -> Path:
+        """
+        The generated file path for a page of a markdown file that paginates a directory, i.e.
+        `blog/page/2/index.html` for `blog/index.md`.
+        """
+
+        return self.generated_file_path.parent / "page" / str(page_number) / "index.html"
+
     @staticmethod
     def create(path: Path) -> "ManifestItem":
         """
-        Initializes a new `ManifestItem` from a `Path`.
+        Initializes a new `ManifestItem` from a `Path`. Only stats the file; the contents are
+        read and hashed when `md5` is first accessed.
         """
 
         name = ManifestItem.get_name(path)
-        mtime = path.stat().st_mtime
-        md5 = md5_hash(path.read_bytes()).hexdigest()  # noqa: S324
+        stat_result = path.stat()
 
-        return ManifestItem(name=name, mtime=mtime, md5=md5)
+        return ManifestItem(name=name, mtime=stat_result.st_mtime, size=stat_result.st_size, path=path)
 
     @staticmethod
     def get_name(path: Path) -> str:
@@ -171,9 +244,11 @@ class ManifestItems:
     """
 
     _data: dict[str, ManifestItem]
+    dependency_fingerprints: dict[str, str]
 
     def __init__(self):
         self._data = {}
+        self.dependency_fingerprints = {}
 
     def get(self, name: str) -> ManifestItem:
         """
@@ -185,6 +260,9 @@ class ManifestItems:
     def add(self, manifest_item: ManifestItem) -> None:
         self._data[manifest_item.name] = manifest_item
 
+    def remove(self, name: str) -> None:
+        self._data.pop(name, None)
+
     def load(self, manifest_file: Path) -> None:
         """
         Retrieve the current manifest file (typically output.json) and store the data.
@@ -192,10 +270,18 @@ class ManifestItems:
 
         initial_data = json.loads(manifest_file.read_bytes())
 
+        self.dependency_fingerprints = initial_data.pop(DEPENDENCIES_KEY, {})
+
         for key in initial_data.keys():
             values = initial_data[key]
 
-            self._data[key] = ManifestItem(name=key, mtime=values.get("mtime"), md5=values.get("md5"))
+            self._data[key] = ManifestItem(
+                name=key,
+                mtime=values.get("mtime"),
+                md5=values.get("md5"),
+                size=values.get("size"),
+                dependencies=values.get("dependencies"),
+            )
 
     def __iter__(self):
         return iter(self._data.values())
@@ -217,22 +303,27 @@ class Manifest:
         self._manifest_file = manifest_file
         self._items = ManifestItems()
 
+        # Items get added from multiple threads during a build
+        self._lock = Lock()
+
+        # Cache of the current fingerprint of each dependency for the duration of the build
+        self._current_dependency_fingerprints: dict[str, str] = {}
+        self._static_paths: dict[str, str] | None = None
+
         if self._manifest_file.exists():
             self._items.load(manifest_file=manifest_file)
 
         staticfiles_manifest = get_staticfiles_json()
 
         if staticfiles_manifest.exists():
-            if staticfiles_manifest_item := self.get(staticfiles_manifest):
-                staticfiles_manifest_md5 = md5_hash(  # noqa: S324
-                    staticfiles_manifest.read_bytes()
-                ).hexdigest()
-
-                if staticfiles_manifest_item.md5 != staticfiles_manifest_md5:
-                    self.add(staticfiles_manifest)
-                    self._static_files_manifest_changed = True
-            else:
-                self.add(staticfiles_manifest)
+            staticfiles_manifest_item = ManifestItem.create(staticfiles_manifest)
+            existing_staticfiles_manifest_item = self.get(staticfiles_manifest)
+
+            if (
+                existing_staticfiles_manifest_item is None
+                or existing_staticfiles_manifest_item.md5 != staticfiles_manifest_item.md5
+            ):
+                self.add(staticfiles_manifest, item=staticfiles_manifest_item)
                 self._static_files_manifest_changed = True
 
     @property
@@ -251,18 +342,95 @@ class Manifest:
 
         return self._static_files_manifest_changed
 
-    def add(self, path: Path) -> ManifestItem:
+    @property
+    def has_items_without_dependencies(self) -> bool:
+        """
+        Whether any markdown file in the manifest was built before dependencies were stored.
+        """
+
+        staticfiles_manifest_name = get_staticfiles_json().name
+
+        return any(item.dependencies is None for item in self._items if item.name != staticfiles_manifest_name)
+
+    def add(self, path: Path, item: ManifestItem | None = None) -> ManifestItem:
         """
         Adds a path (normally a markdown file, but could also be `staticfiles.json`) to
         the manifest. Also used to update an existing file in the manifest.
+
+        Args:
+            path: The path of the file.
+            item: An already created `ManifestItem` for the path, e.g. one returned from
+                another process. Created from `path` if not passed in.
         """
 
-        item = ManifestItem.create(path)
-        self._items._data[item.name] = item
-        self._is_dirty = True
+        if item is None:
+            item = ManifestItem.create(path)
+
+        with self._lock:
+            self._items.add(item)
+            self._is_dirty = True
 
         return item
 
+    def remove(self, path: Path) -> None:
+        """
+        Removes a markdown file from the manifest so that it gets rendered again in the next build, e.g.
+        when rendering it failed. Otherwise, the fingerprints of its dependencies would get written as
+        current and the file would be skipped until it or its dependencies change again.
+        """
+
+        name = ManifestItem.get_name(path)
+
+        with self._lock:
+            self._items.remove(name)
+            self._is_dirty = True
+
+    def _get_static_paths(self) -> dict[str, str]:
+        """
+        Gets the mapping of static file names to hashed file names from the current `staticfiles.json`.
+        Empty if the static files storage does not use a manifest.
+        """
+
+        if self._static_paths is None:
+            static_paths = {}
+            staticfiles_manifest = get_staticfiles_json()
+
+            if staticfiles_manifest.exists():
+                try:
+                    static_paths = json.loads(staticfiles_manifest.read_bytes()).get("paths", {})
+                except json.decoder.JSONDecodeError:
+                    pass
+
+            self._static_paths = static_paths
+
+        return self._static_paths
+
+    def _get_current_dependency_fingerprint(self, dependency: str) -> str:
+        if (fingerprint := self._current_dependency_fingerprints.get(dependency)) is None:
+            fingerprint = get_fingerprint(dependency, static_paths=self._get_static_paths())
+
+            with self._lock:
+                self._current_dependency_fingerprints[dependency] = fingerprint
+
+        return fingerprint
+
+    def has_changed_dependencies(self, item: ManifestItem) -> bool:
+        """
+        Whether any of the templates, data, or directories used to render the item have changed
+        since the last build. Items from manifests without dependencies never have changed dependencies.
+        """
+
+        if not item.dependencies:
+            return False
+
+        for dependency in item.dependencies:
+            previous_fingerprint = self._items.dependency_fingerprints.get(dependency)
+
+            if previous_fingerprint != self._get_current_dependency_fingerprint(dependency):
+                return True
+
+        return False
+
     def get(self, markdown_file: Path) -> ManifestItem | None:
         """
         Gets information about a markdown file from the manifest.
@@ -282,9 +450,20 @@ class Manifest:
         Writes the current manifest to the output file (typically output.json).
         """
 
-        data = {}
+        data: dict[str, dict] = {}
+        dependencies: set[str] = set()
+
+        with self._lock:
+            for item in self._items:
+                data[item.name] = {"mtime": item.mtime, "size": item.size, "md5": item.md5}
+
+                if item.dependencies is not None:
+                    data[item.name]["dependencies"] = item.dependencies
+                    dependencies.update(item.dependencies)
 
-        for item in self._items:
-            data[item.name] = {"mtime": item.mtime, "md5": item.md5}
+        if dependencies:
+            data[DEPENDENCIES_KEY] = {
+                dependency: self._get_current_dependency_fingerprint(dependency) for dependency in sorted(dependencies)
+            }
 
         self._manifest_file.write_text(json.dumps(data))
@@ -0,0 +1,149 @@
+import logging
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from threading import Lock
+
+from django.utils.timezone import now
+
+from coltrane.config.cache import MetadataCache
+from coltrane.utils import convert_to_datetime
+
+logger = logging.getLogger(__name__)
+
+# Same boundary that `python-frontmatter` uses for YAML frontmatter
+YAML_FRONTMATTER_BOUNDARY = re.compile(r"^-{3,}\s*$")
+
+
+def parse_metadata(metadata: dict) -> dict:
+    """
+    Add new, parse and/or cast existing values to metadata from markdown frontmatter.
+    """
+
+    if "draft" in metadata:
+        if metadata["draft"] is True:
+            pass
+        elif metadata["draft"] == "1":
+            metadata["draft"] = True
+        else:
+            metadata["draft"] = False
+
+    metadata["now"] = now()
+
+    if "publish_date" in metadata:
+        metadata["publish_date"] = convert_to_datetime(metadata["publish_date"])
+
+    return metadata
+
+
+def read_frontmatter(path: Path) -> dict:
+    """
+    Reads the frontmatter of a markdown file without reading the rest of the file. Frontmatter that
+    is not YAML is parsed from the whole file by `python-frontmatter`.
+    """
+
+    import frontmatter
+
+    with path.open("r", encoding="utf-8") as f:
+        first_line = f.readline()
+
+        # `python-frontmatter` strips leading whitespace from the text before looking for frontmatter
+        while first_line and not first_line.strip():
+            first_line = f.readline()
+
+        if not YAML_FRONTMATTER_BOUNDARY.match(first_line):
+            if first_line.strip().startswith(("+++", "{")):
+                return frontmatter.loads(first_line + f.read()).metadata
+
+            return {}
+
+        lines = []
+
+        for line in f:
+            if YAML_FRONTMATTER_BOUNDARY.match(line):
+                break
+
+            lines.append(line)
+        else:
+            # There is no closing boundary, so there isn't any frontmatter
+            return {}
+
+    return frontmatter.YAMLHandler().load("".join(lines)) or {}
+
+
+@dataclass
+class MetadataIndexEntry:
+    mtime_ns: int
+    size: int
+    metadata: dict
+
+
+def _get_cached_metadata(path: Path, mtime_ns: int, size: int) -> dict:
+    """
+    Gets the parsed frontmatter of a markdown file from the metadata cache if it's enabled, otherwise
+    parses it.
+    """
+
+    metadata_cache = MetadataCache()
+
+    if not metadata_cache.is_enabled:
+        return parse_metadata(read_frontmatter(path))
+
+    cache_key = metadata_cache.get_cache_key(path, mtime_ns=mtime_ns, size=size)
+    metadata = metadata_cache.cache.get(cache_key)
+
+    if metadata is None:
+        metadata = parse_metadata(read_frontmatter(path))
+        metadata_cache.cache.set(cache_key, metadata, metadata_cache.seconds)
+
+    return metadata
+
+
+class MetadataIndex:
+    """
+    Stores the parsed frontmatter of markdown files keyed by path. An entry is re-parsed when the last
+    modified time or size of the file changes, so the index stays current for the lifetime of the process.
+
+    The index is kept in the memory of each process. If `METADATA_CACHE` is enabled, parsed frontmatter
+    is also stored in that cache, so a new process (e.g. the next build) does not parse unchanged files again.
+    """
+
+    def __init__(self):
+        self._entries: dict[Path, MetadataIndexEntry] = {}
+        self._lock = Lock()
+
+    def get(self, path: Path) -> dict:
+        """
+        Gets a copy of the metadata for a markdown file.
+        """
+
+        stat_result = path.stat()
+        entry = self._entries.get(path)
+
+        if entry is None or entry.mtime_ns != stat_result.st_mtime_ns or entry.size != stat_result.st_size:
+            metadata = _get_cached_metadata(path, mtime_ns=stat_result.st_mtime_ns, size=stat_result.st_size)
+            entry = MetadataIndexEntry(mtime_ns=stat_result.st_mtime_ns, size=stat_result.st_size, metadata=metadata)
+
+            with self._lock:
+                self._entries[path] = entry
+
+        metadata = dict(entry.metadata)
+        metadata["now"] = now()
+
+        return metadata
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+# Global metadata index that is cached in the module
+metadata_index = MetadataIndex()
+
+
+def get_metadata(path: Path) -> dict:
+    """
+    Gets the metadata from the frontmatter of a markdown file without rendering it.
+    """
+
+    return metadata_index.get(path)
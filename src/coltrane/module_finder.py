@@ -30,6 +30,22 @@ def is_django_compressor_installed() -> bool:
     return is_module_available("compressor")
 
 
+def is_brotli_installed() -> bool:
+    """
+    Helper function to check if `brotli` is installed.
+    """
+
+    return is_module_available("brotli")
+
+
+def is_zstandard_installed() -> bool:
+    """
+    Helper function to check if `zstandard` is installed.
+    """
+
+    return is_module_available("zstandard")
+
+
 def is_dj_angles_installed() -> bool:
     """
     Helper function to check if `dj_angles` is installed.
@@ -0,0 +1,125 @@
+"""
+Splits the content of a directory into pages, i.e. `/blog/`, `/blog/page/2/`, `/blog/page/3/`.
+"""
+
+import re
+
+from django.core.paginator import Page, Paginator
+from django.http import HttpRequest
+
+from coltrane.directory_index import DirectoryIndexEntry
+
+# Matches the page number at the end of a path, i.e. `/blog/page/2/`
+PAGE_PATH_PATTERN = re.compile(r"^(?P<path>.*?)/page/(?P<page_number>[0-9]+)/?$")
+
+# Number of items on a page if `per_page` is not passed in
+DEFAULT_PER_PAGE = 10
+
+
+def parse_page_path(path: str) -> tuple[str, int | None]:
+    """
+    Splits the page number off of a path, i.e. `/blog/page/2/` is `("/blog/", 2)`. The page number is `None`
+    for paths that are not a page.
+    """
+
+    if not path.startswith("/"):
+        path = f"/{path}"
+
+    if match := PAGE_PATH_PATTERN.match(path):
+        return (f"{match.group('path')}/", int(match.group("page_number")))
+
+    if not path.endswith("/"):
+        path = f"{path}/"
+
+    return (path, None)
+
+
+def get_page_path(path: str, page_number: int) -> str:
+    """
+    Gets the path of a page, i.e. `/blog/page/2/` for page 2 of `/blog/`. The first page is the path itself.
+    """
+
+    if not path.endswith("/"):
+        path = f"{path}/"
+
+    if page_number == 1:
+        return path
+
+    return f"{path}page/{page_number}/"
+
+
+def set_page_count(request: HttpRequest, page_count: int) -> None:
+    """
+    Stores the number of pages of the content that was paginated while rendering a request.
+    """
+
+    request._coltrane_page_count = max(get_page_count(request) or 0, page_count)  # type: ignore
+
+
+def get_page_count(request: HttpRequest) -> int | None:
+    """
+    Gets the number of pages of the content that was paginated while rendering a request. `None` if nothing
+    was paginated.
+    """
+
+    return getattr(request, "_coltrane_page_count", None)
+
+
+class DirectoryItems:
+    """
+    The items of an indexed directory that only get copied when they are sliced, so that paginating doesn't
+    copy the metadata of every markdown file.
+    """
+
+    def __init__(self, entry: DirectoryIndexEntry, *, order_by: str | None = None, exclude: set[str] | None = None):
+        self._entry = entry
+        self._indexes = entry.get_ordering(order_by) if order_by else range(len(entry.items))
+
+        if exclude:
+            self._indexes = [idx for idx in self._indexes if entry.items[idx]["slug"] not in exclude]
+
+    def __len__(self) -> int:
+        return len(self._indexes)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return [self._entry.get_item(idx) for idx in self._indexes[key]]
+
+        return self._entry.get_item(self._indexes[key])
+
+
+class DirectoryPage(Page):
+    """
+    A page of content with the URLs of the pages around it.
+    """
+
+    paginator: "DirectoryPaginator"
+
+    @property
+    def url(self) -> str:
+        return get_page_path(self.paginator.path, self.number)
+
+    @property
+    def next_url(self) -> str | None:
+        if self.has_next():
+            return get_page_path(self.paginator.path, self.next_page_number())
+
+        return None
+
+    @property
+    def previous_url(self) -> str | None:
+        if self.has_previous():
+            return get_page_path(self.paginator.path, self.previous_page_number())
+
+        return None
+
+
+class DirectoryPaginator(Paginator):
+    def __init__(self, object_list, per_page: int, path: str = "/", **kwargs):
+        # The path of the first page
+        self.path = path
+
+        super().__init__(object_list, per_page, **kwargs)
+
+    def _get_page(self, *args, **kwargs) -> DirectoryPage:
+        return DirectoryPage(*args, **kwargs)
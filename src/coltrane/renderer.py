@@ -2,8 +2,11 @@ import codecs
 import logging
 import re
 from dataclasses import dataclass, field
+from functools import cache, lru_cache
 from html import unescape
 from pathlib import Path
+from threading import local
+from typing import Any
 from urllib.parse import unquote
 
 from django.conf import settings
@@ -13,6 +16,7 @@ from django.utils.html import mark_safe  # type: ignore
 from django.utils.text import slugify
 from django.utils.timezone import now
 
+from coltrane.config.cache import HighlightCache, MarkdownCache
 from coltrane.config.coltrane import Site
 from coltrane.config.paths import get_content_directory
 from coltrane.config.settings import (
@@ -21,8 +25,9 @@ from coltrane.config.settings import (
     get_mistune_plugins,
     get_site_url,
 )
-from coltrane.retriever import get_data
-from coltrane.utils import convert_to_datetime
+from coltrane.dependencies import add_content_dependency
+from coltrane.metadata import parse_metadata
+from coltrane.retriever import get_lazy_data
 
 logger = logging.getLogger(__name__)
 
@@ -30,6 +35,115 @@ DEFAULT_TEMPLATE = "coltrane/content.html"
 
 SPACE_REPLACEMENT = "DJANGO-TEMPLATE-TAG-SPACE"
 
+# Matches code fences and the Django template variables and tags that need to be protected from `mistune`
+PRE_PROCESS_PATTERN = re.compile(
+    r"(?P<code_fence>```.*?```)"
+    r"|\({{\s*(?P<variable>\S+)\s*}}\)"
+    r"|\({%\s*(?P<template_tag>\S+)\s*(?P<template_tag_args>.*?)\s*%}\)",
+    flags=re.RegexFlag.DOTALL,
+)
+
+# Matches the markers from `PRE_PROCESS_PATTERN` in the rendered HTML
+POST_PROCESS_PATTERN = re.compile(
+    r"DJANGO-TEMPLATE-VARIABLE-BEGIN-(?P<variable>.*?)-DJANGO-TEMPLATE-VARIABLE-END"
+    r"|DJANGO-TEMPLATE-TAG-BEGIN-(?P<template_tag>.*?)-DJANGO-TEMPLATE-TAG-END"
+    r"|(?P<verbatim><p>{% verbatim %}</p>\n)"
+    r"|(?P<endverbatim>\n<p>{% endverbatim %}</p>)",
+    flags=re.RegexFlag.DOTALL,
+)
+
+# Matches HTML tags and the quotes that get escaped by `mistune` and `pygments` outside of them
+ESCAPED_QUOTE_PATTERN = re.compile(r"<[^>]*>|&quot;|&#39;")
+
+ESCAPED_QUOTES = {"&quot;": '"', "&#39;": "'"}
+
+# Matches the characters in text that have to be escaped; ampersands that start an entity are left as-is
+TEXT_ESCAPE_PATTERN = re.compile(r"&(?!#?[0-9a-zA-Z]+;)|<|>")
+
+TEXT_ESCAPES = {"&": "&amp;", "<": "&lt;", ">": "&gt;"}
+
+# Maximum number of compiled templates to keep in memory
+COMPILED_TEMPLATE_CACHE_SIZE = 1024
+
+# Maximum number of highlighted code blocks to keep in memory
+HIGHLIGHTED_CODE_CACHE_SIZE = 1024
+
+
+@lru_cache(maxsize=COMPILED_TEMPLATE_CACHE_SIZE)
+def _compile_template(django_engine, html: str):
+    """
+    Compiles the HTML into a Django `Template`. The most recently used templates are cached, so rendering
+    the same HTML again skips the Django lexer and parser. Keyed by the engine as well, so changing the
+    `TEMPLATES` setting doesn't use templates compiled by an outdated engine.
+    """
+
+    return django_engine.from_string(html)
+
+
+@cache
+def _get_lexer(language: str):
+    """
+    Gets the `pygments` lexer for a language, or `None` if there isn't one. Looking up a lexer by name
+    searches through all lexers, so each language is only looked up once.
+    """
+
+    from pygments.lexers import get_lexer_by_name
+    from pygments.util import ClassNotFound
+
+    try:
+        return get_lexer_by_name(language)
+    except ClassNotFound:
+        return None
+
+
+@cache
+def _get_html_formatter(formatter_opts: tuple[tuple[str, Any], ...]):
+    """
+    Gets the `pygments` HTML formatter for the options.
+    """
+
+    from pygments.formatters import HtmlFormatter
+
+    return HtmlFormatter(**dict(formatter_opts))
+
+
+def _color_with_pygments(codeblock: str, lexer, **formatter_opts) -> str:
+    import pygments
+
+    formatter_opts.setdefault("cssclass", "codehilite")
+    formatter = _get_html_formatter(tuple(sorted(formatter_opts.items())))
+
+    return pygments.highlight(codeblock, lexer, formatter)
+
+
+@lru_cache(maxsize=HIGHLIGHTED_CODE_CACHE_SIZE)
+def _highlight_code(code: str, language: str) -> str | None:
+    """
+    Highlights the code with `pygments`. Returns `None` if there isn't a lexer for the language. The most
+    recently highlighted code blocks are kept in memory; if the highlight cache is enabled, they are
+    also stored in the cache so they don't get highlighted again in the next build.
+    """
+
+    lexer = _get_lexer(language)
+
+    if lexer is None:
+        return None
+
+    highlight_cache = HighlightCache()
+
+    if highlight_cache.is_enabled:
+        cache_key = highlight_cache.get_cache_key(code, language)
+
+        if (html := highlight_cache.cache.get(cache_key)) is not None:
+            return html
+
+    html = _color_with_pygments(code, lexer)
+
+    if highlight_cache.is_enabled:
+        highlight_cache.cache.set(cache_key, html, timeout=highlight_cache.seconds)
+
+    return html
+
 
 @dataclass
 class StaticRequest(HttpRequest):
@@ -69,7 +183,8 @@ class StaticRequest(HttpRequest):
 
 
 class MarkdownRenderer:
-    _instance = None
+    # Each thread gets its own renderer, so `mistune` and its plugins are never shared between threads
+    _local = local()
 
     def _get_markdown_content_as_html(self, slug: str, site: Site) -> tuple[str, dict | None]:
         """
@@ -77,6 +192,7 @@ class MarkdownRenderer:
         """
 
         path = get_content_directory(site) / f"{slug}.md"
+        add_content_dependency(path)
 
         return self.render_markdown_path(path)
 
@@ -101,13 +217,31 @@ class MarkdownRenderer:
 
     def render_markdown_path(self, path) -> tuple[str, dict]:
         """
-        Renders the markdown file located at path.
+        Renders the markdown file located at path. Uses the cached HTML and metadata if the markdown
+        cache is enabled and the file hasn't changed.
         """
 
+        markdown_cache = MarkdownCache()
+        cache_key = ""
+
+        if markdown_cache.is_enabled:
+            cache_key = markdown_cache.get_cache_key(Path(path))
+
+            if cached_value := markdown_cache.cache.get(cache_key):
+                (html, metadata) = cached_value
+                metadata["now"] = now()
+
+                return (html, metadata)
+
         with codecs.open(path, "r", encoding="utf-8") as f:
             text = f.read()
 
-            return self.render_markdown_text(text)
+        (html, metadata) = self.render_markdown_text(text)
+
+        if markdown_cache.is_enabled:
+            markdown_cache.cache.set(cache_key, (html, metadata), timeout=markdown_cache.seconds)
+
+        return (html, metadata)
 
     def render_markdown_text(self, text: str) -> tuple[str, dict]:  # noqa: ARG002
         raise Exception("Missing render_markdown_text")
@@ -118,8 +252,7 @@ class MarkdownRenderer:
         variables from the `context` dictionary.
         """
 
-        django_engine = engines["django"]
-        template = django_engine.from_string(html)
+        template = _compile_template(engines["django"], html)
 
         return str(template.render(context=context, request=request))
 
@@ -162,9 +295,8 @@ class MarkdownRenderer:
         # Start with any metadata from the markdown frontmatter
         context.update(metadata)
 
-        # Add JSON data to the context
-        data = get_data(site=site)
-        context["data"] = data
+        # Add JSON data to the context; only parsed when a template uses it
+        context["data"] = get_lazy_data(site=site)
 
         if request:
             context["request"] = request
@@ -179,15 +311,25 @@ class MarkdownRenderer:
 
     @classmethod
     def instance(cls) -> "MistuneMarkdownRenderer":
-        if cls._instance is None:
+        """
+        Gets the markdown renderer for the current thread. Renderers are created once per thread and
+        re-used for every render in that thread, so rendering concurrently (e.g. with `build` threads or
+        threaded WSGI workers) doesn't share any state between threads.
+        """
+
+        markdown_renderer_instance = getattr(cls._local, "instance", None)
+
+        if markdown_renderer_instance is None:
             markdown_renderer = get_markdown_renderer()
 
             if markdown_renderer == "mistune":
-                cls._instance = MistuneMarkdownRenderer()
+                markdown_renderer_instance = MistuneMarkdownRenderer()
             else:
                 raise AssertionError("Invalid markdown renderer")
 
-        return cls._instance
+            cls._local.instance = markdown_renderer_instance
+
+        return markdown_renderer_instance
 
 
 class MistuneMarkdownRenderer(MarkdownRenderer):
@@ -198,19 +340,49 @@ class MistuneMarkdownRenderer(MarkdownRenderer):
     from mistune.renderers.html import HTMLRenderer
 
     class CustomHTMLRenderer(HTMLRenderer):
-        def _color_with_pygments(self, codeblock, lexer, **formatter_opts):
-            import pygments
-            from pygments.formatters import HtmlFormatter
+        def safe_url(self, url: str) -> str:
+            # Convert URLs that were urlencoded by `mistune` back to their original form so that Django
+            # template variables and tags in them still work
+            return unquote(super().safe_url(url))
+
+        def text(self, text: str) -> str:
+            # Raw HTML passes through, so only escape the characters in text that aren't already entities
+            return TEXT_ESCAPE_PATTERN.sub(lambda match: TEXT_ESCAPES[match.group()], text)
+
+        def render_token(self, token, state):
+            if token["type"] == "heading":
+                # Collect headings in the state of the current render for the table of contents
+                text = self.render_tokens(token["children"], state)
+
+                return self.heading(text, headings=state.env.setdefault("headings", []), **token["attrs"])
+
+            return super().render_token(token, state)
+
+        # Void elements are rendered without a space before the slash, i.e. `<br/>`
+        def image(self, text: str, url: str, title=None) -> str:
+            html = super().image(text, url, title=title)
 
-            formatter_opts.setdefault("cssclass", "codehilite")
-            formatter = HtmlFormatter(**formatter_opts)
+            return f"{html.removesuffix(' />')}/>"
 
-            return pygments.highlight(codeblock, lexer, formatter)
+        def linebreak(self) -> str:
+            return "<br/>\n"
+
+        def thematic_break(self) -> str:
+            return "<hr/>\n"
+
+        def heading(self, text: str, level: int, headings: list | None = None, **attrs) -> str:
+            from django.utils.html import strip_tags
+
+            # Add an `id` to each heading so that the table of contents can link to it
+            attrs.setdefault("id", slugify(strip_tags(unescape(text))))
+
+            if headings is not None:
+                headings.append((level, attrs["id"], unescape(text)))
+
+            return super().heading(text, level, **attrs)
 
         def block_code(self, code: str, info=None) -> str:
             import mistune
-            from pygments.lexers import get_lexer_by_name
-            from pygments.util import ClassNotFound
 
             language = ""
 
@@ -218,15 +390,8 @@ class MistuneMarkdownRenderer(MarkdownRenderer):
                 info = mistune.renderers.html.safe_entity(info.strip())
                 language = info.split(None, 1)[0]
 
-                if language:
-                    try:
-                        lexer = get_lexer_by_name(language)
-
-                        p = self._color_with_pygments(code, lexer)
-
-                        return p
-                    except ClassNotFound:
-                        pass
+                if language and (html := _highlight_code(code, language)):
+                    return html
 
             return f"<code><pre>{code}</pre></code>\n"
 
@@ -237,7 +402,7 @@ class MistuneMarkdownRenderer(MarkdownRenderer):
         plugins = [*get_mistune_plugins(), FencedDirective([Admonition()])]
 
         self.mistune_markdown = mistune.create_markdown(
-            renderer=MistuneMarkdownRenderer.CustomHTMLRenderer(),  # type: ignore
+            renderer=MistuneMarkdownRenderer.CustomHTMLRenderer(escape=False),  # type: ignore
             plugins=plugins,
         )
 
@@ -245,50 +410,22 @@ class MistuneMarkdownRenderer(MarkdownRenderer):
         """
         Add new, parse and/or cast existing values to metadata.
 
-        `metadata["toc"]` gets generated in `_generate_toc`.
+        `metadata["toc"]` gets generated from the headings in `render_markdown_text`.
         """
 
-        metadata = post.metadata
+        return parse_metadata(post.metadata)
 
-        if "draft" in metadata:
-            if metadata["draft"] is True:
-                pass
-            elif metadata["draft"] == "1":
-                metadata["draft"] = True
-            else:
-                metadata["draft"] = False
-
-        metadata["now"] = now()
-
-        if "publish_date" in metadata:
-            metadata["publish_date"] = convert_to_datetime(metadata["publish_date"])
-
-        return metadata
-
-    def _generate_toc(self, content, metadata):
+    def _generate_toc(self, headings: list[tuple[int, str, str]]) -> str | None:
         """
-        Update the content to add links to each header and add a `toc` key to
-        `metadata` with HTML for a table of contents.
+        Generate HTML for a table of contents from the level, id, and text of the headings that were
+        collected while rendering.
         """
 
-        from django.utils.html import strip_tags
-        from minestrone import HTML
-
-        html = HTML(content)
-
         last_header_int = 0
         nested_count = 0
         strings = []
 
-        for el in html.query("*"):
-            if el.name not in ("h1", "h2", "h3", "h4", "h5", "h6"):
-                continue
-
-            header_text_slug = slugify(strip_tags(el.text))
-            el.id = header_text_slug
-
-            header_int = int(el.name[1:])
-
+        for header_int, header_id, header_text in headings:
             if nested_count == 0:
                 # Add the initial header
                 strings.append("<ul>")
@@ -323,91 +460,91 @@ class MistuneMarkdownRenderer(MarkdownRenderer):
 
                 nested_count += 1
 
-            strings.append(f'<li><a href="#{header_text_slug}">{el.text}</a>')
+            strings.append(f'<li><a href="#{header_id}">{header_text}</a>')
             last_header_int = header_int
 
         # Close the correct number of `li` and `ul` tags at the end
         for _ in range(nested_count):
             strings.append("</li></ul>")
 
-        metadata["toc"] = None
+        if not strings:
+            return None
 
-        if strings:
-            toc_html = "".join(strings)
-            metadata["toc"] = mark_safe(toc_html)  # noqa: S308
+        return "".join(strings)
 
-        content = str(html)
+    def _protect_django_template_language(self, match: re.Match) -> str:
+        if match.group("code_fence"):
+            # Wrap code fences with Django `verbatim` templatetag; these get fixed in `post_process_html`
+            return f"{{% verbatim %}}\n{match.group('code_fence')}\n{{% endverbatim %}}"
 
-        return (content, metadata)
+        if variable := match.group("variable"):
+            return f"(DJANGO-TEMPLATE-VARIABLE-BEGIN-{variable}-DJANGO-TEMPLATE-VARIABLE-END)"
 
-    def pre_process_markdown(self, text: str) -> str:
-        text = super().pre_process_markdown(text)
+        # Replace spaces between the Django template tag args/kwargs with something that
+        # can be removed later and replace double quotes with single quotes
+        template_tag_args = match.group("template_tag_args").replace(" ", SPACE_REPLACEMENT).replace('"', "'")
 
-        # Replace Django template variables in markdown with a marker for later because
-        # mistune won't match markdown commands if there are empty strings
-        text = re.sub(
-            pattern=r"\({{\s*(\S+)\s*}}\)",
-            repl=r"(DJANGO-TEMPLATE-VARIABLE-BEGIN-\g<1>-DJANGO-TEMPLATE-VARIABLE-END)",
-            string=text,
-            flags=re.RegexFlag.DOTALL,
+        return (
+            f"(DJANGO-TEMPLATE-TAG-BEGIN-{match.group('template_tag')}{SPACE_REPLACEMENT}{template_tag_args}"
+            "-DJANGO-TEMPLATE-TAG-END)"
         )
 
-        # Get all matches for Django template tags for later adjustment
-        pattern = r"\({%\s*(\S+)\s*(.*?)\s*%}\)"
-        template_tag_matches = re.findall(pattern=pattern, string=text, flags=re.RegexFlag.DOTALL)
-
-        # Replace Django template tags in markdown with a marker for later because
-        # mistune won't match markdown commands if there are empty strings
-        text = re.sub(
-            pattern=pattern,
-            repl=rf"(DJANGO-TEMPLATE-TAG-BEGIN-\g<1>{SPACE_REPLACEMENT}\g<2>-DJANGO-TEMPLATE-TAG-END)",
-            string=text,
-            flags=re.RegexFlag.DOTALL,
-        )
+    def pre_process_markdown(self, text: str) -> str:
+        """
+        Wraps code fences with the `verbatim` templatetag and replaces Django template variables and
+        tags in parenthesis (i.e. link and image URLs) with markers because `mistune` won't match markdown
+        if there are spaces in them. Everything is replaced in one pass through the text.
+        """
 
-        # Replace spaces between the Django template tag args/kwargs with something that
-        # can be removed later
-        for match in template_tag_matches:
-            # Replace empty string with `SPACE_REPLACEMENT`
-            # Replace double quote with a single quote
-            template_tag_args = match[1].replace(" ", SPACE_REPLACEMENT).replace('"', "'")
+        return PRE_PROCESS_PATTERN.sub(self._protect_django_template_language, text)
 
-            text = text.replace(match[1], template_tag_args)
+    def _restore_django_template_language(self, match: re.Match) -> str:
+        if variable := match.group("variable"):
+            return f"{{{{ {variable} }}}}"
 
-        return text
+        if template_tag := match.group("template_tag"):
+            return f"{{% {template_tag.replace(SPACE_REPLACEMENT, ' ')} %}}"
 
-    def post_process_html(self, html: str) -> str:
-        html = super().post_process_html(html)
+        # Remove `p` tags that get added to the `verbatim` templatetag
+        if match.group("verbatim"):
+            return "{% verbatim %}"
 
-        # Replace the Django template language variable marker so that Django
-        # variables will work for the next stage
-        html = html.replace("DJANGO-TEMPLATE-VARIABLE-BEGIN-", "{{ ").replace("-DJANGO-TEMPLATE-VARIABLE-END", " }}")
+        return "{% endverbatim %}"
 
-        # Replace the Django template tag variable marker so that Django
-        # template tags will work for the next stage
-        html = html.replace("DJANGO-TEMPLATE-TAG-BEGIN-", "{% ").replace("-DJANGO-TEMPLATE-TAG-END", " %}")
+    def _unescape_quotes(self, html: str) -> str:
+        """
+        Unescapes quotes in the text of the HTML so that Django template variables and tags with strings
+        still work. Tags are left as-is, so quotes in attributes stay escaped.
+        """
 
-        # Fix replacement string characters done in `pre_process_markdown`
-        html = html.replace(SPACE_REPLACEMENT, " ")
+        return ESCAPED_QUOTE_PATTERN.sub(lambda match: ESCAPED_QUOTES.get(match.group(), match.group()), html)
 
-        # Convert strings that were urlencoded by `mistune` back to their original form
-        html = unquote(html)
+    def post_process_html(self, html: str) -> str:
+        """
+        Restores the Django template variables and tags that were replaced in `pre_process_markdown` so
+        they get rendered by Django in the next stage. Everything is restored in one pass through the HTML.
+        """
 
-        return html
+        return POST_PROCESS_PATTERN.sub(self._restore_django_template_language, html)
 
     def render_markdown_text(self, text: str) -> tuple[str, dict]:
         import frontmatter
 
         frontmatter_post = frontmatter.loads(text)
-        content = frontmatter_post.content
 
         content = self.pre_process_markdown(frontmatter_post.content)
-        content = self.mistune_markdown(content)
-        content = unescape(content)  # type: ignore
+        (content, state) = self.mistune_markdown.parse(content)
+        content = self._unescape_quotes(content)
         content = self.post_process_html(content)
 
+        # The table of contents can be skipped with `toc: false` in the frontmatter
+        is_toc_enabled = frontmatter_post.metadata.get("toc") is not False
+
         metadata = self._parse_and_update_metadata(frontmatter_post)
+        metadata["toc"] = None
 
-        (content, metadata) = self._generate_toc(content, metadata)
+        if is_toc_enabled and (toc_html := self._generate_toc(state.env.get("headings", []))):
+            toc_html = self.post_process_html(self._unescape_quotes(toc_html))
+            metadata["toc"] = mark_safe(toc_html)  # noqa: S308
 
         return (content, metadata)
@@ -1,12 +1,42 @@
+import os
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from hashlib import md5 as md5_hash
+from pathlib import Path
 from typing import TYPE_CHECKING, Optional
+from xml.sax.saxutils import escape
 
 from django.contrib.sitemaps import Sitemap
 
+from coltrane.pagination import get_page_path
 from coltrane.retriever import ContentItem, get_content_items
 
 if TYPE_CHECKING:
     from coltrane.config.coltrane import Site
 
+# Maximum number of URLs in one sitemap file per https://www.sitemaps.org/protocol.html
+SITEMAP_MAX_URLS = 50_000
+
+SITEMAP_FILE_NAME = "sitemap.xml"
+
+XML_DECLARATION = '<?xml version="1.0" encoding="UTF-8"?>\n'
+
+# Size of the chunks that existing sitemap files are read in to hash them
+READ_CHUNK_SIZE = 1024 * 1024
+
+
+def get_lastmod(content_item: ContentItem) -> datetime:
+    """
+    Gets when the content was last modified: the `publish_date` from the frontmatter if there is one,
+    otherwise the last modified time of the markdown file.
+    """
+
+    if isinstance(publish_date := content_item.metadata.get("publish_date"), datetime):
+        return publish_date
+
+    return datetime.fromtimestamp(content_item.path.stat().st_mtime, tz=timezone.utc)
+
 
 class ContentSitemap(Sitemap):
     changefreq = "hourly"
@@ -18,3 +48,166 @@ class ContentSitemap(Sitemap):
 
     def location(self, content_item: ContentItem) -> str:
         return content_item.relative_url
+
+    def lastmod(self, content_item: ContentItem) -> datetime:
+        return get_lastmod(content_item)
+
+
+@dataclass
+class SitemapUrl:
+    location: str
+    lastmod: datetime
+
+
+def _get_built_page_count(output_directory: Path, relative_url: str) -> int:
+    """
+    Gets the number of pages that were built for a markdown file that paginates a directory, i.e. 3 if
+    `blog/page/2/index.html` and `blog/page/3/index.html` are in the output directory.
+    """
+
+    page_count = 1
+    pages_directory = output_directory / relative_url.lstrip("/") / "page"
+
+    while (pages_directory / str(page_count + 1) / "index.html").is_file():
+        page_count += 1
+
+    return page_count
+
+
+def get_sitemap_urls(
+    base_url: str, site: Optional["Site"] = None, output_directory: Path | None = None
+) -> list[SitemapUrl]:
+    """
+    Gets the URL of every markdown file that isn't a draft, sorted by location so that the same content
+    always ends up in the same sitemap file. Only uses the indexed frontmatter, so nothing gets rendered.
+
+    The pages of markdown files that paginate a directory, i.e. `/blog/page/2/`, are included when they
+    were built in `output_directory`.
+    """
+
+    urls = []
+
+    for content_item in get_content_items(site=site):
+        lastmod = get_lastmod(content_item)
+        urls.append(SitemapUrl(location=f"{base_url}{content_item.relative_url}", lastmod=lastmod))
+
+        if output_directory:
+            for page_number in range(2, _get_built_page_count(output_directory, content_item.relative_url) + 1):
+                location = f"{base_url}{get_page_path(content_item.relative_url, page_number)}"
+                urls.append(SitemapUrl(location=location, lastmod=lastmod))
+
+    urls.sort(key=lambda url: url.location)
+
+    return urls
+
+
+def _get_urlset_lines(urls: Iterable[SitemapUrl]) -> Iterator[str]:
+    yield XML_DECLARATION
+    yield '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9" xmlns:xhtml="http://www.w3.org/1999/xhtml">\n'
+
+    for url in urls:
+        yield (
+            f"<url><loc>{escape(url.location)}</loc><lastmod>{url.lastmod:%Y-%m-%d}</lastmod>"
+            f"<changefreq>{ContentSitemap.changefreq}</changefreq><priority>{ContentSitemap.priority}</priority></url>\n"
+        )
+
+    yield "</urlset>\n"
+
+
+def _get_sitemap_index_lines(shards: Iterable[tuple[str, datetime]]) -> Iterator[str]:
+    yield XML_DECLARATION
+    yield '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+
+    for location, lastmod in shards:
+        yield f"<sitemap><loc>{escape(location)}</loc><lastmod>{lastmod.isoformat()}</lastmod></sitemap>\n"
+
+    yield "</sitemapindex>\n"
+
+
+def _get_file_md5(path: Path) -> str | None:
+    md5 = md5_hash()  # noqa: S324
+
+    try:
+        with path.open("rb") as f:
+            while chunk := f.read(READ_CHUNK_SIZE):
+                md5.update(chunk)
+    except FileNotFoundError:
+        return None
+
+    return md5.hexdigest()
+
+
+def _write_if_changed(path: Path, lines: Iterable[str]) -> bool:
+    """
+    Writes the lines to a temporary file while hashing them, so the whole file is never in memory. The
+    existing file only gets replaced if it is different, so unchanged files keep their last modified time.
+    Returns whether the file was written.
+    """
+
+    temporary_path = path.with_name(f".{path.name}.tmp")
+    md5 = md5_hash()  # noqa: S324
+
+    with temporary_path.open("w", encoding="utf-8") as f:
+        for line in lines:
+            f.write(line)
+            md5.update(line.encode())
+
+    if md5.hexdigest() == _get_file_md5(path):
+        temporary_path.unlink()
+
+        return False
+
+    os.replace(temporary_path, path)
+
+    return True
+
+
+def _get_shard_name(shard_number: int) -> str:
+    return f"sitemap-{shard_number}.xml"
+
+
+def _remove_shards(output_directory: Path, first_shard_number: int) -> None:
+    """
+    Removes sitemap files (and their pre-compressed files) that aren't needed anymore.
+    """
+
+    shard_number = first_shard_number
+
+    while (output_directory / _get_shard_name(shard_number)).exists():
+        for path in output_directory.glob(f"{_get_shard_name(shard_number)}*"):
+            path.unlink()
+
+        shard_number += 1
+
+
+def write_sitemaps(
+    output_directory: Path, urls: list[SitemapUrl], base_url: str, max_urls: int = SITEMAP_MAX_URLS
+) -> int:
+    """
+    Writes `sitemap.xml` for the URLs. More URLs than fit in one sitemap get split into files of `max_urls`
+    each, i.e. `sitemap-1.xml`, `sitemap-2.xml`, and `sitemap.xml` is a sitemap index that links to them.
+
+    Only the files whose URLs changed get written. Returns the number of files that were written.
+    """
+
+    sitemap_path = output_directory / SITEMAP_FILE_NAME
+
+    if len(urls) <= max_urls:
+        _remove_shards(output_directory, first_shard_number=1)
+
+        return int(_write_if_changed(sitemap_path, _get_urlset_lines(urls)))
+
+    written_count = 0
+    shards = []
+
+    for shard_number, idx in enumerate(range(0, len(urls), max_urls), start=1):
+        shard_urls = urls[idx : idx + max_urls]
+        shard_name = _get_shard_name(shard_number)
+
+        written_count += _write_if_changed(output_directory / shard_name, _get_urlset_lines(shard_urls))
+        shards.append((f"{base_url}/{shard_name}", max(url.lastmod for url in shard_urls)))
+
+    _remove_shards(output_directory, first_shard_number=len(shards) + 1)
+    written_count += _write_if_changed(sitemap_path, _get_sitemap_index_lines(shards))
+
+    return written_count
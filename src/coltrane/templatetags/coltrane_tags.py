@@ -1,6 +1,9 @@
+from pathlib import Path
+
 from django import template
 from django.core.handlers.wsgi import WSGIRequest
-from django.http import Http404
+from django.core.paginator import EmptyPage, PageNotAnInteger
+from django.http import Http404, HttpRequest
 from django.template import TemplateDoesNotExist
 from django.template.base import Node, Template, TextNode, Variable, token_kwargs
 from django.template.exceptions import TemplateSyntaxError
@@ -10,8 +13,18 @@ from django.templatetags.static import StaticNode
 from django.utils.safestring import SafeString, mark_safe
 
 from coltrane.config.settings import get_config
+from coltrane.dependencies import add_directory_dependency, add_static_dependency, add_template_dependency
+from coltrane.directory_index import directory_index
+from coltrane.pagination import (
+    DEFAULT_PER_PAGE,
+    DirectoryItems,
+    DirectoryPage,
+    DirectoryPaginator,
+    parse_page_path,
+    set_page_count,
+)
 from coltrane.renderer import MarkdownRenderer
-from coltrane.retriever import get_content_directory, get_content_paths
+from coltrane.retriever import get_content_directory
 
 register = template.Library()
 
@@ -20,90 +33,117 @@ class NoParentError(Exception):
     pass
 
 
-def _is_content_slug_in_string(content_slug: str, slugs: str | None) -> bool:
+def _get_slugs(slugs: str | None) -> set[str]:
     """
-    Whether a content slug is included in a string. Handles if `string` is
-    comma-delimited list of slugs. Also handles any individual slug
-    to check having a forward-slash prefix.
+    Gets the slugs in a comma-delimited list of slugs. Handles any individual slug having a
+    forward-slash prefix.
     """
 
     if not slugs:
-        return False
+        return set()
 
     if not isinstance(slugs, str):
         raise TypeError("Slugs must be a string")
 
-    split_slugs = slugs.split(",")
+    return {slug.strip().removeprefix("/") for slug in slugs.split(",")}
 
-    for slug in split_slugs:
-        slug_to_check = slug.strip()
 
-        if slug_to_check.startswith("/"):
-            slug_to_check = slug_to_check[1:]
-
-        if slug_to_check == content_slug:
-            return True
+def _is_content_slug_in_string(content_slug: str, slugs: str | None) -> bool:
+    """
+    Whether a content slug is included in a string. Handles if `string` is
+    comma-delimited list of slugs. Also handles any individual slug
+    to check having a forward-slash prefix.
+    """
 
-    return False
+    return content_slug in _get_slugs(slugs)
 
 
-@register.simple_tag(takes_context=True)
-def directory_contents(
-    context, directory: str | None = None, exclude: str | None = None, order_by=None
-) -> list[dict[str, str]]:
+def _get_directory(request: HttpRequest, directory: str) -> tuple[str, Path]:
     """
-    Returns a list of content metadata for a particular directory. Useful for
-    listing links to content.
+    Gets the slug of a directory, i.e. "articles", and its path in the content directory. Adds the
+    directory as a dependency.
     """
 
-    request = context["request"]
-
     site = get_config().get_site(request)
 
-    if not directory:
-        directory = request.path
-    elif isinstance(directory, SafeString):
+    if isinstance(directory, SafeString):
         # Force SafeString to be a normal string so it can be used with `Path` later
         directory = directory + ""
 
-    if directory and directory.startswith("/"):
-        directory = directory[1:]
+    directory = str(directory).strip("/")
+    content_directory = get_content_directory(site=site) / directory
+
+    add_directory_dependency(content_directory)
 
-    content_paths = get_content_paths(request, str(directory))
-    contents = []
+    return (directory, content_directory)
 
-    for path in content_paths:
-        if path.name != "index.md":
-            path_slug = path.name[:-3]
-            content_slug = path_slug
-            content_directory = get_content_directory()
 
-            if directory:
-                content_slug = f"{directory}/{path_slug}"
-                content_directory = content_directory / directory
+@register.simple_tag(takes_context=True)
+def directory_contents(
+    context,
+    directory: str | None = None,
+    exclude: str | None = None,
+    order_by=None,
+    *,
+    limit: int | None = None,
+    offset: int = 0,
+) -> list[dict[str, str]]:
+    """
+    Returns a list of content metadata for a particular directory. Useful for
+    listing links to content.
+
+    The metadata and orderings come from an index of the directory, so only the items that are
+    returned get copied, e.g. `limit=10` for the latest posts.
+    """
+
+    request = context["request"]
 
-            if _is_content_slug_in_string(content_slug=content_slug, slugs=exclude):
-                continue
+    (directory, content_directory) = _get_directory(request, directory or request.path)
 
-            (_, metadata) = MarkdownRenderer.instance().get_html_and_markdown(content_slug, site)
+    return directory_index.get(content_directory, directory).get_items(
+        order_by=order_by or None,
+        exclude=_get_slugs(exclude),
+        limit=None if limit is None else int(limit),
+        offset=int(offset or 0),
+    )
 
-            contents.append(metadata)
 
-    if order_by and contents:
-        is_reverse = False
+@register.simple_tag(takes_context=True)
+def paginate_directory(
+    context,
+    directory: str | None = None,
+    exclude: str | None = None,
+    order_by=None,
+    *,
+    per_page: int = DEFAULT_PER_PAGE,
+    page: int | None = None,
+) -> DirectoryPage:
+    """
+    Returns one page of content metadata for a particular directory. The page number comes from the
+    request path, i.e. `/articles/page/2/`, unless `page` is passed in. Raises a 404 for pages that
+    don't exist.
+    """
 
-        if order_by[0] == "-":
-            is_reverse = order_by[0] == "-"
-            order_by = order_by[1:]
+    request = context["request"]
+    (path, page_number) = parse_page_path(request.path)
+    (directory, content_directory) = _get_directory(request, directory or path)
 
-        def _directory_content_sorter(_metadata: dict) -> str:
-            value = _metadata.get(order_by, "") or ""
+    items = DirectoryItems(
+        directory_index.get(content_directory, directory),
+        order_by=order_by or None,
+        exclude=_get_slugs(exclude),
+    )
+    paginator = DirectoryPaginator(items, per_page=int(per_page), path=path)
 
-            return str(value)
+    try:
+        directory_page = paginator.page(page or page_number or 1)
+    except (EmptyPage, PageNotAnInteger) as e:
+        raise Http404(f"Page {page or page_number} cannot be found") from e
 
-        contents.sort(key=_directory_content_sorter, reverse=is_reverse)
+    # Keep track of the number of pages, so that `build` can output every page
+    set_page_count(request, paginator.num_pages)
 
-    return contents
+    return directory_page
 
 
 @register.filter()
@@ -159,6 +199,8 @@ class IncludeMarkdownNode(Node):
             template = context.template.engine.select_template((template_name,))
             cache[template_name] = template
 
+        add_template_dependency(template.origin.name)
+
         (html, metadata) = MarkdownRenderer.instance().render_markdown_path(template.origin.name)
 
         for c in context:
@@ -250,6 +292,8 @@ class IncludeNode(Node):
                     template = select_template([original_template_name])
                     cache[template_name] = template
 
+                    add_template_dependency(template.origin.name)
+
                     values = {name: var.resolve(context) for name, var in self.extra_context.items()}
 
                     with context.push(**values):
@@ -259,6 +303,8 @@ class IncludeNode(Node):
         elif hasattr(template, "template"):
             template = template.template
 
+        add_template_dependency(template.origin.name)
+
         values = {name: var.resolve(context) for name, var in self.extra_context.items()}
 
         if self.isolated_context:
@@ -413,6 +459,9 @@ class ColtraneStaticNode(StaticNode):
             if site.is_custom:
                 path = f"{site.folder}/{path}"
 
+        # Keep track of the static files that the page uses for incremental builds
+        add_static_dependency(path)
+
         return self.handle_simple(path)
 
 
@@ -468,6 +517,7 @@ class ExtendsNode(Node):
             skip=history,
         )
         history.append(origin)
+        add_template_dependency(origin.name)
 
         return template
 
@@ -1,13 +1,18 @@
 import logging
 from concurrent.futures import ThreadPoolExecutor
 from datetime import date, datetime
-from functools import wraps
+from functools import lru_cache, wraps
 
 import dateparser
 from django.utils.timezone import get_current_timezone, is_naive, make_aware
 
+from coltrane.config.settings import get_publish_date_formats
+
 logger = logging.getLogger(__name__)
 
+# Maximum number of parsed datetime strings to keep in memory
+PARSED_DATETIME_CACHE_SIZE = 4096
+
 
 def dict_merge(
     source: dict,
@@ -46,6 +51,41 @@ def dict_merge(
     return source
 
 
+@lru_cache(maxsize=PARSED_DATETIME_CACHE_SIZE)
+def _parse_strict_datetime(value: str, formats: tuple[str, ...]) -> datetime | None:
+    """
+    Parses an ISO 8601 string or a string in one of the strict `formats` with the standard library.
+    The result only depends on the string, and datetimes are immutable, so the most recently parsed
+    strings are cached.
+    """
+
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        pass
+
+    for format_ in formats:
+        try:
+            return datetime.strptime(value, format_)  # noqa: DTZ007
+        except ValueError:
+            pass
+
+    return None
+
+
+def _parse_datetime(value: str, formats: tuple[str, ...]) -> datetime | None:
+    """
+    Parses a string into a datetime. Only strings that aren't ISO 8601 or in one of the strict `formats`
+    are parsed with `dateparser`, which is a lot slower. Those are not cached because they can be
+    relative to the current time, e.g. "yesterday".
+    """
+
+    if (dt := _parse_strict_datetime(value, formats)) is not None:
+        return dt
+
+    return dateparser.parse(value)
+
+
 def convert_to_datetime(obj: str | int | datetime | date) -> datetime:
     """Convert different objects that could be a datetime into a datetime."""
 
@@ -56,7 +96,7 @@ def convert_to_datetime(obj: str | int | datetime | date) -> datetime:
     elif isinstance(obj, date):
         dt = datetime.combine(obj, datetime.min.time())
     elif isinstance(obj, str):
-        dt = dateparser.parse(obj)  # type: ignore
+        dt = _parse_datetime(obj.strip(), tuple(get_publish_date_formats()))  # type: ignore
     elif isinstance(obj, int):
         dt = datetime.fromtimestamp(obj)  # noqa: DTZ006
     else:
@@ -1,27 +1,63 @@
 import logging
-
+from collections import OrderedDict
+from dataclasses import dataclass
+from hashlib import md5 as md5_hash
+from pathlib import Path
+from threading import Lock
+from time import monotonic, time
+
+from django.conf import settings
 from django.contrib.sitemaps.views import _get_latest_lastmod, x_robots_tag
 from django.contrib.sites.shortcuts import get_current_site
 from django.core.paginator import EmptyPage, PageNotAnInteger
 from django.http import FileResponse, Http404, HttpRequest, HttpResponse, JsonResponse
 from django.shortcuts import render
-from django.template import TemplateDoesNotExist
-from django.template.loader import select_template
+from django.template import TemplateDoesNotExist, engines
+from django.template.loader import get_template, select_template
 from django.template.response import TemplateResponse
-from django.utils.cache import patch_response_headers
+from django.template.utils import get_app_template_dirs
+from django.utils.cache import (
+    get_conditional_response,
+    has_vary_header,
+    patch_response_headers,
+    patch_vary_headers,
+)
 from django.utils.http import http_date
 from django.utils.timezone import now
 
-from coltrane.config.cache import ViewCache
-from coltrane.config.paths import get_file_path
-from coltrane.config.settings import get_config, get_disable_wildcard_templates
+from coltrane.compression import get_precompressed_path
+from coltrane.config.cache import ResponseCache, ViewCache
+from coltrane.config.paths import get_content_directory, get_file_path, get_output_directory
+from coltrane.config.settings import get_config, get_disable_wildcard_templates, get_serve_output
+from coltrane.content_index import content_index
+from coltrane.dependencies import (
+    add_content_dependency,
+    add_template_dependency,
+    get_fingerprint,
+    get_last_modified,
+    is_recording_dependencies,
+    record_dependencies,
+)
+from coltrane.pagination import get_page_count, parse_page_path
 from coltrane.renderer import MarkdownRenderer
-from coltrane.retriever import get_data
+from coltrane.retriever import get_lazy_data
 from coltrane.sitemaps import ContentSitemap
-from coltrane.wildcard_templates import get_potential_wildcard_templates
+from coltrane.wildcard_templates import wildcard_template_resolver
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of slugs that were not found to remember
+NOT_FOUND_CACHE_SIZE = 10_000
+
+# How long to remember a slug that was not found
+NOT_FOUND_CACHE_SECONDS = 60
+
+# Maximum number of cached responses to remember when their files were last checked
+RESPONSE_CHECK_CACHE_SIZE = 10_000
+
+# How often the files that were used to render a cached response are checked for changes
+RESPONSE_CHECK_SECONDS = 1
+
 
 def _normalize_slug(slug: str) -> str:
     if slug is None:
@@ -74,6 +110,259 @@ def _set_in_cache_if_enabled(slug: str, template: str, context: dict) -> None:
         )
 
 
+@dataclass
+class CachedResponse:
+    content: bytes
+    headers: dict[str, str]
+    etag: str
+    last_modified: int
+    fingerprints: dict[str, str]
+
+    def is_current(self) -> bool:
+        """
+        Whether none of the files that were used to render the response have changed.
+        """
+
+        return all(
+            get_fingerprint(dependency) == fingerprint for (dependency, fingerprint) in self.fingerprints.items()
+        )
+
+
+def _get_etag(fingerprints: dict[str, str]) -> str:
+    """
+    Gets an `ETag` based on the last modified times and sizes of the markdown file, templates, and data.
+    """
+
+    lines = "\n".join(f"{dependency}={fingerprint}" for (dependency, fingerprint) in sorted(fingerprints.items()))
+
+    return f'"{md5_hash(lines.encode()).hexdigest()}"'  # noqa: S324
+
+
+class CheckedResponses:
+    """
+    Remembers when the files that were used to render the most recent cached responses were checked, so
+    that they get checked at most once every `seconds` instead of on every request. Cached responses are
+    copies from the cache, so this is kept separately in the memory of each process.
+    """
+
+    def __init__(self, maxsize: int, seconds: int):
+        self._maxsize = maxsize
+        self._seconds = seconds
+        self._expirations: OrderedDict[tuple[str, str], float] = OrderedDict()
+        self._lock = Lock()
+
+    def is_current(self, cache_key: str, cached_response: CachedResponse) -> bool:
+        """
+        Whether none of the files that were used to render the cached response have changed. Only checks
+        the files if they weren't checked in the last `seconds`.
+        """
+
+        key = (cache_key, cached_response.etag)
+
+        with self._lock:
+            expiration = self._expirations.get(key)
+
+        if expiration is not None and monotonic() < expiration:
+            return True
+
+        if not cached_response.is_current():
+            return False
+
+        with self._lock:
+            self._expirations[key] = monotonic() + self._seconds
+            self._expirations.move_to_end(key)
+
+            while len(self._expirations) > self._maxsize:
+                self._expirations.popitem(last=False)
+
+        return True
+
+    def clear(self) -> None:
+        with self._lock:
+            self._expirations.clear()
+
+
+# Global record of when cached responses were checked that is cached in the module
+checked_responses = CheckedResponses(maxsize=RESPONSE_CHECK_CACHE_SIZE, seconds=RESPONSE_CHECK_SECONDS)
+
+
+def _set_conditional_headers(response: HttpResponse, etag: str, last_modified: int) -> None:
+    response.headers["ETag"] = etag
+    response.headers["Last-Modified"] = http_date(last_modified)
+
+
+def _get_response_from_cache(request: HttpRequest, response_cache: ResponseCache) -> HttpResponse | None:
+    """
+    Gets the response from the cache if none of the files used to render it have changed. Returns a
+    304 response if the request's `If-None-Match` or `If-Modified-Since` header matches.
+    """
+
+    cache_key = response_cache.get_cache_key(request)
+    cached_response = response_cache.cache.get(cache_key)
+
+    if not cached_response or not checked_responses.is_current(cache_key, cached_response):
+        return None
+
+    response = HttpResponse(cached_response.content)
+
+    for header, value in cached_response.headers.items():
+        response.headers[header] = value
+
+    return get_conditional_response(
+        request,
+        etag=cached_response.etag,
+        last_modified=cached_response.last_modified,
+        response=response,
+    )
+
+
+def _is_response_cacheable(request: HttpRequest, response: HttpResponse) -> bool:
+    """
+    Whether the response is the same for every visitor. Responses that use a CSRF token (i.e. with
+    `{% csrf_token %}`), set cookies, or vary on cookies would serve the first visitor's token or
+    cookies to everyone else.
+    """
+
+    if request.META.get("CSRF_COOKIE_NEEDS_UPDATE") or request.META.get("CSRF_COOKIE_USED"):
+        return False
+
+    if response.cookies:
+        return False
+
+    return not has_vary_header(response, "Cookie")
+
+
+def _set_response_in_cache(
+    request: HttpRequest, response: HttpResponse, dependencies: set[str], response_cache: ResponseCache
+) -> None:
+    """
+    Sets the rendered response in the cache with the fingerprints of its dependencies.
+    """
+
+    if response.status_code != 200 or response.streaming:  # noqa: PLR2004
+        return
+
+    if not _is_response_cacheable(request, response):
+        return
+
+    fingerprints = {dependency: get_fingerprint(dependency) for dependency in dependencies}
+    etag = _get_etag(fingerprints)
+    last_modified = int(get_last_modified(dependencies) or time())
+
+    _set_conditional_headers(response, etag, last_modified)
+
+    response_cache.cache.set(
+        response_cache.get_cache_key(request),
+        CachedResponse(
+            content=response.content,
+            headers=dict(response.headers),
+            etag=etag,
+            last_modified=last_modified,
+            fingerprints=fingerprints,
+        ),
+        response_cache.seconds,
+    )
+
+
+def _get_output_response(request: HttpRequest, slug: str) -> HttpResponse | None:
+    """
+    Gets a response with the HTML file that was generated by `build` for the slug. Uses the pre-compressed
+    file that matches the request's `Accept-Encoding` header if there is one.
+    """
+
+    output_directory = get_output_directory()
+    output_path = output_directory
+
+    for path in slug.split("/"):
+        # Only serve files inside the output directory
+        if path in ("", ".", ".."):
+            return None
+
+        if path != "index":
+            output_path /= path
+
+    output_path /= "index.html"
+
+    if not output_path.is_file() or not output_path.resolve().is_relative_to(output_directory.resolve()):
+        return None
+
+    (path, encoding) = get_precompressed_path(output_path, request.headers.get("Accept-Encoding", ""))
+
+    response = HttpResponse(path.read_bytes(), content_type="text/html; charset=utf-8")
+
+    if encoding:
+        response.headers["Content-Encoding"] = encoding
+
+    patch_vary_headers(response, ("Accept-Encoding",))
+
+    return response
+
+
+class NotFoundCache:
+    """
+    Remembers the most recent slugs that were neither markdown nor a template, so requests for them
+    (e.g. from bots scanning for vulnerabilities) don't look for templates every time. Slugs are
+    forgotten after `seconds`, so templates that get added are noticed.
+    """
+
+    def __init__(self, maxsize: int, seconds: int):
+        self._maxsize = maxsize
+        self._seconds = seconds
+        self._expirations: OrderedDict[tuple[Path, str], float] = OrderedDict()
+        self._lock = Lock()
+
+    def has(self, content_directory: Path, slug: str) -> bool:
+        key = (content_directory, slug)
+
+        with self._lock:
+            expiration = self._expirations.get(key)
+
+            if expiration is None:
+                return False
+
+            if expiration < monotonic():
+                del self._expirations[key]
+
+                return False
+
+            return True
+
+    def add(self, content_directory: Path, slug: str) -> None:
+        key = (content_directory, slug)
+
+        with self._lock:
+            self._expirations[key] = monotonic() + self._seconds
+            self._expirations.move_to_end(key)
+
+            while len(self._expirations) > self._maxsize:
+                self._expirations.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._expirations.clear()
+
+
+# Global cache of slugs that were not found that is cached in the module
+not_found_cache = NotFoundCache(maxsize=NOT_FOUND_CACHE_SIZE, seconds=NOT_FOUND_CACHE_SECONDS)
+
+
+def _get_potential_content_slugs(slug: str) -> list[str]:
+    """
+    Gets the slugs of the markdown files that could be rendered for a slug, including the ones that
+    don't exist, i.e. `blog/page/2` could be `blog/page/2.md`, `blog/page/2/index.md`, `blog.md`, or
+    `blog/index.md`.
+    """
+
+    potential_slugs = [slug, f"{slug}/index"]
+    (page_path, page_number) = parse_page_path(slug)
+
+    if page_number is not None:
+        page_slug = _normalize_slug(page_path)
+        potential_slugs.extend([page_slug, f"{page_slug}/index"])
+
+    return potential_slugs
+
+
 def _render_markdown_for_potential_slugs(potential_slugs: list[str], request: HttpRequest):
     for slug in potential_slugs:
         try:
@@ -90,9 +379,41 @@ def content(request: HttpRequest, slug: str = "index") -> HttpResponse:
     """Renders the markdown file stored in `content` or HTML template based on the slug from the URL.
     Adds data into the context from JSON files in the `data` directory.
 
-    Will cache the rendered content if enabled.
+    Will cache the rendered content and the whole response if enabled. Serves the HTML generated
+    by `build` instead of rendering if `SERVE_OUTPUT` is enabled.
+    """
+
+    if get_serve_output() and not get_config().has_custom_sites:
+        if response := _get_output_response(request, _normalize_slug(slug)):
+            return response
+
+    response_cache = ResponseCache()
+
+    if not response_cache.is_enabled or request.method not in ("GET", "HEAD"):
+        return _render_content(request, slug)
+
+    if response := _get_response_from_cache(request, response_cache):
+        return response
+
+    with record_dependencies() as dependencies:
+        response = _render_content(request, slug)
+
+    _set_response_in_cache(request, response, dependencies, response_cache)
+
+    return response
+
+
+def _get_template_directories() -> list[Path]:
+    """
+    Gets the directories that Django looks for templates in.
     """
 
+    engine = engines["django"].engine  # type: ignore
+
+    return [*engine.dirs, *get_app_template_dirs("templates")]
+
+
+def _render_content(request: HttpRequest, slug: str) -> HttpResponse:
     logger.debug(f"request: {request}")
 
     config = get_config()
@@ -106,21 +427,51 @@ def content(request: HttpRequest, slug: str = "index") -> HttpResponse:
     slug = _normalize_slug(slug)
     slug_with_index = f"{slug}/index"
 
+    if is_recording_dependencies():
+        # The markdown files that the slug could be rendered from are added before the view cache is
+        # checked, so that a response rendered from the view cache still depends on them
+        content_directory = get_content_directory(site)
+
+        for potential_slug in _get_potential_content_slugs(slug):
+            add_content_dependency(content_directory / f"{potential_slug}.md")
+
     (template, context) = _get_from_cache_if_enabled(slug)
     set_in_cache = False
+    is_page = False
 
     try:
         if not template or not context:
             set_in_cache = True
             potential_slugs = []
+            content_directory = get_content_directory(site)
+
+            for potential_slug in (slug, slug_with_index):
+                if content_index.has_slug(content_directory, potential_slug):
+                    potential_slugs.append(potential_slug)
+
+            (page_path, page_number) = parse_page_path(slug)
+
+            # A page of paginated content, i.e. `blog/page/2` renders `blog/index.md`
+            if not potential_slugs and page_number is not None:
+                page_slug = _normalize_slug(page_path)
+
+                for potential_slug in (page_slug, f"{page_slug}/index"):
+                    if content_index.has_slug(content_directory, potential_slug):
+                        potential_slugs.append(potential_slug)
+                        is_page = True
 
-            potential_slugs.extend([slug, slug_with_index])
             logger.debug(f"potential_slugs: {potential_slugs}")
 
             (template, context) = _render_markdown_for_potential_slugs(potential_slugs=potential_slugs, request=request)
 
             template = site.get_template_name(template_name=template, verify=True)
     except FileNotFoundError:
+        content_directory = get_content_directory(site)
+        is_not_found_cache_enabled = not settings.DEBUG
+
+        if is_not_found_cache_enabled and not_found_cache.has(content_directory, slug):
+            raise Http404(f"{slug} cannot be found") from None
+
         potential_templates = []
 
         if site and site.is_custom:
@@ -134,47 +485,62 @@ def content(request: HttpRequest, slug: str = "index") -> HttpResponse:
         # Typical templates based on the slug
         potential_templates.extend([f"{slug}.html", f"{slug_with_index}.html"])
 
-        if get_disable_wildcard_templates() is False:
-            potential_wildcard_templates = get_potential_wildcard_templates(slug)
-
-            if site and site.is_custom:
-                potential_wildcard_templates = [f"{site.folder}/templates/{t}" for t in potential_wildcard_templates]
-                potential_templates.extend(potential_wildcard_templates)
-            else:
-                potential_templates.extend(potential_wildcard_templates)
-
         try:
             logger.debug(f"potential_templates: {potential_templates}")
             selected_template = select_template(potential_templates)
 
             logger.debug(f"selected_template: {selected_template}")
             template = selected_template.template.name
-            logger.debug(f"template: {template}")
         except TemplateDoesNotExist:
-            raise Http404(f"{slug} cannot be found") from None
+            template = ""
+
+            if get_disable_wildcard_templates() is False:
+                template = (
+                    wildcard_template_resolver.resolve(
+                        slug,
+                        template_directories=_get_template_directories(),
+                        prefix=f"{site.folder}/templates" if site and site.is_custom else "",
+                    )
+                    or ""
+                )
+
+            if not template:
+                if is_not_found_cache_enabled:
+                    not_found_cache.add(content_directory, slug)
+
+                raise Http404(f"{slug} cannot be found") from None
+
+        logger.debug(f"template: {template}")
 
         context.update(
             {
-                "data": get_data(site=site),
+                "data": get_lazy_data(site=site),
                 "slug": slug,
                 "template": template,
                 "now": now(),
             }
         )
 
-    if set_in_cache:
-        _set_in_cache_if_enabled(slug, template, context)
-
     context["site"] = str(site) if site else None
 
     logger.debug(f"template: {template}")
 
+    if is_recording_dependencies():
+        add_template_dependency(get_template(template).origin.name)
+
     response = render(
         request,
         template,
         context=context,
     )
 
+    # Pages only exist for content that paginates a directory
+    if is_page and get_page_count(request) is None:
+        raise Http404(f"{slug} cannot be found")
+
+    if set_in_cache:
+        _set_in_cache_if_enabled(slug, template, context)
+
     view_cache = ViewCache()
 
     if view_cache.is_enabled:
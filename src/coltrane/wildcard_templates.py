@@ -1,4 +1,7 @@
-from dataclasses import dataclass
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+from threading import Lock
 
 
 @dataclass
@@ -95,3 +98,146 @@ def get_potential_wildcard_templates(slug: str) -> list[str]:
     potential_templates = _sort_potential_templates(potential_templates)
 
     return potential_templates
+
+
+@dataclass
+class WildcardTemplateNode:
+    """A segment in the trie of wildcard templates; segments are either literal or `*`."""
+
+    children: dict[str, "WildcardTemplateNode"] = field(default_factory=dict)
+
+    # The name of the template if a template ends at this segment
+    template_name: str | None = None
+
+
+@dataclass
+class WildcardTemplateIndex:
+    root: WildcardTemplateNode
+
+    # The last modified time of every directory that was indexed, or `None` if it did not exist
+    directory_mtimes: dict[Path, int | None]
+
+
+def _get_directory_mtime(directory: Path) -> int | None:
+    try:
+        return directory.stat().st_mtime_ns
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+
+
+def _build_wildcard_template_index(template_directories: tuple[Path, ...], prefix: str) -> WildcardTemplateIndex:
+    root = WildcardTemplateNode()
+    directory_mtimes: dict[Path, int | None] = {}
+
+    for template_directory in template_directories:
+        directory = template_directory / prefix if prefix else template_directory
+        directory_mtimes[directory] = _get_directory_mtime(directory)
+
+        if directory_mtimes[directory] is None:
+            continue
+
+        for path in directory.rglob("*"):
+            if path.is_dir():
+                # Adding or removing a template changes the last modified time of its directory
+                directory_mtimes[path] = _get_directory_mtime(path)
+                continue
+
+            if path.suffix != ".html":
+                continue
+
+            segments = path.relative_to(directory).with_suffix("").parts
+
+            if "*" not in segments:
+                continue
+
+            node = root
+
+            for segment in segments:
+                node = node.children.setdefault(segment, WildcardTemplateNode())
+
+            # Django uses the template from the first directory that has it
+            if node.template_name is None:
+                template_name = "/".join(segments) + ".html"
+                node.template_name = f"{prefix}/{template_name}" if prefix else template_name
+
+    return WildcardTemplateIndex(root=root, directory_mtimes=directory_mtimes)
+
+
+def _get_matching_templates(node: WildcardTemplateNode, slug_pieces: list[str], idx: int = 0) -> Iterator[str]:
+    if idx == len(slug_pieces):
+        if node.template_name:
+            yield node.template_name
+
+        return
+
+    if child := node.children.get(slug_pieces[idx]):
+        yield from _get_matching_templates(child, slug_pieces, idx + 1)
+
+    if slug_pieces[idx] != "*" and (child := node.children.get("*")):
+        yield from _get_matching_templates(child, slug_pieces, idx + 1)
+
+
+class WildcardTemplateResolver:
+    """
+    Resolves a slug to a wildcard template, e.g. `blog/*.html` for `blog/some-post`. The wildcard templates
+    in the template directories are indexed into a trie of literal and `*` segments the first time, so
+    resolving a slug only walks the segments of the slug instead of looking for every potential template
+    in every template directory. The index is re-built when a template directory changes.
+
+    When multiple wildcard templates match, the one with the wildcards furthest from the start of the
+    path is used, i.e. the same order as `get_potential_wildcard_templates`.
+    """
+
+    def __init__(self):
+        self._indexes: dict[tuple[tuple[Path, ...], str], WildcardTemplateIndex] = {}
+        self._lock = Lock()
+
+    def _get_index(self, template_directories: tuple[Path, ...], prefix: str) -> WildcardTemplateIndex:
+        key = (template_directories, prefix)
+        index = self._indexes.get(key)
+
+        if index is not None and all(
+            _get_directory_mtime(directory) == mtime for (directory, mtime) in index.directory_mtimes.items()
+        ):
+            return index
+
+        with self._lock:
+            index = _build_wildcard_template_index(template_directories, prefix)
+            self._indexes[key] = index
+
+        return index
+
+    def resolve(self, slug: str, template_directories: list[Path], prefix: str = "") -> str | None:
+        """
+        Gets the name of the wildcard template for the slug, or `None` if there isn't one.
+
+        Args:
+            slug: The slug to find a template for.
+            template_directories: The directories that Django looks for templates in.
+            prefix: The directory inside the template directories to look in, e.g. `site/templates` for
+                custom sites.
+        """
+
+        index = self._get_index(tuple(Path(directory) for directory in template_directories), prefix)
+        template_names = list(_get_matching_templates(index.root, slug.split("/")))
+
+        if not template_names:
+            return None
+
+        def _get_rank(template_name: str) -> tuple[int, int]:
+            template_name = template_name.removeprefix(f"{prefix}/") if prefix else template_name
+
+            # Templates with the same score are ranked by how many wildcards they have
+            wildcards_count = template_name.removesuffix(".html").split("/").count("*")
+
+            return (PathRanking(template_name).score, wildcards_count)
+
+        return min(template_names, key=_get_rank)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._indexes.clear()
+
+
+# Global wildcard template resolver that is cached in the module
+wildcard_template_resolver = WildcardTemplateResolver()
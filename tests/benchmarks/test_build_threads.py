@@ -0,0 +1,71 @@
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+
+from coltrane.management.commands.build import Command
+
+FILE_COUNT = 200
+THREAD_COUNTS = (1, 2, 4, 8)
+
+MARKDOWN = """---
+title: Benchmark {i}
+numbers:
+  - 1
+  - 2
+  - 3
+---
+
+# {{{{ title }}}}
+
+This is a _test_ with **markdown**.
+
+## Sub-heading
+
+{{% for number in numbers %}}
+- {{{{ number }}}}
+{{% endfor %}}
+
+```python
+def test():
+    pass
+```
+"""
+
+
+@pytest.mark.slow
+@patch("coltrane.management.commands.build.Command._call_collectstatic", Mock())
+@patch("coltrane.management.commands.build.Command._call_compress", Mock())
+@patch("coltrane.management.commands.build.Command._generate_rss", Mock())
+@patch("coltrane.management.commands.build.Command._generate_sitemap", Mock())
+def test_build_throughput_by_thread_count(settings, tmp_path, report):
+    settings.BASE_DIR = tmp_path
+    settings.STATIC_ROOT = tmp_path / "output" / "static"
+
+    (tmp_path / "content").mkdir()
+
+    for i in range(FILE_COUNT):
+        (tmp_path / "content" / f"{i}.md").write_text(MARKDOWN.format(i=i))
+
+    results = {}
+
+    for threads_count in THREAD_COUNTS:
+        build_command = Command()
+
+        start = time.perf_counter()
+        build_command.handle(force=True, threads=threads_count)
+        elapsed = time.perf_counter() - start
+
+        assert build_command.output_result_counts.create_count + build_command.output_result_counts.update_count == (
+            FILE_COUNT
+        )
+        assert not build_command.errors
+
+        results[threads_count] = FILE_COUNT / elapsed
+
+    report(
+        *(
+            f"{threads_count} thread(s): {files_per_second:.1f} files/s"
+            for threads_count, files_per_second in results.items()
+        )
+    )
@@ -0,0 +1,48 @@
+import time
+from pathlib import Path
+
+import pytest
+
+from coltrane.content_index import ContentTreeCache, walk_content_directory
+
+DIRECTORY_COUNT = 1_000
+FILES_PER_DIRECTORY = 100
+
+
+def _create_content_directory(content_directory: Path) -> None:
+    for directory_idx in range(DIRECTORY_COUNT):
+        directory = content_directory / f"section-{directory_idx // 100}" / f"directory-{directory_idx}"
+        directory.mkdir(parents=True)
+
+        for file_idx in range(FILES_PER_DIRECTORY):
+            (directory / f"post-{file_idx}.md").touch()
+
+
+@pytest.mark.slow
+def test_content_walker_throughput(tmp_path: Path, report):
+    content_directory = tmp_path / "content"
+    _create_content_directory(content_directory)
+    results = {}
+
+    start = time.perf_counter()
+    rglob_paths = [path for path in content_directory.rglob("*.md") if path.is_file()]
+    results["rglob + is_file"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    tree = walk_content_directory(content_directory, ignore_patterns=[".git", "node_modules"])
+    results["walk_content_directory"] = time.perf_counter() - start
+
+    assert list(tree.paths) == rglob_paths
+
+    content_tree_cache = ContentTreeCache()
+    content_tree_cache.get(content_directory)
+
+    # Only the directories get stat'd because none of them changed
+    start = time.perf_counter()
+    content_tree_cache.get(content_directory)
+    results["content_tree_cache (cached)"] = time.perf_counter() - start
+
+    report(
+        f"{len(rglob_paths)} markdown files in {DIRECTORY_COUNT} directories",
+        *(f"{name}: {elapsed:.3f}s" for name, elapsed in results.items()),
+    )
@@ -0,0 +1,84 @@
+import json
+import time
+from pathlib import Path
+
+import pytest
+
+from coltrane.data import LazyData, data_store
+from coltrane.utils import dict_merge
+
+FILE_COUNT = 500
+TOTAL_SIZE = 200 * 1024 * 1024
+DIRECTORY_COUNT = 10
+
+
+def _create_data_directory(data_directory: Path) -> None:
+    record = {"id": 0, "title": "Benchmark record", "tags": ["one", "two", "three"], "score": 1.5, "draft": False}
+    records_per_file = (TOTAL_SIZE // FILE_COUNT) // len(json.dumps(record))
+
+    for i in range(FILE_COUNT):
+        directory = data_directory / f"directory-{i % DIRECTORY_COUNT}" / f"sub-directory-{i % 3}"
+        directory.mkdir(parents=True, exist_ok=True)
+
+        records = [dict(record, id=idx) for idx in range(records_per_file)]
+        (directory / f"file-{i}.json").write_text(json.dumps({"records": records}))
+
+
+def _load_with_json_and_dict_merge(data_directory: Path) -> dict:
+    """
+    How data was loaded before: `json.loads` for every file and a deep merge of a nested dictionary
+    for every file into the whole tree.
+    """
+
+    data: dict = {}
+
+    for path in data_directory.rglob("*.json"):
+        directory_without_base_and_file_name = (str(path)).replace(str(data_directory), "").replace(path.name, "")
+        new_data = {path.name.replace(".json", ""): json.loads(path.read_bytes())}
+
+        for key in reversed(directory_without_base_and_file_name.split("/")):
+            if key:
+                new_data = {key: new_data}
+
+        data = dict_merge(data, new_data)
+
+    return data
+
+
+@pytest.mark.slow
+def test_data_loader_throughput(tmp_path, report):
+    data_directory = tmp_path / "data"
+    _create_data_directory(data_directory)
+
+    size = sum(path.stat().st_size for path in data_directory.rglob("*.json"))
+    results = {}
+
+    start = time.perf_counter()
+    expected = _load_with_json_and_dict_merge(data_directory)
+    results["json + dict_merge"] = time.perf_counter() - start
+
+    data_store.clear()
+
+    # What a page that uses one data file parses
+    start = time.perf_counter()
+    LazyData(data_directory, is_root=True)["directory-0"]["sub-directory-0"]["file-0"]
+    results["lazy data (one file)"] = time.perf_counter() - start
+
+    data_store.clear()
+
+    start = time.perf_counter()
+    actual = LazyData(data_directory, is_root=True).to_dict()
+    results["msgspec data store (every file)"] = time.perf_counter() - start
+
+    assert actual == expected
+
+    start = time.perf_counter()
+    LazyData(data_directory, is_root=True).to_dict()
+    results["msgspec data store (every file, unchanged)"] = time.perf_counter() - start
+
+    data_store.clear()
+
+    report(
+        f"{FILE_COUNT} files, {size / 1024 / 1024:.0f} MB",
+        *(f"{name}: {elapsed:.3f}s" for name, elapsed in results.items()),
+    )
@@ -0,0 +1,78 @@
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from coltrane.metadata import get_metadata
+from coltrane.renderer import StaticRequest
+from coltrane.templatetags.coltrane_tags import directory_contents
+
+POST_COUNT = 5_000
+REPEAT_COUNT = 10
+
+
+def _create_posts(content_directory: Path) -> None:
+    posts_directory = content_directory / "posts"
+    posts_directory.mkdir(parents=True)
+
+    for idx in range(POST_COUNT):
+        (posts_directory / f"post-{idx}.md").write_text(
+            f"---\ntitle: Post {idx}\npublish_date: 2020-01-01 00:00:{idx % 60:02}\n---\n\npost {idx}\n"
+        )
+
+
+def _list_every_post(posts_directory: Path) -> list[dict]:
+    # What listing a directory used to do for every request
+    contents = []
+
+    for path in posts_directory.rglob("*.md"):
+        if path.is_file():
+            metadata = get_metadata(path)
+            metadata["slug"] = f"posts/{path.name[:-3]}"
+            contents.append(metadata)
+
+    contents.sort(key=lambda metadata: str(metadata.get("publish_date", "") or ""), reverse=True)
+
+    return contents[:10]
+
+
+@pytest.mark.slow
+def test_directory_contents_latest_posts(settings, tmp_path: Path, report):
+    settings.BASE_DIR = tmp_path
+    _create_posts(tmp_path / "content")
+    context = {"request": StaticRequest("/")}
+    results = {}
+
+    # Parse the frontmatter of every file once, so both only measure listing
+    directory_contents(context, directory="posts")
+
+    start = time.perf_counter()
+
+    for _ in range(REPEAT_COUNT):
+        _list_every_post(tmp_path / "content" / "posts")
+
+    results["metadata for every file + sort"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+
+    for _ in range(REPEAT_COUNT):
+        latest_posts = directory_contents(context, directory="posts", order_by="-publish_date", limit=10)
+
+    results["directory_contents limit=10"] = time.perf_counter() - start
+
+    # Check the files for changes every time, which is a `stat` per file
+    start = time.perf_counter()
+
+    with patch("coltrane.directory_index.FILE_CHECK_SECONDS", 0):
+        for _ in range(REPEAT_COUNT):
+            directory_contents(context, directory="posts", order_by="-publish_date", limit=10)
+
+    results["directory_contents limit=10, files checked every time"] = time.perf_counter() - start
+
+    assert len(latest_posts) == 10
+
+    report(
+        f"latest 10 of {POST_COUNT} posts, {REPEAT_COUNT} times",
+        *(f"{name}: {elapsed:.3f}s" for name, elapsed in results.items()),
+    )
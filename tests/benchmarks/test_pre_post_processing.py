@@ -0,0 +1,100 @@
+import re
+import time
+from urllib.parse import unquote
+
+import pytest
+
+from coltrane.renderer import SPACE_REPLACEMENT, MistuneMarkdownRenderer
+
+TEMPLATE_TAG_COUNTS = (100, 1_000, 5_000)
+
+SECTION = """
+## Section {i}
+
+![image {i}]({{% static "images/{i}.jpg" %}}) links to [post {i}]({{% url 'post' slug='post-{i}' %}}) by [{{{{ author }}}}]({{{{ author_url }}}}).
+
+{{% if show_{i} %}}Some text for section {i}.{{% endif %}}
+
+```python
+print({i})
+```
+"""  # noqa: E501
+
+
+def _legacy_pre_process_markdown(text: str) -> str:
+    """
+    How markdown was pre-processed before: multiple regex passes and a `replace` for every template tag.
+    """
+
+    text = re.sub(
+        pattern=r"```.*?```",
+        repl="{% verbatim %}\n\\g<0>\n{% endverbatim %}",
+        string=text,
+        flags=re.RegexFlag.DOTALL,
+    )
+    text = re.sub(
+        pattern=r"\({{\s*(\S+)\s*}}\)",
+        repl=r"(DJANGO-TEMPLATE-VARIABLE-BEGIN-\g<1>-DJANGO-TEMPLATE-VARIABLE-END)",
+        string=text,
+        flags=re.RegexFlag.DOTALL,
+    )
+
+    pattern = r"\({%\s*(\S+)\s*(.*?)\s*%}\)"
+    template_tag_matches = re.findall(pattern=pattern, string=text, flags=re.RegexFlag.DOTALL)
+
+    text = re.sub(
+        pattern=pattern,
+        repl=rf"(DJANGO-TEMPLATE-TAG-BEGIN-\g<1>{SPACE_REPLACEMENT}\g<2>-DJANGO-TEMPLATE-TAG-END)",
+        string=text,
+        flags=re.RegexFlag.DOTALL,
+    )
+
+    for match in template_tag_matches:
+        template_tag_args = match[1].replace(" ", SPACE_REPLACEMENT).replace('"', "'")
+        text = text.replace(match[1], template_tag_args)
+
+    return text
+
+
+def _legacy_post_process_html(html: str) -> str:
+    """
+    How HTML was post-processed before: a `replace` for every marker and `unquote` of the whole HTML.
+    """
+
+    html = html.replace("<p>{% verbatim %}</p>\n", "{% verbatim %}")
+    html = html.replace("\n<p>{% endverbatim %}</p>", "{% endverbatim %}")
+    html = html.replace("DJANGO-TEMPLATE-VARIABLE-BEGIN-", "{{ ").replace("-DJANGO-TEMPLATE-VARIABLE-END", " }}")
+    html = html.replace("DJANGO-TEMPLATE-TAG-BEGIN-", "{% ").replace("-DJANGO-TEMPLATE-TAG-END", " %}")
+    html = html.replace(SPACE_REPLACEMENT, " ")
+
+    return unquote(html)
+
+
+@pytest.mark.slow
+def test_pre_post_processing_throughput(report):
+    markdown_renderer = MistuneMarkdownRenderer()
+    results = {}
+
+    for template_tag_count in TEMPLATE_TAG_COUNTS:
+        # Each section has 3 template tags
+        text = "".join(SECTION.format(i=i) for i in range(template_tag_count // 3))
+
+        start = time.perf_counter()
+        html = markdown_renderer.mistune_markdown(_legacy_pre_process_markdown(text))
+        _legacy_post_process_html(html)
+        legacy_elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        html = markdown_renderer.mistune_markdown(markdown_renderer.pre_process_markdown(text))
+        markdown_renderer.post_process_html(html)
+        elapsed = time.perf_counter() - start
+
+        results[template_tag_count] = (legacy_elapsed, elapsed)
+
+    report(
+        *(
+            f"{template_tag_count} template tags: {legacy_elapsed:.3f}s before, {elapsed:.3f}s now "
+            "(including rendering with mistune)"
+            for template_tag_count, (legacy_elapsed, elapsed) in results.items()
+        )
+    )
@@ -0,0 +1,57 @@
+import time
+from datetime import datetime, timedelta
+
+import dateparser
+import pytest
+
+from coltrane.utils import PARSED_DATETIME_CACHE_SIZE, _parse_strict_datetime, convert_to_datetime
+
+ITEM_COUNT = 10_000
+
+FORMATS = (
+    "%Y-%m-%d",
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%dT%H:%M:%S+00:00",
+    "%B %d, %Y",
+)
+
+
+def _get_publish_dates() -> list[str]:
+    start = datetime(2020, 1, 1)  # noqa: DTZ001
+
+    return [(start + timedelta(hours=idx * 7)).strftime(FORMATS[idx % len(FORMATS)]) for idx in range(ITEM_COUNT)]
+
+
+@pytest.mark.slow
+def test_publish_date_parsing_throughput(report):
+    publish_dates = _get_publish_dates()
+    results = {}
+
+    start = time.perf_counter()
+
+    for publish_date in publish_dates:
+        dateparser.parse(publish_date)
+
+    results["dateparser"] = time.perf_counter() - start
+
+    _parse_strict_datetime.cache_clear()
+    start = time.perf_counter()
+
+    for publish_date in publish_dates:
+        convert_to_datetime(publish_date)
+
+    results["convert_to_datetime"] = time.perf_counter() - start
+
+    # The most recently parsed strings are cached
+    cached_publish_dates = publish_dates[-PARSED_DATETIME_CACHE_SIZE:]
+    start = time.perf_counter()
+
+    for idx in range(ITEM_COUNT):
+        convert_to_datetime(cached_publish_dates[idx % len(cached_publish_dates)])
+
+    results["convert_to_datetime (cached)"] = time.perf_counter() - start
+
+    report(
+        f"{ITEM_COUNT} publish dates",
+        *(f"{name}: {elapsed:.3f}s ({ITEM_COUNT / elapsed:.0f} items/s)" for name, elapsed in results.items()),
+    )
@@ -0,0 +1,39 @@
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+from django.template.loader import render_to_string
+
+from coltrane.sitemaps import SitemapUrl, write_sitemaps
+
+URL_COUNT = 60_000
+BASE_URL = "https://example.com"
+
+
+@pytest.mark.slow
+def test_sitemap_writer_throughput(tmp_path: Path, report):
+    lastmod = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    urls = [SitemapUrl(location=f"{BASE_URL}/posts/post-{idx}", lastmod=lastmod) for idx in range(URL_COUNT)]
+    results = {}
+
+    # What `build` used to do: render the whole sitemap with Django's template into one string
+    start = time.perf_counter()
+    urlset = [
+        {"location": url.location, "lastmod": url.lastmod, "changefreq": "hourly", "priority": 0.5} for url in urls
+    ]
+    (tmp_path / "django-sitemap.xml").write_text(render_to_string("sitemap.xml", {"urlset": urlset}))
+    results["django sitemap template"] = time.perf_counter() - start
+
+    output_directory = tmp_path / "output"
+    output_directory.mkdir()
+
+    start = time.perf_counter()
+    written_count = write_sitemaps(output_directory, urls, BASE_URL)
+    results[f"write_sitemaps ({written_count} files)"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    written_count = write_sitemaps(output_directory, urls, BASE_URL)
+    results[f"write_sitemaps unchanged ({written_count} files)"] = time.perf_counter() - start
+
+    report(f"{URL_COUNT} URLs", *(f"{name}: {elapsed:.3f}s" for name, elapsed in results.items()))
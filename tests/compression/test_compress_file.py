@@ -0,0 +1,67 @@
+import gzip
+import os
+from pathlib import Path
+
+import brotli
+import zstandard
+
+from coltrane.compression import compress_file, compress_output, get_encodings
+
+
+def test_compress_file(tmp_path: Path):
+    path = tmp_path / "index.html"
+    path.write_text("<h1>test</h1>")
+
+    actual = compress_file(path, get_encodings())
+
+    assert actual == 3
+    assert gzip.decompress((tmp_path / "index.html.gz").read_bytes()) == b"<h1>test</h1>"
+    assert brotli.decompress((tmp_path / "index.html.br").read_bytes()) == b"<h1>test</h1>"
+    assert zstandard.ZstdDecompressor().decompress((tmp_path / "index.html.zst").read_bytes()) == b"<h1>test</h1>"
+
+
+def test_compress_file_skips_newer_compressed_files(tmp_path: Path):
+    path = tmp_path / "index.html"
+    path.write_text("<h1>test</h1>")
+    os.utime(path, (1, 1))
+
+    compress_file(path, get_encodings())
+    actual = compress_file(path, get_encodings())
+
+    assert actual == 0
+
+
+def test_compress_file_older_compressed_files(tmp_path: Path):
+    path = tmp_path / "index.html"
+    path.write_text("<h1>test</h1>")
+    os.utime(path, (1, 1))
+
+    compress_file(path, get_encodings())
+
+    path.write_text("<h1>test 2</h1>")
+    actual = compress_file(path, get_encodings())
+
+    assert actual == 3
+    assert gzip.decompress((tmp_path / "index.html.gz").read_bytes()) == b"<h1>test 2</h1>"
+
+
+def test_compress_output(tmp_path: Path):
+    (tmp_path / "output" / "about").mkdir(parents=True)
+    (tmp_path / "output" / "index.html").write_text("<h1>index</h1>")
+    (tmp_path / "output" / "about" / "index.html").write_text("<h1>about</h1>")
+    (tmp_path / "output" / "sitemap.xml").write_text("<urlset></urlset>")
+    (tmp_path / "output" / "robots.txt").write_text("User-agent: *")
+    (tmp_path / "output" / "static").mkdir()
+    (tmp_path / "output" / "static" / "test.html").write_text("<h1>static</h1>")
+
+    actual = compress_output(
+        tmp_path / "output",
+        static_directory=tmp_path / "output" / "static",
+        threads_count=2,
+    )
+
+    assert actual == 9
+    assert (tmp_path / "output" / "about" / "index.html.gz").exists()
+    assert (tmp_path / "output" / "sitemap.xml.gz").exists()
+    assert not (tmp_path / "output" / "robots.txt.gz").exists()
+    assert not (tmp_path / "output" / "static" / "test.html.gz").exists()
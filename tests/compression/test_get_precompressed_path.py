@@ -0,0 +1,61 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from coltrane.compression import compress_file, get_encodings, get_precompressed_path
+
+
+@pytest.fixture
+def html_path(tmp_path: Path) -> Path:
+    path = tmp_path / "index.html"
+    path.write_text("<h1>test</h1>")
+    os.utime(path, (1, 1))
+
+    compress_file(path, get_encodings())
+
+    return path
+
+
+def test_get_precompressed_path_brotli(html_path: Path):
+    expected = (html_path.with_name("index.html.br"), "br")
+    actual = get_precompressed_path(html_path, "gzip, deflate, br, zstd")
+
+    assert actual == expected
+
+
+def test_get_precompressed_path_zstd(html_path: Path):
+    expected = (html_path.with_name("index.html.zst"), "zstd")
+    actual = get_precompressed_path(html_path, "gzip, zstd")
+
+    assert actual == expected
+
+
+def test_get_precompressed_path_gzip(html_path: Path):
+    expected = (html_path.with_name("index.html.gz"), "gzip")
+    actual = get_precompressed_path(html_path, "gzip, deflate")
+
+    assert actual == expected
+
+
+def test_get_precompressed_path_quality_zero(html_path: Path):
+    expected = (html_path.with_name("index.html.gz"), "gzip")
+    actual = get_precompressed_path(html_path, "br;q=0, gzip;q=0.5")
+
+    assert actual == expected
+
+
+def test_get_precompressed_path_no_accept_encoding(html_path: Path):
+    expected = (html_path, None)
+    actual = get_precompressed_path(html_path, "")
+
+    assert actual == expected
+
+
+def test_get_precompressed_path_compressed_file_is_older(html_path: Path):
+    html_path.write_text("<h1>test 2</h1>")
+
+    expected = (html_path, None)
+    actual = get_precompressed_path(html_path, "gzip, br, zstd")
+
+    assert actual == expected
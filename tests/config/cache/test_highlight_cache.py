@@ -0,0 +1,38 @@
+from coltrane.config.cache import HighlightCache
+
+
+def test_highlight_cache_is_enabled(settings):
+    settings.COLTRANE = {"HIGHLIGHT_CACHE": {"SECONDS": 123}}
+    highlight_cache = HighlightCache()
+
+    assert highlight_cache.is_enabled
+    assert highlight_cache.seconds == 123
+    assert highlight_cache.cache_key_namespace == "coltrane:highlight_cache:"
+
+
+def test_highlight_cache_is_not_enabled(settings):
+    settings.COLTRANE = {}
+    highlight_cache = HighlightCache()
+
+    assert not highlight_cache.is_enabled
+
+
+def test_highlight_cache_get_cache_key_changes_with_language(settings):
+    settings.COLTRANE = {"HIGHLIGHT_CACHE": {"SECONDS": 123}}
+    highlight_cache = HighlightCache()
+
+    expected = highlight_cache.get_cache_key("print(1)", "python")
+    actual = highlight_cache.get_cache_key("print(1)", "python3")
+
+    assert actual != expected
+    assert actual.startswith("coltrane:highlight_cache:")
+
+
+def test_highlight_cache_get_cache_key_is_the_same_for_the_same_code(settings):
+    settings.COLTRANE = {"HIGHLIGHT_CACHE": {"SECONDS": 123}}
+    highlight_cache = HighlightCache()
+
+    expected = highlight_cache.get_cache_key("print(1)", "python")
+    actual = HighlightCache().get_cache_key("print(1)", "python")
+
+    assert actual == expected
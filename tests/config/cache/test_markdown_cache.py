@@ -0,0 +1,51 @@
+import os
+from pathlib import Path
+
+from coltrane.config.cache import MarkdownCache
+
+
+def test_markdown_cache_is_enabled(settings):
+    settings.COLTRANE = {"MARKDOWN_CACHE": {"SECONDS": 123}}
+    markdown_cache = MarkdownCache()
+
+    assert markdown_cache.is_enabled
+    assert markdown_cache.seconds == 123
+    assert markdown_cache.cache_key_namespace == "coltrane:markdown_cache:"
+
+
+def test_markdown_cache_is_not_enabled(settings):
+    settings.COLTRANE = {}
+    markdown_cache = MarkdownCache()
+
+    assert not markdown_cache.is_enabled
+
+
+def test_markdown_cache_get_cache_key_changes_with_mtime(settings, tmp_path: Path):
+    settings.COLTRANE = {"MARKDOWN_CACHE": {"SECONDS": 123}}
+    markdown_cache = MarkdownCache()
+
+    path = tmp_path / "test.md"
+    path.write_text("# test")
+    os.utime(path, (1, 1))
+
+    expected = markdown_cache.get_cache_key(path)
+
+    os.utime(path, (2, 2))
+    actual = markdown_cache.get_cache_key(path)
+
+    assert actual != expected
+
+
+def test_markdown_cache_get_cache_key_changes_with_mistune_plugins(settings, tmp_path: Path):
+    settings.COLTRANE = {"MARKDOWN_CACHE": {"SECONDS": 123}}
+    markdown_cache = MarkdownCache()
+
+    path = tmp_path / "test.md"
+    path.write_text("# test")
+
+    expected = markdown_cache.get_cache_key(path)
+
+    settings.COLTRANE["MISTUNE_PLUGINS"] = ["table"]
+    actual = markdown_cache.get_cache_key(path)
+
+    assert actual != expected
@@ -0,0 +1,30 @@
+from pathlib import Path
+
+from coltrane.config.cache import MetadataCache
+
+
+def test_metadata_cache_is_enabled(settings):
+    settings.COLTRANE = {"METADATA_CACHE": {"SECONDS": 123}}
+    metadata_cache = MetadataCache()
+
+    assert metadata_cache.is_enabled
+    assert metadata_cache.seconds == 123
+    assert metadata_cache.cache_key_namespace == "coltrane:metadata_cache:"
+
+
+def test_metadata_cache_is_not_enabled(settings):
+    settings.COLTRANE = {}
+    metadata_cache = MetadataCache()
+
+    assert not metadata_cache.is_enabled
+
+
+def test_metadata_cache_get_cache_key_changes_with_mtime(settings):
+    settings.COLTRANE = {"METADATA_CACHE": {"SECONDS": 123}}
+    metadata_cache = MetadataCache()
+
+    expected = metadata_cache.get_cache_key(Path("/site/content/test.md"), mtime_ns=1, size=10)
+    actual = metadata_cache.get_cache_key(Path("/site/content/test.md"), mtime_ns=2, size=10)
+
+    assert actual != expected
+    assert actual.startswith("coltrane:metadata_cache:")
@@ -0,0 +1,30 @@
+from django.test import RequestFactory
+
+from coltrane.config.cache import ResponseCache
+
+
+def test_response_cache_is_enabled(settings):
+    settings.COLTRANE = {"RESPONSE_CACHE": {"SECONDS": 123}}
+    response_cache = ResponseCache()
+
+    assert response_cache.is_enabled
+    assert response_cache.seconds == 123
+    assert response_cache.cache_key_namespace == "coltrane:response_cache:"
+
+
+def test_response_cache_is_not_enabled(settings):
+    settings.COLTRANE = {}
+    response_cache = ResponseCache()
+
+    assert not response_cache.is_enabled
+
+
+def test_response_cache_get_cache_key_changes_with_query_string(settings):
+    settings.COLTRANE = {"RESPONSE_CACHE": {"SECONDS": 123}}
+    response_cache = ResponseCache()
+
+    expected = response_cache.get_cache_key(RequestFactory().get("/test"))
+    actual = response_cache.get_cache_key(RequestFactory().get("/test?page=2"))
+
+    assert actual != expected
+    assert actual.startswith("coltrane:response_cache:")
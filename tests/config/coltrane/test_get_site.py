@@ -0,0 +1,129 @@
+import msgspec
+from django.test import RequestFactory
+
+from coltrane.config.coltrane import Config, Site
+
+
+def _get_config() -> Config:
+    return Config(
+        sites=[
+            Site(folder="site1", hosts=["Site1.example.com", "www.site1.example.com"]),
+            Site(folder="site2", hosts=["site2.example.com"]),
+            Site(folder="default", hosts=["*"]),
+            Site(folder="site3", hosts=["site3.example.com"]),
+        ]
+    )
+
+
+def test_get_site():
+    config = _get_config()
+
+    actual = config.get_site(RequestFactory().get("/", HTTP_HOST="www.site1.example.com"))
+
+    assert actual.folder == "site1"
+
+
+def test_get_site_host_is_case_insensitive():
+    config = _get_config()
+
+    actual = config.get_site(RequestFactory().get("/", HTTP_HOST="SITE1.EXAMPLE.COM"))
+
+    assert actual.folder == "site1"
+
+
+def test_get_site_x_forwarded_host():
+    config = _get_config()
+
+    actual = config.get_site(
+        RequestFactory().get("/", HTTP_HOST="site1.example.com", HTTP_X_FORWARDED_HOST="site2.example.com")
+    )
+
+    assert actual.folder == "site2"
+
+
+def test_get_site_wildcard():
+    config = _get_config()
+
+    actual = config.get_site(RequestFactory().get("/", HTTP_HOST="unknown.example.com"))
+
+    assert actual.folder == "default"
+
+
+def test_get_site_wildcard_before_host():
+    config = _get_config()
+
+    # The wildcard site is before `site3`, so it matches first
+    actual = config.get_site(RequestFactory().get("/", HTTP_HOST="site3.example.com"))
+
+    assert actual.folder == "default"
+
+
+def test_get_site_first_site_is_the_default():
+    config = Config(sites=[Site(folder="site1", hosts=["site1.example.com"]), Site(folder="site2", hosts=[])])
+
+    actual = config.get_site(RequestFactory().get("/", HTTP_HOST="unknown.example.com"))
+
+    assert actual.folder == "site1"
+
+
+def test_get_site_is_stored_on_the_request():
+    config = _get_config()
+    request = RequestFactory().get("/", HTTP_HOST="site2.example.com")
+
+    expected = config.get_site(request)
+
+    # Remove all sites to make sure the site isn't looked up again
+    config.sites.clear()
+
+    actual = config.get_site(request)
+
+    assert actual is expected
+
+
+def test_get_site_is_not_stored_for_another_config():
+    request = RequestFactory().get("/", HTTP_HOST="site2.example.com")
+    _get_config().get_site(request)
+
+    actual = Config(sites=[Site(folder="other", hosts=["*"])]).get_site(request)
+
+    assert actual.folder == "other"
+
+
+def test_get_site_decoded():
+    data = b"""
+[[sites]]
+folder = "site1"
+hosts = ["site1.example.com"]
+
+[[sites]]
+folder = "site2"
+hosts = ["SITE2.example.com"]
+"""
+
+    config = msgspec.toml.decode(data, type=Config)
+
+    actual = config.get_site(RequestFactory().get("/", HTTP_HOST="site2.example.com"))
+
+    assert actual.folder == "site2"
+
+
+def test_get_site_sites_changed():
+    config = _get_config()
+    config.get_site(RequestFactory().get("/", HTTP_HOST="site1.example.com"))
+
+    config.sites = [Site(folder="site3", hosts=["site1.example.com"])]
+
+    actual = config.get_site(RequestFactory().get("/", HTTP_HOST="site1.example.com"))
+
+    assert actual.folder == "site3"
+
+
+def test_get_site_hosts_changed():
+    config = _get_config()
+    config.get_site(RequestFactory().get("/", HTTP_HOST="site1.example.com"))
+
+    config.sites[1].hosts.append("new.example.com")
+
+    actual = config.get_site(RequestFactory().get("/", HTTP_HOST="new.example.com"))
+
+    assert actual.folder == "site2"
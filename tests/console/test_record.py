@@ -59,9 +59,25 @@ def test_record_threads(_run_management_command):
     _run_management_command.assert_called_once_with("build", "--threads", "3")
 
 
+@patch("coltrane.console._run_management_command")
+def test_record_processes(_run_management_command):
+    runner = CliRunner()
+    runner.invoke(cli, ["record", "--processes", "4"])
+
+    _run_management_command.assert_called_once_with("build", "--processes", "4")
+
+
 @patch("coltrane.console._run_management_command")
 def test_record_ignore(_run_management_command):
     runner = CliRunner()
     runner.invoke(cli, ["record", "--ignore"])
 
     _run_management_command.assert_called_once_with("build", "--ignore")
+
+
+@patch("coltrane.console._run_management_command")
+def test_record_precompress(_run_management_command):
+    runner = CliRunner()
+    runner.invoke(cli, ["record", "--precompress"])
+
+    _run_management_command.assert_called_once_with("build", "--precompress")
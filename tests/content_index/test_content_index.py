@@ -0,0 +1,206 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from coltrane.content_index import ContentIndex, ContentTreeCache, walk_content_directory
+
+
+@pytest.fixture
+def content_directory(tmp_path: Path) -> Path:
+    content_directory = tmp_path / "content"
+    content_directory.mkdir()
+
+    return content_directory
+
+
+def _write_markdown(content_directory: Path, slug: str) -> None:
+    path = content_directory / f"{slug}.md"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(f"# {slug}")
+
+
+def test_has_slug(content_directory: Path):
+    _write_markdown(content_directory, "index")
+    _write_markdown(content_directory, "blog/first-post")
+
+    content_index = ContentIndex()
+
+    assert content_index.has_slug(content_directory, "index")
+    assert content_index.has_slug(content_directory, "blog/first-post")
+    assert not content_index.has_slug(content_directory, "blog")
+    assert not content_index.has_slug(content_directory, "blog/second-post")
+
+
+def test_has_slug_missing_content_directory(tmp_path: Path):
+    assert not ContentIndex().has_slug(tmp_path / "content", "index")
+
+
+def test_has_slug_parent_directory(content_directory: Path):
+    _write_markdown(content_directory.parent, "secret")
+
+    assert not ContentIndex().has_slug(content_directory, "../secret")
+
+
+def test_has_slug_ignores_other_files(content_directory: Path):
+    (content_directory / "index.html").write_text("index")
+
+    assert not ContentIndex().has_slug(content_directory, "index")
+
+
+def test_has_slug_added(content_directory: Path):
+    content_index = ContentIndex()
+
+    assert not content_index.has_slug(content_directory, "about")
+
+    _write_markdown(content_directory, "about")
+
+    # Make sure the last modified time is different even on file systems with a coarse resolution
+    os.utime(content_directory, ns=(0, 0))
+
+    assert content_index.has_slug(content_directory, "about")
+
+
+def test_has_slug_added_in_new_directory(content_directory: Path):
+    content_index = ContentIndex()
+
+    assert not content_index.has_slug(content_directory, "blog/posts/first-post")
+
+    _write_markdown(content_directory, "blog/posts/first-post")
+    os.utime(content_directory, ns=(0, 0))
+
+    assert content_index.has_slug(content_directory, "blog/posts/first-post")
+
+
+def test_has_slug_added_in_existing_empty_directory(content_directory: Path):
+    (content_directory / "blog" / "posts").mkdir(parents=True)
+
+    content_index = ContentIndex()
+
+    assert not content_index.has_slug(content_directory, "blog/posts/first-post")
+
+    _write_markdown(content_directory, "blog/posts/first-post")
+    os.utime(content_directory / "blog" / "posts", ns=(0, 0))
+
+    assert content_index.has_slug(content_directory, "blog/posts/first-post")
+
+
+def test_has_slug_removed(content_directory: Path):
+    _write_markdown(content_directory, "blog/first-post")
+
+    content_index = ContentIndex()
+
+    assert content_index.has_slug(content_directory, "blog/first-post")
+
+    (content_directory / "blog" / "first-post.md").unlink()
+    os.utime(content_directory / "blog", ns=(0, 0))
+
+    assert not content_index.has_slug(content_directory, "blog/first-post")
+
+
+def test_has_slug_ignored_directory(content_directory: Path):
+    _write_markdown(content_directory, "node_modules/package/readme")
+
+    assert not ContentIndex().has_slug(content_directory, "node_modules/package/readme")
+
+
+def test_walk_content_directory(content_directory: Path):
+    _write_markdown(content_directory, "index")
+    _write_markdown(content_directory, "blog/first-post")
+    _write_markdown(content_directory, "blog/2024/second-post")
+    (content_directory / "blog" / "image.png").write_bytes(b"")
+    (content_directory / "empty").mkdir()
+
+    tree = walk_content_directory(content_directory)
+
+    assert set(tree.paths) == set(content_directory.rglob("*.md"))
+    assert set(tree.directory_mtimes) == {
+        content_directory,
+        content_directory / "blog",
+        content_directory / "blog" / "2024",
+        content_directory / "empty",
+    }
+
+
+def test_walk_content_directory_order(content_directory: Path):
+    _write_markdown(content_directory, "index")
+    _write_markdown(content_directory, "blog/first-post")
+    _write_markdown(content_directory, "blog/2024/second-post")
+    _write_markdown(content_directory, "about/index")
+
+    assert list(walk_content_directory(content_directory).paths) == list(content_directory.rglob("*.md"))
+
+
+def test_walk_content_directory_ignore_patterns(content_directory: Path):
+    _write_markdown(content_directory, "index")
+    _write_markdown(content_directory, "node_modules/package/readme")
+    _write_markdown(content_directory, ".git/description")
+    _write_markdown(content_directory, "drafts/first-post.draft")
+
+    tree = walk_content_directory(content_directory, ignore_patterns=["node_modules", ".git", "*.draft.md"])
+
+    assert tree.paths == (content_directory / "index.md",)
+    assert content_directory / "node_modules" not in tree.directory_mtimes
+
+
+def test_walk_content_directory_does_not_follow_symlinked_directories(content_directory: Path, tmp_path: Path):
+    _write_markdown(tmp_path / "other", "index")
+    (content_directory / "other").symlink_to(tmp_path / "other", target_is_directory=True)
+
+    assert walk_content_directory(content_directory).paths == ()
+
+
+def test_walk_content_directory_missing(tmp_path: Path):
+    tree = walk_content_directory(tmp_path / "content")
+
+    assert tree.paths == ()
+    assert tree.directory_mtimes == {tmp_path / "content": None}
+
+
+def test_content_tree_cache(content_directory: Path):
+    _write_markdown(content_directory, "blog/first-post")
+
+    content_tree_cache = ContentTreeCache()
+    tree = content_tree_cache.get(content_directory)
+
+    assert tree.paths == (content_directory / "blog" / "first-post.md",)
+    assert content_tree_cache.get(content_directory) is tree
+
+
+def test_content_tree_cache_added(content_directory: Path):
+    _write_markdown(content_directory, "blog/first-post")
+
+    content_tree_cache = ContentTreeCache()
+    content_tree_cache.get(content_directory)
+
+    _write_markdown(content_directory, "blog/second-post")
+    os.utime(content_directory / "blog", ns=(0, 0))
+
+    assert set(content_tree_cache.get(content_directory).paths) == {
+        content_directory / "blog" / "first-post.md",
+        content_directory / "blog" / "second-post.md",
+    }
+
+
+def test_content_tree_cache_changed_file_is_not_a_change(content_directory: Path):
+    _write_markdown(content_directory, "blog/first-post")
+
+    content_tree_cache = ContentTreeCache()
+    tree = content_tree_cache.get(content_directory)
+
+    (content_directory / "blog" / "first-post.md").write_text("# Changed")
+
+    assert content_tree_cache.get(content_directory) is tree
+
+
+def test_content_tree_cache_ignore_patterns(content_directory: Path, settings):
+    _write_markdown(content_directory, "index")
+    _write_markdown(content_directory, "vendor/readme")
+
+    content_tree_cache = ContentTreeCache()
+
+    assert len(content_tree_cache.get(content_directory).paths) == 2
+
+    settings.COLTRANE = {**settings.COLTRANE, "CONTENT_IGNORE_PATTERNS": ["vendor"]}
+
+    assert content_tree_cache.get(content_directory).paths == (content_directory / "index.md",)
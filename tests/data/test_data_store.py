@@ -0,0 +1,121 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from threading import Event
+from unittest.mock import patch
+
+import pytest
+
+from coltrane.data import DataStore, load_data_file
+
+
+@pytest.fixture
+def data_path(tmp_path: Path) -> Path:
+    data_path = tmp_path / "data" / "authors.json"
+    data_path.parent.mkdir()
+    data_path.write_text('{"alice": {"name": "Alice"}}')
+    os.utime(data_path, (1, 1))
+
+    return data_path
+
+
+def test_data_store_load(data_path: Path):
+    actual = DataStore().load(data_path)
+
+    assert actual == {"alice": {"name": "Alice"}}
+
+
+def test_data_store_load_cached(data_path: Path):
+    data_store = DataStore()
+    expected = data_store.load(data_path)
+
+    with patch("coltrane.data.load_data_file") as _load_data_file:
+        actual = data_store.load(data_path)
+
+    _load_data_file.assert_not_called()
+    assert actual is expected
+
+
+def test_data_store_load_changed_file(data_path: Path):
+    data_store = DataStore()
+    data_store.load(data_path)
+
+    data_path.write_text('{"bob": {"name": "Bob"}}')
+
+    with patch("coltrane.data.load_data_file", wraps=load_data_file) as _load_data_file:
+        actual = data_store.load(data_path)
+
+    _load_data_file.assert_called_once_with(data_path, is_json5=False)
+    assert actual == {"bob": {"name": "Bob"}}
+
+
+def test_data_store_load_json5_changed(data_path: Path):
+    data_store = DataStore()
+    data_store.load(data_path)
+
+    data_path.write_text('{"alice": {"name": "Alice",},}')
+    os.utime(data_path, (1, 1))
+
+    actual = data_store.load(data_path, is_json5=True)
+
+    assert actual == {"alice": {"name": "Alice"}}
+
+
+def test_data_store_load_missing_file(tmp_path: Path):
+    actual = DataStore().load(tmp_path / "missing.json")
+
+    assert actual is None
+
+
+def test_data_store_load_directory(tmp_path: Path):
+    actual = DataStore().load(tmp_path)
+
+    assert actual is None
+
+
+def test_data_store_load_threads(data_path: Path):
+    data_store = DataStore()
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        actual = list(executor.map(lambda _: data_store.load(data_path), range(32)))
+
+    assert all(data is actual[0] for data in actual)
+
+
+def test_data_store_load_removed_file(data_path: Path):
+    data_store = DataStore()
+    data_store.load(data_path)
+
+    data_path.unlink()
+
+    assert data_store.load(data_path) is None
+    assert data_path not in data_store._files
+
+
+def test_data_store_load_does_not_wait_for_other_files(data_path: Path, tmp_path: Path):
+    data_store = DataStore()
+    other_path = tmp_path / "data" / "other.json"
+    other_path.write_text('{"other": true}')
+
+    parsing = Event()
+    finish_parsing = Event()
+
+    def _slow_load_data_file(path: Path, **kwargs):
+        if path == other_path:
+            parsing.set()
+            finish_parsing.wait(5)
+
+        return load_data_file(path, **kwargs)
+
+    with patch("coltrane.data.load_data_file", side_effect=_slow_load_data_file):
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            other_future = executor.submit(data_store.load, other_path)
+            parsing.wait(5)
+
+            # Another file can be parsed while `other.json` is still being parsed
+            actual = data_store.load(data_path)
+            finish_parsing.set()
+
+            assert other_future.result() == {"other": True}
+
+    assert actual == {"alice": {"name": "Alice"}}
@@ -0,0 +1,144 @@
+import pickle
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from django.template import engines
+
+from coltrane.data import LazyData, load_data_file
+from coltrane.dependencies import record_dependencies
+
+
+@pytest.fixture
+def data_directory(tmp_path: Path) -> Path:
+    data_directory = tmp_path / "data"
+    data_directory.mkdir()
+
+    (data_directory / "authors.json").write_text('{"alice": {"name": "Alice"}}')
+    (data_directory / "posts.json").write_text('{"count": 2}')
+    (data_directory / "posts").mkdir()
+    (data_directory / "posts" / "first.json").write_text('{"title": "First"}')
+    (data_directory / "posts" / "second.json").write_text('{"title": "Second"}')
+
+    return data_directory
+
+
+def test_lazy_data_getitem(data_directory: Path):
+    data = LazyData(data_directory, is_root=True)
+
+    assert data["authors"]["alice"]["name"] == "Alice"
+    assert data["posts"]["count"] == 2
+    assert data["posts"]["first"]["title"] == "First"
+
+
+def test_lazy_data_getitem_only_parses_accessed_files(data_directory: Path):
+    data = LazyData(data_directory, is_root=True)
+
+    with patch("coltrane.data.load_data_file", wraps=load_data_file) as _load_data_file:
+        assert data["posts"]["first"]["title"] == "First"
+
+    assert _load_data_file.call_args_list[0].args == (data_directory / "posts.json",)
+    assert _load_data_file.call_args_list[1].args == (data_directory / "posts" / "first.json",)
+    assert _load_data_file.call_count == 2
+
+
+def test_lazy_data_getitem_missing(data_directory: Path):
+    data = LazyData(data_directory, is_root=True)
+
+    with pytest.raises(KeyError):
+        data["missing"]
+
+    assert "missing" not in data
+
+
+def test_lazy_data_equals_dict(data_directory: Path):
+    expected = {
+        "authors": {"alice": {"name": "Alice"}},
+        "posts": {"count": 2, "first": {"title": "First"}, "second": {"title": "Second"}},
+    }
+
+    actual = LazyData(data_directory, is_root=True)
+
+    assert actual == expected
+    assert len(actual) == 2
+
+
+def test_lazy_data_skips_directories_without_data_files(data_directory: Path):
+    (data_directory / "empty").mkdir()
+    (data_directory / "images").mkdir()
+    (data_directory / "images" / "cover.png").write_bytes(b"")
+    (data_directory / "authors").mkdir()
+
+    actual = LazyData(data_directory, is_root=True)
+
+    assert list(actual) == ["authors", "posts"]
+    assert len(actual) == 2
+    assert "empty" not in actual
+    assert "images" not in actual
+    assert actual["authors"] == {"alice": {"name": "Alice"}}
+
+
+def test_lazy_data_skips_invalid_files(data_directory: Path):
+    (data_directory / "invalid.json").write_text("")
+
+    actual = LazyData(data_directory, is_root=True)
+
+    assert list(actual) == ["authors", "posts"]
+    assert len(actual) == 2
+
+
+def test_lazy_data_records_dependencies(data_directory: Path):
+    data = LazyData(data_directory, is_root=True)
+
+    with record_dependencies() as dependencies:
+        assert data["posts"]["first"]["title"] == "First"
+
+    assert dependencies == {f"data:{data_directory / 'posts'}"}
+
+
+def test_lazy_data_records_dependencies_iter(data_directory: Path):
+    data = LazyData(data_directory, is_root=True)
+
+    with record_dependencies() as dependencies:
+        list(data.keys())
+
+    assert dependencies == {f"data:{data_directory / 'authors'}", f"data:{data_directory / 'posts'}"}
+
+
+def test_lazy_data_pickle_does_not_copy_data(data_directory: Path):
+    data = LazyData(data_directory, is_root=True)
+    data["posts"]["first"]
+
+    pickled = pickle.dumps(data)
+
+    assert b"First" not in pickled
+    assert pickle.loads(pickled) == data  # noqa: S301
+
+
+def test_lazy_data_template(data_directory: Path):
+    template = engines["django"].from_string(
+        "{{ data.authors.alice.name }}{% for name, author in data.authors.items %} {{ name }}{% endfor %}"
+    )
+
+    actual = template.render({"data": LazyData(data_directory, is_root=True)})
+
+    assert actual == "Alice alice"
+
+
+def test_lazy_data_to_dict_deeply_nested(data_directory: Path):
+    (data_directory / "posts" / "2024" / "01").mkdir(parents=True)
+    (data_directory / "posts" / "2024" / "01" / "third.json").write_text('{"title": "Third"}')
+    (data_directory / "posts" / "2024.json").write_text('{"count": 1}')
+
+    actual = LazyData(data_directory, is_root=True).to_dict()
+
+    assert type(actual["posts"]["2024"]) is dict
+    assert actual["posts"]["2024"] == {"count": 1, "01": {"third": {"title": "Third"}}}
+    assert actual["posts"]["first"] == {"title": "First"}
+
+
+def test_lazy_data_conflict(data_directory: Path):
+    (data_directory / "posts.json5").write_text('{"count": 3}')
+
+    with pytest.raises(Exception, match=r"Conflict at posts\.count"):
+        LazyData(data_directory, is_root=True)["posts"]
@@ -0,0 +1,53 @@
+from pathlib import Path
+from unittest.mock import patch
+
+from coltrane.data import load_data_file
+
+
+def test_load_data_file(tmp_path: Path):
+    path = tmp_path / "test.json"
+    path.write_text('{"sample": [1, 2.5, "spræ", null, true]}')
+
+    expected = {"sample": [1, 2.5, "spræ", None, True]}
+    actual = load_data_file(path)
+
+    assert actual == expected
+
+
+def test_load_data_file_invalid(tmp_path: Path):
+    path = tmp_path / "test.json"
+    path.write_text('{"sample":')
+
+    actual = load_data_file(path)
+
+    assert actual is None
+
+
+def test_load_data_file_empty(tmp_path: Path):
+    path = tmp_path / "test.json"
+    path.write_text("")
+
+    actual = load_data_file(path)
+
+    assert actual is None
+
+
+@patch("coltrane.data.MEMORY_MAP_THRESHOLD", 0)
+def test_load_data_file_memory_mapped(tmp_path: Path):
+    path = tmp_path / "test.json"
+    path.write_text('{"sample": "spræ"}')
+
+    with patch("coltrane.data.mmap.mmap", wraps=__import__("mmap").mmap) as mmap:
+        actual = load_data_file(path)
+
+    mmap.assert_called_once()
+    assert actual == {"sample": "spræ"}
+
+
+def test_load_data_file_json5(tmp_path: Path):
+    path = tmp_path / "test.json"
+    path.write_text('{"sample": 1,}')
+
+    actual = load_data_file(path, is_json5=True)
+
+    assert actual == {"sample": 1}
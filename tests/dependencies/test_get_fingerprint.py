@@ -0,0 +1,71 @@
+import os
+from pathlib import Path
+
+from coltrane.dependencies import get_fingerprint
+
+
+def _touch(path: Path, mtime: int) -> None:
+    os.utime(path, (mtime, mtime))
+
+
+def test_get_fingerprint_template(tmp_path):
+    template = tmp_path / "base.html"
+    template.write_text("base")
+    _touch(template, 1)
+
+    expected = get_fingerprint(f"template:{template}")
+
+    _touch(template, 2)
+    actual = get_fingerprint(f"template:{template}")
+
+    assert actual != expected
+
+
+def test_get_fingerprint_template_missing(tmp_path):
+    assert get_fingerprint(f"template:{tmp_path / 'missing.html'}") == "missing"
+
+
+def test_get_fingerprint_data_file(tmp_path):
+    (tmp_path / "data").mkdir()
+    (tmp_path / "data" / "posts.json").write_text("{}")
+    (tmp_path / "data" / "authors.json").write_text("{}")
+
+    expected = get_fingerprint(f"data:{tmp_path / 'data' / 'posts'}")
+
+    # Changing another data file doesn't change the fingerprint
+    (tmp_path / "data" / "authors.json").write_text('{"one": 1}')
+    assert get_fingerprint(f"data:{tmp_path / 'data' / 'posts'}") == expected
+
+    (tmp_path / "data" / "posts.json").write_text('{"one": 1}')
+    assert get_fingerprint(f"data:{tmp_path / 'data' / 'posts'}") != expected
+
+
+def test_get_fingerprint_data_directory(tmp_path):
+    (tmp_path / "data" / "posts").mkdir(parents=True)
+    (tmp_path / "data" / "posts" / "one.json").write_text("{}")
+
+    expected = get_fingerprint(f"data:{tmp_path / 'data' / 'posts'}")
+
+    (tmp_path / "data" / "posts" / "two.json").write_text("{}")
+    actual = get_fingerprint(f"data:{tmp_path / 'data' / 'posts'}")
+
+    assert actual != expected
+
+
+def test_get_fingerprint_directory(tmp_path):
+    (tmp_path / "content" / "blog").mkdir(parents=True)
+    (tmp_path / "content" / "blog" / "one.md").write_text("# one")
+
+    expected = get_fingerprint(f"directory:{tmp_path / 'content' / 'blog'}")
+
+    (tmp_path / "content" / "blog" / "two.md").write_text("# two")
+    actual = get_fingerprint(f"directory:{tmp_path / 'content' / 'blog'}")
+
+    assert actual != expected
+
+
+def test_get_fingerprint_static():
+    static_paths = {"static/css/styles.css": "static/css/styles.123.css"}
+
+    assert get_fingerprint("static:static/css/styles.css", static_paths=static_paths) == "static/css/styles.123.css"
+    assert get_fingerprint("static:static/css/missing.css", static_paths=static_paths) == "missing"
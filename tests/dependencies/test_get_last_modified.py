@@ -0,0 +1,44 @@
+import os
+from pathlib import Path
+
+from coltrane.dependencies import get_last_modified
+
+
+def _touch(path: Path, mtime: int) -> None:
+    os.utime(path, (mtime, mtime))
+
+
+def test_get_last_modified(tmp_path):
+    template = tmp_path / "base.html"
+    template.write_text("base")
+    _touch(template, 1)
+
+    content = tmp_path / "test.md"
+    content.write_text("# test")
+    _touch(content, 2)
+
+    assert get_last_modified([f"template:{template}", f"content:{content}"]) == 2
+
+
+def test_get_last_modified_data_directory(tmp_path):
+    (tmp_path / "data" / "posts").mkdir(parents=True)
+    (tmp_path / "data" / "posts" / "one.json").write_text("{}")
+    _touch(tmp_path / "data" / "posts" / "one.json", 1)
+    (tmp_path / "data" / "posts" / "two.json").write_text("{}")
+    _touch(tmp_path / "data" / "posts" / "two.json", 3)
+
+    assert get_last_modified([f"data:{tmp_path / 'data' / 'posts'}"]) == 3
+
+
+def test_get_last_modified_skips_missing_and_static(tmp_path):
+    content = tmp_path / "test.md"
+    content.write_text("# test")
+    _touch(content, 2)
+
+    actual = get_last_modified([f"content:{tmp_path / 'missing.md'}", "static:css/styles.css", f"content:{content}"])
+
+    assert actual == 2
+
+
+def test_get_last_modified_none(tmp_path):
+    assert get_last_modified([f"content:{tmp_path / 'missing.md'}"]) is None
@@ -0,0 +1,39 @@
+from pathlib import Path
+
+from coltrane.dependencies import (
+    add_data_dependency,
+    add_directory_dependency,
+    add_template_dependency,
+    is_recording_dependencies,
+    record_dependencies,
+)
+
+
+def test_record_dependencies():
+    with record_dependencies() as dependencies:
+        assert is_recording_dependencies()
+
+        add_template_dependency("/site/templates/base.html")
+        add_data_dependency(Path("/site/data/posts"))
+        add_directory_dependency(Path("/site/content/blog"))
+
+    assert dependencies == {
+        "template:/site/templates/base.html",
+        "data:/site/data/posts",
+        "directory:/site/content/blog",
+    }
+
+
+def test_record_dependencies_not_recording():
+    assert not is_recording_dependencies()
+
+    # Does not raise when nothing is recording
+    add_template_dependency("/site/templates/base.html")
+
+
+def test_record_dependencies_template_from_string():
+    with record_dependencies() as dependencies:
+        add_template_dependency("<unknown source>")
+        add_template_dependency(None)
+
+    assert dependencies == set()
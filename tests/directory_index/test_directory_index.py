@@ -0,0 +1,103 @@
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from coltrane.directory_index import DirectoryIndex
+
+
+@pytest.fixture
+def directory(tmp_path: Path) -> Path:
+    directory = tmp_path / "content" / "posts"
+    directory.mkdir(parents=True)
+
+    (directory / "index.md").write_text("index")
+    (directory / "b.md").write_text("---\ntitle: A\n---\n")
+    (directory / "a.md").write_text("---\ntitle: B\n---\n")
+    (directory / "c.md").write_text("---\ntitle: A\n---\n")
+
+    return directory
+
+
+def test_get(directory: Path):
+    entry = DirectoryIndex().get(directory, "posts")
+
+    assert sorted(item["slug"] for item in entry.items) == ["posts/a", "posts/b", "posts/c"]
+    assert all(item["toc"] is None for item in entry.items)
+
+
+def test_get_is_cached(directory: Path):
+    directory_index = DirectoryIndex()
+
+    assert directory_index.get(directory, "posts") is directory_index.get(directory, "posts")
+
+
+def test_get_missing_directory(tmp_path: Path):
+    with pytest.raises(FileNotFoundError):
+        DirectoryIndex().get(tmp_path / "content")
+
+
+def test_get_added_file(directory: Path):
+    directory_index = DirectoryIndex()
+    entry = directory_index.get(directory, "posts")
+
+    (directory / "d.md").write_text("d")
+    os.utime(directory, ns=(0, 0))
+
+    new_entry = directory_index.get(directory, "posts")
+
+    assert new_entry is not entry
+    assert len(new_entry.items) == len(entry.items) + 1
+
+
+def test_get_changed_file(directory: Path):
+    directory_index = DirectoryIndex()
+    directory_index.get(directory, "posts")
+
+    (directory / "a.md").write_text("---\ntitle: Changed\n---\n")
+
+    with patch("coltrane.directory_index.FILE_CHECK_SECONDS", 0):
+        titles = {item["slug"]: item["title"] for item in directory_index.get(directory, "posts").items}
+
+    assert titles["posts/a"] == "Changed"
+
+
+def test_get_changed_file_is_checked_once_every_file_check_seconds(directory: Path):
+    directory_index = DirectoryIndex()
+    entry = directory_index.get(directory, "posts")
+
+    with patch("coltrane.directory_index._get_stat") as _get_stat:
+        actual = directory_index.get(directory, "posts")
+
+    _get_stat.assert_not_called()
+    assert actual is entry
+
+    # The files are checked again once `FILE_CHECK_SECONDS` have passed
+    checked_at = entry.checked_at + 1
+
+    with patch("coltrane.directory_index.monotonic", return_value=checked_at):
+        actual = directory_index.get(directory, "posts")
+
+    assert actual is entry
+    assert entry.checked_at == checked_at
+
+
+def test_get_items_order_by_is_stable(directory: Path):
+    entry = DirectoryIndex().get(directory, "posts")
+    slugs_with_a = [item["slug"] for item in entry.items if item["title"] == "A"]
+
+    ascending = [item["slug"] for item in entry.get_items(order_by="title")]
+    descending = [item["slug"] for item in entry.get_items(order_by="-title")]
+
+    assert ascending == [*slugs_with_a, "posts/a"]
+    assert descending == ["posts/a", *slugs_with_a]
+
+
+def test_get_items_copies_items(directory: Path):
+    entry = DirectoryIndex().get(directory, "posts")
+
+    item = entry.get_items(limit=1)[0]
+    item["title"] = "Changed"
+
+    assert entry.items[0]["title"] != "Changed"
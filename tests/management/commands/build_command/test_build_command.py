@@ -118,11 +118,18 @@ def test_build_command_updates_output_manifest(settings, tmp_path):
     assert (tmp_path / "output" / "test-1" / "index.html").exists()
 
     mtime = markdown_file.stat().st_mtime
+    size = markdown_file.stat().st_size
     file_hash = md5(markdown_file.read_bytes()).hexdigest()  # noqa: S324
-    expected = '{"test-1.md": {"mtime": ' + str(mtime) + ', "md5": "' + file_hash + '"}}'
-    actual = (tmp_path / "output.json").read_text()
+    actual = json.loads((tmp_path / "output.json").read_text())
 
-    assert actual == expected
+    assert actual["test-1.md"]["mtime"] == mtime
+    assert actual["test-1.md"]["size"] == size
+    assert actual["test-1.md"]["md5"] == file_hash
+
+    # The default templates are dependencies of the markdown file
+    dependencies = actual["test-1.md"]["dependencies"]
+    assert any(d.startswith("template:") and d.endswith("coltrane/content.html") for d in dependencies)
+    assert set(dependencies) == set(actual["__dependencies__"].keys())
 
 
 @pytest.mark.slow
@@ -153,11 +160,12 @@ def test_build_command_staticfiles_force(settings, tmp_path):
     (tmp_path / "output" / "static").mkdir()
     (tmp_path / "output" / "static" / "staticfiles.json").write_text("{}")
 
-    # Fake staticfiles.json metadata
+    # Fake staticfiles.json metadata and a markdown file from a manifest without dependencies
     (tmp_path / "output.json").write_text(
         json.dumps(
             {
                 "staticfiles.json": {"mtime": -1, "md5": "not-a-hash"},
+                "test-1.md": {"mtime": -1, "md5": "not-a-hash"},
             }
         )
     )
@@ -1,9 +1,13 @@
 import json
+import os
+from copy import deepcopy
 from hashlib import md5
 from unittest.mock import Mock, patch
 
 import pytest
+from django.template.autoreload import reset_loaders
 
+from coltrane.config.settings import get_config
 from coltrane.management.commands.build import Command
 from coltrane.manifest import Manifest
 
@@ -68,6 +72,7 @@ def test_handle_static_files_changed_is_force(_load_manifest, settings, tmp_path
     (tmp_path / "content").mkdir()
 
     _load_manifest.return_value.static_files_manifest_changed = True
+    _load_manifest.return_value.has_items_without_dependencies = True
 
     build_command.handle(force=False)
 
@@ -151,6 +156,47 @@ def test_handle_skip_because_md5(settings, tmp_path, build_command):
     assert build_command.output_result_counts.skip_count == 1
 
 
+@pytest.mark.slow
+@patch("coltrane.management.commands.build.Command._call_collectstatic", Mock())
+@patch("coltrane.management.commands.build.Command._call_compress", Mock())
+@patch("coltrane.manifest.md5_hash")
+def test_handle_skip_because_stat_without_hashing(md5_hash, settings, tmp_path, build_command):
+    _reset_settings(settings, tmp_path)
+
+    markdown_file = create_markdown_file(tmp_path)
+
+    # Fake a previous run with the correct mtime and size
+    stat_result = markdown_file.stat()
+    (tmp_path / "output.json").write_text(
+        json.dumps({"test-1.md": {"mtime": stat_result.st_mtime, "size": stat_result.st_size, "md5": "not-a-hash"}})
+    )
+
+    build_command.handle(force=False)
+
+    assert build_command.output_result_counts.skip_count == 1
+    md5_hash.assert_not_called()
+
+
+@pytest.mark.slow
+@patch("coltrane.management.commands.build.Command._call_collectstatic", Mock())
+@patch("coltrane.management.commands.build.Command._call_compress", Mock())
+def test_handle_update_because_size(settings, tmp_path, build_command):
+    _reset_settings(settings, tmp_path)
+
+    markdown_file = create_markdown_file(tmp_path)
+
+    # Fake a previous run with the correct mtime, but a different size
+    stat_result = markdown_file.stat()
+    (tmp_path / "output.json").write_text(
+        json.dumps({"test-1.md": {"mtime": stat_result.st_mtime, "size": 1, "md5": "not-a-hash"}})
+    )
+
+    build_command.handle(force=False)
+
+    assert build_command.output_result_counts.update_count == 1
+    assert build_command.output_result_counts.skip_count == 0
+
+
 @pytest.mark.slow
 @patch("coltrane.management.commands.build.Command._call_collectstatic", Mock())
 @patch("coltrane.management.commands.build.Command._call_compress", Mock())
@@ -271,6 +317,20 @@ def test_handle_generate_sitemap(
     _generate_sitemap.assert_called_once()
 
 
+@pytest.mark.slow
+@patch("coltrane.management.commands.build.Command._call_collectstatic", Mock())
+@patch("coltrane.management.commands.build.Command._call_compress", Mock())
+def test_handle_sitemap(settings, tmp_path, build_command):
+    _reset_settings(settings, tmp_path)
+
+    create_markdown_file(tmp_path)
+
+    build_command.handle(force=False)
+
+    sitemap_xml = (tmp_path / "output" / "sitemap.xml").read_text()
+    assert "<loc>http://localhost/test-1</loc>" in sitemap_xml
+
+
 @pytest.mark.slow
 @patch("coltrane.management.commands.build.Command._call_collectstatic", Mock())
 @patch("coltrane.management.commands.build.Command._call_compress", Mock())
@@ -288,3 +348,345 @@ def test_handle_generate_rss(
     build_command.handle(force=False)
 
     _generate_rss.assert_called_once()
+
+
+@pytest.mark.slow
+@patch("coltrane.management.commands.build.Command._call_collectstatic", Mock())
+@patch("coltrane.management.commands.build.Command._call_compress", Mock())
+def test_handle_template_error_for_each_path(settings, tmp_path, build_command):
+    _reset_settings(settings, tmp_path)
+
+    # Force debug to be true to surface template error
+    settings.DEBUG = True
+
+    # Create content files
+    (tmp_path / "content").mkdir()
+    (tmp_path / "content" / "test-1.md").write_text("{{sadf}}")
+    (tmp_path / "content" / "test-2.md").write_text("{{qwer}}")
+    (tmp_path / "content" / "test-3.md").write_text("# test 3")
+
+    build_command.handle(ignore=True, threads=3)
+
+    assert len(build_command.errors) == 2
+    assert any("test-1.md" in error for error in build_command.errors)
+    assert any("test-2.md" in error for error in build_command.errors)
+    assert build_command.output_result_counts.create_count == 3
+
+
+@pytest.mark.slow
+@patch("coltrane.management.commands.build.Command._call_collectstatic", Mock())
+@patch("coltrane.management.commands.build.Command._call_compress", Mock())
+def test_handle_processes(settings, tmp_path, build_command):
+    _reset_settings(settings, tmp_path)
+
+    # Create content files
+    (tmp_path / "content").mkdir()
+    (tmp_path / "content" / "test-1.md").write_text("# test 1")
+    (tmp_path / "content" / "test-2.md").write_text("# test 2")
+
+    build_command.handle(processes=2)
+
+    assert build_command.processes_count == 2
+    assert build_command.output_result_counts.create_count == 2
+    assert (tmp_path / "output" / "test-1" / "index.html").exists()
+    assert (tmp_path / "output" / "test-2" / "index.html").exists()
+
+    output_json = json.loads((tmp_path / "output.json").read_text())
+    assert "test-1.md" in output_json
+    assert "test-2.md" in output_json
+
+
+@pytest.mark.slow
+@patch("coltrane.management.commands.build.Command._call_collectstatic", Mock())
+@patch("coltrane.management.commands.build.Command._call_compress", Mock())
+def test_handle_processes_spawn(settings, tmp_path, build_command):
+    _reset_settings(settings, tmp_path)
+
+    # Create content files
+    (tmp_path / "content").mkdir()
+    (tmp_path / "content" / "test-1.md").write_text("# test 1")
+    (tmp_path / "content" / "test-2.md").write_text("# test 2")
+
+    # Spawned processes don't inherit anything, so Django gets configured with the settings of this process
+    build_command.process_start_method = "spawn"
+    build_command.handle(processes=2)
+
+    assert build_command.errors == []
+    assert build_command.output_result_counts.create_count == 2
+    assert '<h1 id="test-1">test 1</h1>' in (tmp_path / "output" / "test-1" / "index.html").read_text()
+    assert (tmp_path / "output" / "test-2" / "index.html").exists()
+
+
+@pytest.mark.slow
+@patch("coltrane.management.commands.build.Command._call_collectstatic", Mock())
+@patch("coltrane.management.commands.build.Command._call_compress", Mock())
+def test_handle_processes_template_error(settings, tmp_path, build_command):
+    _reset_settings(settings, tmp_path)
+
+    # Force debug to be true to surface template error
+    settings.DEBUG = True
+
+    # Create content file
+    (tmp_path / "content").mkdir()
+    (tmp_path / "content" / "test-1.md").write_text("{{sadf}}")
+
+    build_command.handle(processes=2, ignore=True)
+
+    assert len(build_command.errors) == 1
+    assert "'sadf' does not exist in template context. Available top level variables:" in build_command.errors[0]
+
+
+def _set_mtime(path, mtime):
+    os.utime(path, (mtime, mtime))
+
+
+@pytest.mark.slow
+@patch("coltrane.management.commands.build.Command._call_collectstatic", Mock())
+@patch("coltrane.management.commands.build.Command._call_compress", Mock())
+def test_handle_update_because_include_changed(settings, tmp_path, build_command):
+    _reset_settings(settings, tmp_path)
+    settings.TEMPLATES = deepcopy(get_config(base_dir=tmp_path).get_templates_settings())
+
+    (tmp_path / "templates").mkdir()
+    partial = tmp_path / "templates" / "_partial.html"
+    partial.write_text("partial 1")
+    _set_mtime(partial, 1)
+
+    (tmp_path / "content").mkdir()
+    (tmp_path / "content" / "test-1.md").write_text("{% include '_partial.html' %}")
+    (tmp_path / "content" / "test-2.md").write_text("# test 2")
+
+    build_command.handle(force=False)
+    assert build_command.output_result_counts.create_count == 2
+
+    # Rebuild without any changes
+    build_command.handle(force=False)
+    assert build_command.output_result_counts.skip_count == 2
+
+    # Change the partial that only test-1.md uses
+    partial.write_text("partial 2")
+    _set_mtime(partial, 2)
+
+    # Clear the cached template loader like a new build process would
+    reset_loaders()
+
+    build_command.handle(force=False)
+    assert build_command.output_result_counts.update_count == 1
+    assert build_command.output_result_counts.skip_count == 1
+    assert "partial 2" in (tmp_path / "output" / "test-1" / "index.html").read_text()
+
+
+@pytest.mark.slow
+@patch("coltrane.management.commands.build.Command._call_collectstatic", Mock())
+@patch("coltrane.management.commands.build.Command._call_compress", Mock())
+def test_handle_update_because_data_changed(settings, tmp_path, build_command):
+    _reset_settings(settings, tmp_path)
+
+    (tmp_path / "data").mkdir()
+    (tmp_path / "data" / "one.json").write_text('{"answer": 1}')
+    (tmp_path / "data" / "two.json").write_text('{"answer": 2}')
+
+    (tmp_path / "content").mkdir()
+    (tmp_path / "content" / "test-1.md").write_text("{{ data.one.answer }}")
+    (tmp_path / "content" / "test-2.md").write_text("{{ data.two.answer }}")
+
+    build_command.handle(force=False)
+    assert build_command.output_result_counts.create_count == 2
+
+    # Change the data that only test-1.md uses
+    (tmp_path / "data" / "one.json").write_text('{"answer": 11}')
+
+    build_command.handle(force=False)
+    assert build_command.output_result_counts.update_count == 1
+    assert build_command.output_result_counts.skip_count == 1
+    assert "11" in (tmp_path / "output" / "test-1" / "index.html").read_text()
+
+
+@pytest.mark.slow
+@patch("coltrane.management.commands.build.Command._call_collectstatic", Mock())
+@patch("coltrane.management.commands.build.Command._call_compress", Mock())
+def test_handle_update_because_directory_contents_changed(settings, tmp_path, build_command):
+    _reset_settings(settings, tmp_path)
+
+    (tmp_path / "content" / "blog").mkdir(parents=True)
+    (tmp_path / "content" / "index.md").write_text(
+        "{% directory_contents 'blog' as posts %}{% for post in posts %}{{ post.slug }} {% endfor %}"
+    )
+    (tmp_path / "content" / "blog" / "post-1.md").write_text("# post 1")
+
+    build_command.handle(force=False)
+    assert build_command.output_result_counts.create_count == 2
+
+    # Add a new file to the directory that index.md lists
+    (tmp_path / "content" / "blog" / "post-2.md").write_text("# post 2")
+
+    build_command.handle(force=False)
+    assert build_command.output_result_counts.create_count == 1
+    assert build_command.output_result_counts.update_count == 1
+    assert build_command.output_result_counts.skip_count == 1
+    assert "blog/post-2" in (tmp_path / "output" / "index.html").read_text()
+
+
+@pytest.mark.slow
+@patch("coltrane.management.commands.build.Command._call_collectstatic", Mock())
+@patch("coltrane.management.commands.build.Command._call_compress", Mock())
+def test_handle_paginated_directory(settings, tmp_path, build_command):
+    _reset_settings(settings, tmp_path)
+
+    (tmp_path / "content" / "blog").mkdir(parents=True)
+    (tmp_path / "content" / "blog" / "index.md").write_text(
+        "{% paginate_directory order_by='slug' per_page=2 as page %}{% for post in page %}{{ post.slug }} {% endfor %}"
+    )
+
+    for idx in range(1, 6):
+        (tmp_path / "content" / "blog" / f"post-{idx}.md").write_text(f"# post {idx}")
+
+    build_command.handle(force=False, precompress=True)
+
+    assert "blog/post-1 blog/post-2" in (tmp_path / "output" / "blog" / "index.html").read_text()
+    assert "blog/post-3 blog/post-4" in (tmp_path / "output" / "blog" / "page" / "2" / "index.html").read_text()
+    assert "blog/post-5" in (tmp_path / "output" / "blog" / "page" / "3" / "index.html").read_text()
+    assert (tmp_path / "output" / "blog" / "page" / "3" / "index.html.gz").exists()
+
+    sitemap = (tmp_path / "output" / "sitemap.xml").read_text()
+    assert "/blog/page/2/</loc>" in sitemap
+    assert "/blog/page/3/</loc>" in sitemap
+
+    # Remove posts so that there are fewer pages
+    (tmp_path / "content" / "blog" / "post-4.md").unlink()
+    (tmp_path / "content" / "blog" / "post-5.md").unlink()
+
+    build_command.handle(force=False, precompress=True)
+
+    assert (tmp_path / "output" / "blog" / "page" / "2" / "index.html").exists()
+    assert not (tmp_path / "output" / "blog" / "page" / "3" / "index.html").exists()
+    assert list((tmp_path / "output" / "blog" / "page" / "3").iterdir()) == []
+
+    sitemap = (tmp_path / "output" / "sitemap.xml").read_text()
+    assert "/blog/page/2/</loc>" in sitemap
+    assert "/blog/page/3/</loc>" not in sitemap
+
+
+@pytest.mark.slow
+@patch("coltrane.management.commands.build.Command._load_manifest", spec=Manifest)
+@patch("coltrane.management.commands.build.Command._call_collectstatic", Mock())
+@patch("coltrane.management.commands.build.Command._call_compress", Mock())
+def test_handle_static_files_changed_is_not_force_with_dependencies(_load_manifest, settings, tmp_path, build_command):
+    _reset_settings(settings, tmp_path)
+
+    # Create content directory
+    (tmp_path / "content").mkdir()
+
+    _load_manifest.return_value.static_files_manifest_changed = True
+    _load_manifest.return_value.has_items_without_dependencies = False
+
+    build_command.handle(force=False)
+
+    assert build_command.is_force is False
+
+
+def _write_staticfiles_json(tmp_path, paths):
+    (tmp_path / "output" / "static").mkdir(parents=True, exist_ok=True)
+    (tmp_path / "output" / "static" / "staticfiles.json").write_text(json.dumps({"paths": paths, "version": "1.1"}))
+
+
+@pytest.mark.slow
+@patch("coltrane.management.commands.build.Command._call_collectstatic", Mock())
+@patch("coltrane.management.commands.build.Command._call_compress", Mock())
+def test_handle_update_because_static_file_changed(settings, tmp_path, build_command):
+    _reset_settings(settings, tmp_path)
+
+    _write_staticfiles_json(
+        tmp_path, {"static/css/one.css": "static/css/one.1.css", "static/css/two.css": "static/css/two.1.css"}
+    )
+
+    (tmp_path / "content").mkdir()
+    (tmp_path / "content" / "test-1.md").write_text("{% static 'css/one.css' %}")
+    (tmp_path / "content" / "test-2.md").write_text("{% static 'css/two.css' %}")
+
+    build_command.handle(force=False)
+    assert build_command.output_result_counts.create_count == 2
+
+    # Change the hash of the static file that only test-1.md uses
+    _write_staticfiles_json(
+        tmp_path, {"static/css/one.css": "static/css/one.2.css", "static/css/two.css": "static/css/two.1.css"}
+    )
+
+    build_command.handle(force=False)
+    assert build_command.is_force is False
+    assert build_command.output_result_counts.update_count == 1
+    assert build_command.output_result_counts.skip_count == 1
+
+
+@pytest.mark.slow
+@patch("coltrane.management.commands.build.Command._call_collectstatic", Mock())
+@patch("coltrane.management.commands.build.Command._call_compress", Mock())
+def test_handle_precompress(settings, tmp_path, build_command):
+    _reset_settings(settings, tmp_path)
+
+    create_markdown_file(tmp_path)
+
+    build_command.handle(force=False, precompress=True)
+
+    html_path = tmp_path / "output" / "test-1" / "index.html"
+    assert (tmp_path / "output" / "test-1" / "index.html.gz").exists()
+    assert (tmp_path / "output" / "test-1" / "index.html.br").exists()
+    assert (tmp_path / "output" / "test-1" / "index.html.zst").exists()
+    assert (tmp_path / "output" / "sitemap.xml.gz").exists()
+    assert (tmp_path / "output" / "rss.xml.gz").exists()
+
+    # Compressed files are only written again when the HTML changes
+    gzip_mtime_ns = (tmp_path / "output" / "test-1" / "index.html.gz").stat().st_mtime_ns
+    os.utime(html_path, ns=(gzip_mtime_ns - 1_000_000_000, gzip_mtime_ns - 1_000_000_000))
+
+    build_command.handle(force=False, precompress=True)
+
+    assert (tmp_path / "output" / "test-1" / "index.html.gz").stat().st_mtime_ns == gzip_mtime_ns
+
+
+@pytest.mark.slow
+@patch("coltrane.management.commands.build.Command._call_collectstatic", Mock())
+@patch("coltrane.management.commands.build.Command._call_compress", Mock())
+def test_handle_no_precompress(settings, tmp_path, build_command):
+    _reset_settings(settings, tmp_path)
+
+    create_markdown_file(tmp_path)
+
+    build_command.handle(force=False)
+
+    assert (tmp_path / "output" / "test-1" / "index.html").exists()
+    assert not (tmp_path / "output" / "test-1" / "index.html.gz").exists()
+
+
+@pytest.mark.slow
+@patch("coltrane.management.commands.build.Command._call_collectstatic", Mock())
+@patch("coltrane.management.commands.build.Command._call_compress", Mock())
+@pytest.mark.parametrize("options", [{"threads": 2}, {"processes": 2}])
+def test_handle_rebuild_after_ignored_error(settings, tmp_path, build_command, options):
+    _reset_settings(settings, tmp_path)
+
+    (tmp_path / "data").mkdir()
+    (tmp_path / "data" / "one.json").write_text('{"answer": 1}')
+
+    (tmp_path / "content").mkdir()
+    (tmp_path / "content" / "test-1.md").write_text("{{ data.one.answer }}")
+    (tmp_path / "content" / "test-2.md").write_text("# test 2")
+
+    build_command.handle(force=False, **options)
+    assert build_command.output_result_counts.create_count == 2
+
+    # Change the data that test-1.md uses, but fail to render it and ignore the error
+    (tmp_path / "data" / "one.json").write_text('{"answer": 11}')
+
+    with patch("coltrane.management.commands.build._write_html", side_effect=Exception("broken")):
+        build_command.handle(force=False, ignore=True, **options)
+
+    assert len(build_command.errors) == 1
+    assert "test-1.md" not in json.loads((tmp_path / "output.json").read_text())
+
+    # The failed file gets rendered again even though nothing changed since the failed build
+    build_command.handle(force=False, **options)
+    assert build_command.errors == []
+    assert build_command.output_result_counts.create_count == 1
+    assert build_command.output_result_counts.skip_count == 1
+    assert "11" in (tmp_path / "output" / "test-1" / "index.html").read_text()
@@ -0,0 +1,97 @@
+import os
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import patch
+
+from coltrane.metadata import MetadataIndex
+
+
+def test_metadata_index_get(tmp_path: Path):
+    path = tmp_path / "test.md"
+    path.write_text(
+        """---
+title: Test
+draft: "1"
+publish_date: 2024-01-02
+---
+"""
+    )
+
+    actual = MetadataIndex().get(path)
+
+    assert actual["title"] == "Test"
+    assert actual["draft"] is True
+    assert isinstance(actual["publish_date"], datetime)
+    assert "now" in actual
+
+
+def test_metadata_index_get_cached(tmp_path: Path):
+    path = tmp_path / "test.md"
+    path.write_text("---\ntitle: Test\n---\n")
+
+    metadata_index = MetadataIndex()
+    metadata_index.get(path)
+
+    with patch("coltrane.metadata.read_frontmatter") as read_frontmatter:
+        actual = metadata_index.get(path)
+
+    read_frontmatter.assert_not_called()
+    assert actual["title"] == "Test"
+
+
+def test_metadata_index_get_changed(tmp_path: Path):
+    path = tmp_path / "test.md"
+    path.write_text("---\ntitle: Test\n---\n")
+    os.utime(path, (1, 1))
+
+    metadata_index = MetadataIndex()
+    metadata_index.get(path)
+
+    path.write_text("---\ntitle: Changed\n---\n")
+    os.utime(path, (2, 2))
+
+    actual = metadata_index.get(path)
+
+    assert actual["title"] == "Changed"
+
+
+def test_metadata_index_get_returns_copy(tmp_path: Path):
+    path = tmp_path / "test.md"
+    path.write_text("---\ntitle: Test\n---\n")
+
+    metadata_index = MetadataIndex()
+    metadata_index.get(path)["title"] = "Changed"
+
+    actual = metadata_index.get(path)
+
+    assert actual["title"] == "Test"
+
+
+def test_metadata_index_get_metadata_cache(settings, tmp_path: Path):
+    settings.COLTRANE = {"METADATA_CACHE": {"SECONDS": 15}}
+    settings.CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": str(tmp_path),
+        }
+    }
+
+    path = tmp_path / "test.md"
+    path.write_text("---\ntitle: Test\n---\n")
+
+    MetadataIndex().get(path)
+
+    # A new index, i.e. in another process, gets the metadata from the cache
+    with patch("coltrane.metadata.read_frontmatter") as read_frontmatter:
+        actual = MetadataIndex().get(path)
+
+    read_frontmatter.assert_not_called()
+    assert actual["title"] == "Test"
+
+    # Changing the file changes the cache key
+    path.write_text("---\ntitle: Changed\n---\n")
+    os.utime(path, (1, 1))
+
+    actual = MetadataIndex().get(path)
+
+    assert actual["title"] == "Changed"
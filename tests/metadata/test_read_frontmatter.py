@@ -0,0 +1,82 @@
+from pathlib import Path
+
+from coltrane.metadata import read_frontmatter
+
+
+def test_read_frontmatter(tmp_path: Path):
+    path = tmp_path / "test.md"
+    path.write_text(
+        """---
+title: Test
+tags:
+  - one
+---
+
+# Test
+"""
+    )
+
+    expected = {"title": "Test", "tags": ["one"]}
+    actual = read_frontmatter(path)
+
+    assert actual == expected
+
+
+def test_read_frontmatter_leading_whitespace(tmp_path: Path):
+    path = tmp_path / "test.md"
+    path.write_text(
+        """
+
+---
+title: Test
+---
+"""
+    )
+
+    expected = {"title": "Test"}
+    actual = read_frontmatter(path)
+
+    assert actual == expected
+
+
+def test_read_frontmatter_missing(tmp_path: Path):
+    path = tmp_path / "test.md"
+    path.write_text("# Test")
+
+    actual = read_frontmatter(path)
+
+    assert actual == {}
+
+
+def test_read_frontmatter_unclosed(tmp_path: Path):
+    path = tmp_path / "test.md"
+    path.write_text(
+        """---
+title: Test
+"""
+    )
+
+    actual = read_frontmatter(path)
+
+    assert actual == {}
+
+
+def test_read_frontmatter_with_horizontal_rule_in_content(tmp_path: Path):
+    path = tmp_path / "test.md"
+    path.write_text(
+        """---
+title: Test
+---
+
+# Test
+
+---
+
+more: content
+"""
+    )
+
+    expected = {"title": "Test"}
+    actual = read_frontmatter(path)
+
+    assert actual == expected
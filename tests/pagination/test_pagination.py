@@ -0,0 +1,84 @@
+from pathlib import Path
+
+import pytest
+from django.core.paginator import EmptyPage
+
+from coltrane.directory_index import DirectoryIndex
+from coltrane.pagination import DirectoryItems, DirectoryPaginator, get_page_path, parse_page_path
+
+
+@pytest.mark.parametrize(
+    ("path", "expected"),
+    [
+        ("/blog/page/2/", ("/blog/", 2)),
+        ("/blog/page/2", ("/blog/", 2)),
+        ("blog/page/2", ("/blog/", 2)),
+        ("/page/3/", ("/", 3)),
+        ("/blog/2022/page/10/", ("/blog/2022/", 10)),
+        ("/blog/", ("/blog/", None)),
+        ("/blog", ("/blog/", None)),
+        ("/", ("/", None)),
+        ("/frontpage/2/", ("/frontpage/2/", None)),
+        ("/blog/page/two/", ("/blog/page/two/", None)),
+    ],
+)
+def test_parse_page_path(path, expected):
+    assert parse_page_path(path) == expected
+
+
+def test_get_page_path():
+    assert get_page_path("/blog/", 1) == "/blog/"
+    assert get_page_path("/blog/", 2) == "/blog/page/2/"
+    assert get_page_path("/blog", 3) == "/blog/page/3/"
+    assert get_page_path("/", 2) == "/page/2/"
+
+
+@pytest.fixture
+def entry(tmp_path: Path):
+    directory = tmp_path / "content" / "posts"
+    directory.mkdir(parents=True)
+
+    for idx in range(1, 6):
+        (directory / f"post-{idx}.md").write_text(f"---\ntitle: Post {idx}\n---\n")
+
+    return DirectoryIndex().get(directory, "posts")
+
+
+def test_directory_items(entry):
+    items = DirectoryItems(entry, order_by="-title", exclude={"posts/post-4"})
+
+    assert len(items) == 4
+    assert [item["slug"] for item in items[1:3]] == ["posts/post-3", "posts/post-2"]
+    assert items[0]["slug"] == "posts/post-5"
+
+
+def test_directory_paginator(entry):
+    paginator = DirectoryPaginator(DirectoryItems(entry, order_by="title"), per_page=2, path="/blog/")
+
+    assert paginator.num_pages == 3
+
+    page = paginator.page(2)
+
+    assert [item["slug"] for item in page] == ["posts/post-3", "posts/post-4"]
+    assert page.url == "/blog/page/2/"
+    assert page.previous_url == "/blog/"
+    assert page.next_url == "/blog/page/3/"
+
+    last_page = paginator.page(3)
+
+    assert [item["slug"] for item in last_page] == ["posts/post-5"]
+    assert last_page.next_url is None
+
+
+def test_directory_paginator_first_page(entry):
+    page = DirectoryPaginator(DirectoryItems(entry), per_page=10).page(1)
+
+    assert len(page) == 5
+    assert page.url == "/"
+    assert page.previous_url is None
+    assert page.next_url is None
+
+
+def test_directory_paginator_empty_page(entry):
+    with pytest.raises(EmptyPage):
+        DirectoryPaginator(DirectoryItems(entry), per_page=10).page(2)
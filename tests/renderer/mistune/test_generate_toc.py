@@ -292,3 +292,54 @@ def test_compare_toc(text, expected):
     actual = metadata["toc"]
 
     eq(actual, expected)
+
+
+def test_toc_disabled_in_frontmatter():
+    markdown_renderer = MistuneMarkdownRenderer()
+
+    (content, metadata) = markdown_renderer.render_markdown_text(
+        """---
+toc: false
+---
+
+# first header
+"""
+    )
+
+    assert metadata["toc"] is None
+    assert content == '<h1 id="first-header">first header</h1>\n'
+
+
+def test_toc_without_headings():
+    markdown_renderer = MistuneMarkdownRenderer()
+
+    (_, metadata) = markdown_renderer.render_markdown_text("more stuff here")
+
+    assert metadata["toc"] is None
+
+
+def test_toc_heading_ids():
+    markdown_renderer = MistuneMarkdownRenderer()
+
+    (content, metadata) = markdown_renderer.render_markdown_text(
+        """
+# Tom & Jerry
+
+## "Quoted" header
+"""
+    )
+
+    assert content == '<h1 id="tom-jerry">Tom &amp; Jerry</h1>\n<h2 id="quoted-header">"Quoted" header</h2>\n'
+    eq(
+        metadata["toc"],
+        """
+<ul>
+  <li>
+    <a href="#tom-jerry">Tom & Jerry</a>
+    <ul>
+      <li><a href="#quoted-header">"Quoted" header</a></li>
+    </ul>
+  </li>
+</ul>
+""",
+    )
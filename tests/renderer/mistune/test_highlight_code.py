@@ -0,0 +1,72 @@
+from unittest.mock import patch
+
+import pytest
+
+from coltrane.config.cache import HighlightCache
+from coltrane.renderer import _highlight_code
+
+
+@pytest.fixture(autouse=True)
+def clear_highlighted_code():
+    _highlight_code.cache_clear()
+
+    yield
+
+    _highlight_code.cache_clear()
+
+
+@pytest.fixture
+def highlight_cache(settings):
+    settings.CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "test-highlight-code",
+        }
+    }
+    settings.COLTRANE["HIGHLIGHT_CACHE"] = {"SECONDS": 60}
+
+    highlight_cache = HighlightCache()
+    highlight_cache.cache.clear()
+
+    return highlight_cache
+
+
+def test_highlight_code():
+    actual = _highlight_code("pass", "python")
+
+    assert actual == '<div class="codehilite"><pre><span></span><span class="k">pass</span>\n</pre></div>\n'
+
+
+def test_highlight_code_invalid_language():
+    assert _highlight_code("pass", "not-a-real-language") is None
+
+
+@patch("coltrane.renderer._color_with_pygments", return_value="<pre>pass</pre>")
+def test_highlight_code_is_only_highlighted_once(_color_with_pygments):
+    _highlight_code("pass", "python")
+    _highlight_code("pass", "python")
+
+    _color_with_pygments.assert_called_once()
+
+
+@patch("coltrane.renderer._color_with_pygments", return_value="<pre>pass</pre>")
+def test_highlight_code_uses_highlight_cache(_color_with_pygments, highlight_cache):
+    _highlight_code("pass", "python")
+
+    # Clear the in-memory cache to act like the next build
+    _highlight_code.cache_clear()
+
+    actual = _highlight_code("pass", "python")
+
+    assert actual == "<pre>pass</pre>"
+    _color_with_pygments.assert_called_once()
+    assert highlight_cache.cache.get(highlight_cache.get_cache_key("pass", "python")) == "<pre>pass</pre>"
+
+
+@patch("coltrane.renderer._color_with_pygments", return_value="<pre>pass</pre>")
+def test_highlight_code_without_highlight_cache(_color_with_pygments):
+    _highlight_code("pass", "python")
+    _highlight_code.cache_clear()
+    _highlight_code("pass", "python")
+
+    assert _color_with_pygments.call_count == 2
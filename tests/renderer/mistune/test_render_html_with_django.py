@@ -0,0 +1,30 @@
+from unittest.mock import patch
+
+import pytest
+from django.template import engines
+
+from coltrane.renderer import MistuneMarkdownRenderer, _compile_template
+
+
+@pytest.fixture
+def markdown_renderer():
+    return MistuneMarkdownRenderer()
+
+
+def test_render_html_with_django(markdown_renderer):
+    expected = "<p>test data</p>"
+    actual = markdown_renderer.render_html_with_django("<p>{{ text }}</p>", {"text": "test data"})
+
+    assert actual == expected
+
+
+def test_render_html_with_django_compiled_template_cached(markdown_renderer):
+    _compile_template.cache_clear()
+
+    with patch.object(engines["django"], "from_string", wraps=engines["django"].from_string) as from_string:
+        first = markdown_renderer.render_html_with_django("<p>{{ text }}</p>", {"text": "first"})
+        second = markdown_renderer.render_html_with_django("<p>{{ text }}</p>", {"text": "second"})
+
+    assert first == "<p>first</p>"
+    assert second == "<p>second</p>"
+    from_string.assert_called_once()
@@ -0,0 +1,60 @@
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from coltrane.renderer import MistuneMarkdownRenderer
+
+
+@pytest.fixture
+def markdown_renderer():
+    return MistuneMarkdownRenderer()
+
+
+@pytest.fixture
+def markdown_cache(settings):
+    settings.CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "test-render-markdown-path",
+        }
+    }
+    settings.COLTRANE["MARKDOWN_CACHE"] = {"SECONDS": 60}
+
+
+def test_render_markdown_path(markdown_renderer, tmp_path: Path):
+    path = tmp_path / "test.md"
+    path.write_text("# test")
+
+    (actual, metadata) = markdown_renderer.render_markdown_path(path)
+
+    assert actual == '<h1 id="test">test</h1>\n'
+    assert "now" in metadata
+
+
+@pytest.mark.usefixtures("markdown_cache")
+def test_render_markdown_path_cached(markdown_renderer, tmp_path: Path):
+    path = tmp_path / "test-cached.md"
+    path.write_text("# test")
+
+    (expected, _) = markdown_renderer.render_markdown_path(path)
+
+    with patch.object(markdown_renderer, "render_markdown_text") as render_markdown_text:
+        (actual, metadata) = markdown_renderer.render_markdown_path(path)
+
+    render_markdown_text.assert_not_called()
+    assert actual == expected
+    assert "now" in metadata
+
+
+@pytest.mark.usefixtures("markdown_cache")
+def test_render_markdown_path_cache_invalidated_when_changed(markdown_renderer, tmp_path: Path):
+    path = tmp_path / "test-changed.md"
+    path.write_text("# test")
+
+    markdown_renderer.render_markdown_path(path)
+
+    path.write_text("# changed test")
+    (actual, _) = markdown_renderer.render_markdown_path(path)
+
+    assert actual == '<h1 id="changed-test">changed test</h1>\n'
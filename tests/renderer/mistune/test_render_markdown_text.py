@@ -206,3 +206,139 @@ def test_render_img_with_django_template_language_with_kwarg(markdown_renderer):
 """
 
     assert actual == expected
+
+
+def test_render_img_with_django_template_language_does_not_change_other_text(markdown_renderer):
+    markdown_content = """
+![image]({% static "images/test.jpg" %})
+
+"images/test.jpg" is the image.
+"""
+
+    (actual, _) = markdown_renderer.render_markdown_text(markdown_content)
+    expected = """<p><img src="{% static 'images/test.jpg' %}" alt="image"/></p>
+<p>"images/test.jpg" is the image.</p>
+"""
+
+    assert actual == expected
+
+
+def test_render_href_with_django_template_language_in_path(markdown_renderer):
+    markdown_content = """
+[post](/blog/{{slug}}/)
+"""
+
+    (actual, _) = markdown_renderer.render_markdown_text(markdown_content)
+    expected = """<p><a href="/blog/{{slug}}/">post</a></p>
+"""
+
+    assert actual == expected
+
+
+def test_render_text_with_percent_encoding(markdown_renderer):
+    markdown_content = """
+Use %20 for a space.
+"""
+
+    (actual, _) = markdown_renderer.render_markdown_text(markdown_content)
+    expected = """<p>Use %20 for a space.</p>
+"""
+
+    assert actual == expected
+
+
+def test_render_code_fence_with_django_template_language_in_parenthesis(markdown_renderer):
+    markdown_content = """
+```
+print({{ variable }})
+```
+"""
+
+    (actual, _) = markdown_renderer.render_markdown_text(markdown_content)
+    expected = """{% verbatim %}<code><pre>print({{ variable }})
+</pre></code>{% endverbatim %}
+"""
+
+    assert actual == expected
+
+
+def test_render_markdown_text_keeps_text_escaped(markdown_renderer):
+    markdown_content = """
+1 < 2 & "3" > 2
+"""
+
+    (actual, _) = markdown_renderer.render_markdown_text(markdown_content)
+    expected = """<p>1 &lt; 2 &amp; "3" &gt; 2</p>
+"""
+
+    assert actual == expected
+
+
+def test_render_markdown_text_inline_html(markdown_renderer):
+    markdown_content = """
+Some <b>bold</b> text
+"""
+
+    (actual, _) = markdown_renderer.render_markdown_text(markdown_content)
+    expected = """<p>Some <b>bold</b> text</p>
+"""
+
+    assert actual == expected
+
+
+def test_render_markdown_text_block_html(markdown_renderer):
+    markdown_content = """
+<div class="note">raw block</div>
+
+after
+"""
+
+    (actual, _) = markdown_renderer.render_markdown_text(markdown_content)
+    expected = """<div class="note">raw block</div>
+
+<p>after</p>
+"""
+
+    assert actual == expected
+
+
+def test_render_markdown_text_entities(markdown_renderer):
+    markdown_content = """
+text &amp; more &copy; 2024
+"""
+
+    (actual, _) = markdown_renderer.render_markdown_text(markdown_content)
+    expected = """<p>text &amp; more &copy; 2024</p>
+"""
+
+    assert actual == expected
+
+
+def test_render_markdown_text_toc_unescapes_heading_text(markdown_renderer):
+    markdown_content = """
+# A & B
+"""
+
+    (actual, metadata) = markdown_renderer.render_markdown_text(markdown_content)
+    expected = """<h1 id="a-b">A &amp; B</h1>
+"""
+
+    assert actual == expected
+    assert metadata["toc"] == '<ul><li><a href="#a-b">A & B</a></li></ul>'
+
+
+def test_render_markdown_text_line_break_and_thematic_break(markdown_renderer):
+    markdown_content = """
+line  
+break
+
+---
+"""  # noqa: W291
+
+    (actual, _) = markdown_renderer.render_markdown_text(markdown_content)
+    expected = """<p>line<br/>
+break</p>
+<hr/>
+"""
+
+    assert actual == expected
@@ -0,0 +1,35 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from coltrane.renderer import MarkdownRenderer, MistuneMarkdownRenderer
+
+
+def test_instance():
+    actual = MarkdownRenderer.instance()
+
+    assert isinstance(actual, MistuneMarkdownRenderer)
+
+
+def test_instance_is_the_same_in_a_thread():
+    assert MarkdownRenderer.instance() is MarkdownRenderer.instance()
+
+
+def test_instance_is_different_in_each_thread():
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        other_thread_instance = executor.submit(MarkdownRenderer.instance).result()
+
+    assert other_thread_instance is not MarkdownRenderer.instance()
+
+
+def test_instance_renders_concurrently():
+    texts = [f"# Header {idx}\n\n## Sub-header {idx}\n\n[link]({{{{ url_{idx} }}}})\n" for idx in range(200)]
+
+    def _render(text):
+        return MarkdownRenderer.instance().render_markdown_text(text)
+
+    expected = [MistuneMarkdownRenderer().render_markdown_text(text) for text in texts]
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        actual = list(executor.map(_render, texts))
+
+    assert [content for (content, _) in actual] == [content for (content, _) in expected]
+    assert [metadata["toc"] for (_, metadata) in actual] == [metadata["toc"] for (_, metadata) in expected]
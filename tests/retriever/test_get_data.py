@@ -1,9 +1,13 @@
 from pathlib import Path
 
+import pytest
+
 from coltrane.config.coltrane import Site
 from coltrane.retriever import get_data
 from tests.fixtures import *  # noqa: F403
 
+pytestmark = pytest.mark.filterwarnings("ignore::DeprecationWarning")
+
 
 def test_get_data_directory(settings, tmp_path: Path, default_site: Site):
     settings.BASE_DIR = tmp_path
@@ -119,3 +123,32 @@ def test_get_data_directory_with_non_json_file(settings, tmp_path: Path, default
     actual = get_data(site=default_site)
 
     assert actual == expected
+
+
+def test_get_data_is_deprecated(settings, tmp_path: Path, default_site: Site):
+    settings.BASE_DIR = tmp_path
+
+    with pytest.warns(DeprecationWarning, match="get_lazy_data"):
+        get_data(site=default_site)
+
+
+def test_get_data_cache(settings, tmp_path: Path, default_site: Site):
+    settings.BASE_DIR = tmp_path
+    settings.COLTRANE = {"DATA_CACHE": {"SECONDS": 15}}
+    settings.CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": str(tmp_path),
+        }
+    }
+
+    (tmp_path / "data").mkdir()
+    (tmp_path / "data" / "test.json").write_text('{"sample":1}')
+
+    expected = get_data(site=default_site)
+
+    (tmp_path / "data" / "test.json").write_text('{"sample":2}')
+
+    actual = get_data(site=default_site)
+
+    assert actual == expected
@@ -1,5 +1,7 @@
 from pathlib import Path
 
+import pytest
+
 from coltrane.sitemaps import ContentSitemap
 
 
@@ -34,3 +36,25 @@ def test_location_index(settings, tmp_path: Path):
     actual = ContentSitemap().location(items[0])
 
     assert actual == ""
+
+
+def test_lastmod_publish_date(settings, tmp_path: Path):
+    settings.BASE_DIR = tmp_path
+    (tmp_path / "content").mkdir()
+    (tmp_path / "content/test.md").write_text("---\npublish_date: 2022-02-26 10:26:02\n---\n")
+
+    items = ContentSitemap().items()
+    actual = ContentSitemap().lastmod(items[0])
+
+    assert actual.strftime("%Y-%m-%d %H:%M:%S") == "2022-02-26 10:26:02"
+
+
+def test_lastmod_file(settings, tmp_path: Path):
+    settings.BASE_DIR = tmp_path
+    (tmp_path / "content").mkdir()
+    (tmp_path / "content/test.md").write_text("test data")
+
+    items = ContentSitemap().items()
+    actual = ContentSitemap().lastmod(items[0])
+
+    assert actual.timestamp() == pytest.approx((tmp_path / "content/test.md").stat().st_mtime)
@@ -0,0 +1,134 @@
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+from coltrane.sitemaps import SitemapUrl, get_sitemap_urls, write_sitemaps
+
+BASE_URL = "https://example.com"
+
+
+def _get_urls(count: int) -> list[SitemapUrl]:
+    return [
+        SitemapUrl(location=f"{BASE_URL}/post-{idx:03}", lastmod=datetime(2024, 1, idx % 28 + 1, tzinfo=timezone.utc))
+        for idx in range(count)
+    ]
+
+
+@pytest.fixture
+def output_directory(tmp_path: Path) -> Path:
+    output_directory = tmp_path / "output"
+    output_directory.mkdir()
+
+    return output_directory
+
+
+def test_write_sitemaps(output_directory: Path):
+    assert write_sitemaps(output_directory, _get_urls(2), BASE_URL) == 1
+
+    actual = (output_directory / "sitemap.xml").read_text()
+
+    assert actual.startswith('<?xml version="1.0" encoding="UTF-8"?>\n<urlset ')
+    assert "<url><loc>https://example.com/post-000</loc><lastmod>2024-01-01</lastmod>" in actual
+    assert "<loc>https://example.com/post-001</loc>" in actual
+    assert not (output_directory / "sitemap-1.xml").exists()
+
+
+def test_write_sitemaps_escapes_locations(output_directory: Path):
+    urls = [SitemapUrl(location=f"{BASE_URL}/a&b", lastmod=datetime(2024, 1, 1, tzinfo=timezone.utc))]
+
+    write_sitemaps(output_directory, urls, BASE_URL)
+
+    assert "<loc>https://example.com/a&amp;b</loc>" in (output_directory / "sitemap.xml").read_text()
+
+
+def test_write_sitemaps_index(output_directory: Path):
+    assert write_sitemaps(output_directory, _get_urls(5), BASE_URL, max_urls=2) == 4
+
+    sitemap_index = (output_directory / "sitemap.xml").read_text()
+
+    assert "<sitemapindex " in sitemap_index
+    assert "<loc>https://example.com/sitemap-1.xml</loc><lastmod>2024-01-02T00:00:00+00:00</lastmod>" in sitemap_index
+    assert "<loc>https://example.com/sitemap-3.xml</loc>" in sitemap_index
+
+    assert (output_directory / "sitemap-1.xml").read_text().count("<url>") == 2
+    assert (output_directory / "sitemap-3.xml").read_text().count("<url>") == 1
+    assert not (output_directory / "sitemap-4.xml").exists()
+
+
+def test_write_sitemaps_only_changed_shards(output_directory: Path):
+    urls = _get_urls(5)
+    write_sitemaps(output_directory, urls, BASE_URL, max_urls=2)
+
+    for path in output_directory.iterdir():
+        os.utime(path, ns=(0, 0))
+
+    # Only the last shard and the index have a different `lastmod`
+    urls[4].lastmod = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+    assert write_sitemaps(output_directory, urls, BASE_URL, max_urls=2) == 2
+    assert (output_directory / "sitemap-1.xml").stat().st_mtime_ns == 0
+    assert (output_directory / "sitemap-2.xml").stat().st_mtime_ns == 0
+    assert (output_directory / "sitemap-3.xml").stat().st_mtime_ns != 0
+    assert "2025-01-01" in (output_directory / "sitemap-3.xml").read_text()
+    assert not list(output_directory.glob(".*.tmp"))
+
+
+def test_write_sitemaps_unchanged(output_directory: Path):
+    write_sitemaps(output_directory, _get_urls(2), BASE_URL)
+
+    assert write_sitemaps(output_directory, _get_urls(2), BASE_URL) == 0
+
+
+def test_write_sitemaps_removes_shards(output_directory: Path):
+    write_sitemaps(output_directory, _get_urls(5), BASE_URL, max_urls=2)
+    (output_directory / "sitemap-3.xml.gz").write_bytes(b"")
+
+    write_sitemaps(output_directory, _get_urls(3), BASE_URL, max_urls=2)
+
+    assert (output_directory / "sitemap-2.xml").exists()
+    assert not (output_directory / "sitemap-3.xml").exists()
+    assert not (output_directory / "sitemap-3.xml.gz").exists()
+
+    write_sitemaps(output_directory, _get_urls(2), BASE_URL, max_urls=2)
+
+    assert "<urlset " in (output_directory / "sitemap.xml").read_text()
+    assert not (output_directory / "sitemap-1.xml").exists()
+
+
+def test_get_sitemap_urls(settings, tmp_path: Path):
+    settings.BASE_DIR = tmp_path
+    (tmp_path / "content" / "blog").mkdir(parents=True)
+    (tmp_path / "content" / "index.md").write_text("index")
+    (tmp_path / "content" / "blog" / "post.md").write_text("---\npublish_date: 2022-02-26\n---\n")
+    (tmp_path / "content" / "blog" / "draft.md").write_text("---\ndraft: true\n---\n")
+
+    actual = get_sitemap_urls(BASE_URL)
+
+    assert [url.location for url in actual] == [BASE_URL, f"{BASE_URL}/blog/post"]
+    assert actual[1].lastmod.date().isoformat() == "2022-02-26"
+    assert actual[0].lastmod.timestamp() == pytest.approx((tmp_path / "content" / "index.md").stat().st_mtime)
+
+
+def test_get_sitemap_urls_pages(settings, tmp_path: Path):
+    settings.BASE_DIR = tmp_path
+    (tmp_path / "content" / "blog").mkdir(parents=True)
+    (tmp_path / "content" / "index.md").write_text("index")
+    (tmp_path / "content" / "blog" / "index.md").write_text("blog")
+
+    output_directory = tmp_path / "output"
+
+    for page_number in (2, 3):
+        (output_directory / "blog" / "page" / str(page_number)).mkdir(parents=True)
+        (output_directory / "blog" / "page" / str(page_number) / "index.html").write_text("page")
+
+    actual = get_sitemap_urls(BASE_URL, output_directory=output_directory)
+
+    assert [url.location for url in actual] == [
+        BASE_URL,
+        f"{BASE_URL}/blog",
+        f"{BASE_URL}/blog/page/2/",
+        f"{BASE_URL}/blog/page/3/",
+    ]
+    assert actual[2].lastmod == actual[1].lastmod
@@ -1,6 +1,7 @@
 from pathlib import Path
-from unittest.mock import ANY
+from unittest.mock import ANY, patch
 
+from django.template import Context, Template
 from django.utils.safestring import SafeString
 
 from coltrane.renderer import StaticRequest
@@ -251,3 +252,82 @@ def test_directory_contents_order_by_reversed(settings, tmp_path: Path):
     actual = directory_contents(context, order_by="-slug")
 
     assert actual == expected
+
+
+def _write_posts(tmp_path: Path) -> None:
+    (tmp_path / "content/posts").mkdir(parents=True)
+
+    for idx in range(1, 6):
+        (tmp_path / f"content/posts/post-{idx}.md").write_text(
+            f"""---
+title: Post {idx}
+publish_date: 2024-01-0{idx}
+---
+
+post {idx}
+"""
+        )
+
+
+def test_directory_contents_limit(settings, tmp_path: Path):
+    settings.BASE_DIR = tmp_path
+    _write_posts(tmp_path)
+
+    context = {"request": StaticRequest("/")}
+    actual = directory_contents(context, directory="posts", order_by="-publish_date", limit=2)
+
+    assert [content["slug"] for content in actual] == ["posts/post-5", "posts/post-4"]
+
+
+def test_directory_contents_offset(settings, tmp_path: Path):
+    settings.BASE_DIR = tmp_path
+    _write_posts(tmp_path)
+
+    context = {"request": StaticRequest("/")}
+    actual = directory_contents(context, directory="posts", order_by="-publish_date", limit=2, offset=2)
+
+    assert [content["slug"] for content in actual] == ["posts/post-3", "posts/post-2"]
+
+
+def test_directory_contents_offset_after_exclude(settings, tmp_path: Path):
+    settings.BASE_DIR = tmp_path
+    _write_posts(tmp_path)
+
+    context = {"request": StaticRequest("/")}
+    actual = directory_contents(context, directory="posts", exclude="posts/post-1", order_by="title", offset=1)
+
+    assert [content["slug"] for content in actual] == ["posts/post-3", "posts/post-4", "posts/post-5"]
+
+
+def test_directory_contents_limit_in_template(settings, tmp_path: Path):
+    settings.BASE_DIR = tmp_path
+    _write_posts(tmp_path)
+
+    template = Template(
+        "{% load coltrane_tags %}{% directory_contents 'posts' order_by='title' limit=3 as posts %}"
+        "{% for post in posts %}{{ post.title }};{% endfor %}"
+    )
+    actual = template.render(Context({"request": StaticRequest("/")}))
+
+    assert actual == "Post 1;Post 2;Post 3;"
+
+
+def test_directory_contents_changed_file(settings, tmp_path: Path):
+    settings.BASE_DIR = tmp_path
+    _write_posts(tmp_path)
+
+    context = {"request": StaticRequest("/")}
+    directory_contents(context, directory="posts")
+
+    (tmp_path / "content/posts/post-1.md").write_text(
+        """---
+title: Changed title
+---
+"""
+    )
+
+    # Changed files are noticed once `FILE_CHECK_SECONDS` have passed
+    with patch("coltrane.directory_index.FILE_CHECK_SECONDS", 0):
+        actual = directory_contents(context, directory="posts", order_by="slug", limit=1)
+
+    assert actual[0]["title"] == "Changed title"
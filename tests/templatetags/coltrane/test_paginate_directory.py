@@ -0,0 +1,81 @@
+from pathlib import Path
+
+import pytest
+from django.http import Http404
+from django.template import Context, Template
+
+from coltrane.pagination import get_page_count
+from coltrane.renderer import StaticRequest
+from coltrane.templatetags.coltrane_tags import paginate_directory
+
+
+def _write_posts(tmp_path: Path, count: int = 5) -> None:
+    (tmp_path / "content/blog").mkdir(parents=True)
+
+    for idx in range(1, count + 1):
+        (tmp_path / f"content/blog/post-{idx}.md").write_text(f"---\ntitle: Post {idx}\n---\n")
+
+
+def test_paginate_directory(settings, tmp_path: Path):
+    settings.BASE_DIR = tmp_path
+    _write_posts(tmp_path)
+
+    request = StaticRequest("/blog/")
+    page = paginate_directory({"request": request}, order_by="title", per_page=2)
+
+    assert page.number == 1
+    assert [item["slug"] for item in page] == ["blog/post-1", "blog/post-2"]
+    assert page.paginator.num_pages == 3
+    assert page.next_url == "/blog/page/2/"
+    assert get_page_count(request) == 3
+
+
+def test_paginate_directory_page_from_path(settings, tmp_path: Path):
+    settings.BASE_DIR = tmp_path
+    _write_posts(tmp_path)
+
+    page = paginate_directory({"request": StaticRequest("/blog/page/3/")}, order_by="title", per_page=2)
+
+    assert page.number == 3
+    assert [item["slug"] for item in page] == ["blog/post-5"]
+    assert page.previous_url == "/blog/page/2/"
+
+
+def test_paginate_directory_explicit_directory(settings, tmp_path: Path):
+    settings.BASE_DIR = tmp_path
+    _write_posts(tmp_path)
+
+    page = paginate_directory({"request": StaticRequest("/page/2/")}, "blog", order_by="-title", per_page=2)
+
+    assert [item["slug"] for item in page] == ["blog/post-3", "blog/post-2"]
+    assert page.previous_url == "/"
+
+
+def test_paginate_directory_explicit_page(settings, tmp_path: Path):
+    settings.BASE_DIR = tmp_path
+    _write_posts(tmp_path)
+
+    page = paginate_directory({"request": StaticRequest("/blog/")}, order_by="title", per_page=2, page=2)
+
+    assert [item["slug"] for item in page] == ["blog/post-3", "blog/post-4"]
+
+
+def test_paginate_directory_missing_page(settings, tmp_path: Path):
+    settings.BASE_DIR = tmp_path
+    _write_posts(tmp_path)
+
+    with pytest.raises(Http404):
+        paginate_directory({"request": StaticRequest("/blog/page/4/")}, per_page=2)
+
+
+def test_paginate_directory_in_template(settings, tmp_path: Path):
+    settings.BASE_DIR = tmp_path
+    _write_posts(tmp_path)
+
+    template = Template(
+        "{% load coltrane_tags %}{% paginate_directory 'blog' order_by='title' per_page=2 as page %}"
+        "{% for post in page %}{{ post.title }};{% endfor %}{{ page.number }}/{{ page.paginator.num_pages }}"
+    )
+    actual = template.render(Context({"request": StaticRequest("/page/2/")}))
+
+    assert actual == "Post 3;Post 4;2/3"
@@ -0,0 +1,88 @@
+from datetime import date, datetime, timezone
+from unittest.mock import patch
+
+import pytest
+from django.utils.timezone import get_current_timezone
+
+from coltrane.utils import _parse_strict_datetime, convert_to_datetime
+
+
+@pytest.fixture(autouse=True)
+def clear_parsed_datetimes():
+    _parse_strict_datetime.cache_clear()
+
+    yield
+
+    _parse_strict_datetime.cache_clear()
+
+
+def test_convert_to_datetime_iso_date():
+    expected = datetime(2022, 2, 26, tzinfo=get_current_timezone())
+    actual = convert_to_datetime("2022-02-26")
+
+    assert actual == expected
+
+
+def test_convert_to_datetime_iso_datetime_with_timezone():
+    expected = datetime(2022, 2, 26, 10, 26, 2, tzinfo=timezone.utc)
+    actual = convert_to_datetime("2022-02-26T10:26:02Z")
+
+    assert actual == expected
+
+
+def test_convert_to_datetime_strict_format():
+    expected = datetime(2022, 2, 26, tzinfo=get_current_timezone())
+    actual = convert_to_datetime("February 26, 2022")
+
+    assert actual == expected
+
+
+@patch("coltrane.utils.dateparser.parse")
+def test_convert_to_datetime_does_not_use_dateparser_for_iso_and_strict_formats(parse):
+    convert_to_datetime("2022-02-26 10:26:02")
+    convert_to_datetime("Feb 26, 2022")
+
+    parse.assert_not_called()
+
+
+def test_convert_to_datetime_falls_back_to_dateparser():
+    expected = datetime(2022, 1, 2, tzinfo=get_current_timezone())
+    actual = convert_to_datetime("01/02/2022")
+
+    assert actual == expected
+
+
+def test_convert_to_datetime_custom_format(settings):
+    settings.COLTRANE = {"PUBLISH_DATE_FORMATS": ["%d.%m.%Y"]}
+
+    with patch("coltrane.utils.dateparser.parse") as parse:
+        actual = convert_to_datetime("26.02.2022")
+
+    parse.assert_not_called()
+    assert actual == datetime(2022, 2, 26, tzinfo=get_current_timezone())
+
+
+def test_convert_to_datetime_is_cached():
+    convert_to_datetime("2022-02-26")
+    convert_to_datetime("2022-02-26")
+
+    assert _parse_strict_datetime.cache_info().hits == 1
+
+
+def test_convert_to_datetime_dateparser_is_not_cached():
+    with patch("coltrane.utils.dateparser.parse", return_value=datetime(2022, 1, 2)) as parse:  # noqa: DTZ001
+        convert_to_datetime("yesterday")
+        convert_to_datetime("yesterday")
+
+    assert parse.call_count == 2
+
+
+def test_convert_to_datetime_invalid_string():
+    assert convert_to_datetime("not a date") is None
+
+
+def test_convert_to_datetime_date():
+    expected = datetime(2022, 2, 26, tzinfo=get_current_timezone())
+    actual = convert_to_datetime(date(2022, 2, 26))
+
+    assert actual == expected
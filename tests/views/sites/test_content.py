@@ -119,6 +119,31 @@ def test_template_with_slash(client, settings, tmp_path: Path):
     assert "Test template 2" == actual
 
 
+def test_template_wildcard(client, settings, tmp_path: Path):
+    _setup_sites_settings(settings, tmp_path)
+
+    (settings.BASE_DIR / "example/templates/blog").mkdir(parents=True)
+    (settings.BASE_DIR / "example/templates/blog/*.html").write_text("Blog wildcard")
+
+    response = _client_get(client, "/blog/some-post")
+
+    assert response.status_code == 200
+
+    actual = response.content.decode()
+    assert "Blog wildcard" == actual
+
+
+def test_template_wildcard_404(client, settings, tmp_path: Path):
+    _setup_sites_settings(settings, tmp_path)
+
+    (settings.BASE_DIR / "example/templates/blog").mkdir(parents=True)
+    (settings.BASE_DIR / "example/templates/blog/*.html").write_text("Blog wildcard")
+
+    response = _client_get(client, "/news/some-post")
+
+    assert response.status_code == 404
+
+
 def test_md_with_template(client, settings, tmp_path: Path):
     _setup_sites_settings(settings, tmp_path)
 
@@ -0,0 +1,93 @@
+import os
+from copy import deepcopy
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from coltrane.config.settings import get_config
+from coltrane.views import NotFoundCache, not_found_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_not_found_cache():
+    not_found_cache.clear()
+
+    yield
+
+    not_found_cache.clear()
+
+
+def _setup_settings(settings, tmp_path: Path) -> None:
+    settings.BASE_DIR = tmp_path
+
+    # Set Django templates settings
+    settings.TEMPLATES = deepcopy(get_config().get_templates_settings())
+
+    (tmp_path / "content").mkdir()
+    (tmp_path / "templates").mkdir()
+
+
+def test_404_is_cached(client, settings, tmp_path: Path):
+    _setup_settings(settings, tmp_path)
+
+    response = client.get("/wp-login.php")
+    assert response.status_code == 404
+
+    with patch("coltrane.views.select_template") as select_template:
+        response = client.get("/wp-login.php")
+
+    assert response.status_code == 404
+    select_template.assert_not_called()
+
+
+def test_404_is_not_cached_in_debug(client, settings, tmp_path: Path):
+    _setup_settings(settings, tmp_path)
+    settings.DEBUG = True
+
+    response = client.get("/test-this")
+    assert response.status_code == 404
+
+    (tmp_path / "templates" / "*.html").write_text("test this")
+
+    # Make sure the last modified time is different even on file systems with a coarse resolution
+    os.utime(tmp_path / "templates", ns=(0, 0))
+
+    response = client.get("/test-this")
+    assert response.status_code == 200
+
+
+def test_404_markdown_added(client, settings, tmp_path: Path):
+    _setup_settings(settings, tmp_path)
+
+    response = client.get("/test-this")
+    assert response.status_code == 404
+
+    (tmp_path / "content" / "test-this.md").write_text("# test this")
+
+    response = client.get("/test-this")
+    assert response.status_code == 200
+
+
+@patch("coltrane.views.monotonic")
+def test_not_found_cache_expires(monotonic):
+    monotonic.return_value = 100
+    cache = NotFoundCache(maxsize=10, seconds=60)
+    cache.add(Path("content"), "test")
+
+    monotonic.return_value = 160
+    assert cache.has(Path("content"), "test")
+
+    monotonic.return_value = 161
+    assert not cache.has(Path("content"), "test")
+
+
+def test_not_found_cache_maxsize():
+    cache = NotFoundCache(maxsize=2, seconds=60)
+    cache.add(Path("content"), "one")
+    cache.add(Path("content"), "two")
+    cache.add(Path("content"), "three")
+
+    assert not cache.has(Path("content"), "one")
+    assert cache.has(Path("content"), "two")
+    assert cache.has(Path("content"), "three")
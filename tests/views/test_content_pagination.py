@@ -0,0 +1,61 @@
+from pathlib import Path
+
+BLOG_INDEX = """{% paginate_directory order_by='title' per_page=2 as page %}
+{% for post in page %}
+- {{ post.title }}
+{% endfor %}
+
+{% if page.next_url %}[Next]({{ page.next_url }}){% endif %}
+"""
+
+
+def _write_blog(tmp_path: Path) -> None:
+    (tmp_path / "content" / "blog").mkdir(parents=True)
+    (tmp_path / "content" / "blog" / "index.md").write_text(BLOG_INDEX)
+    (tmp_path / "content" / "about.md").write_text("# about")
+
+    for idx in range(1, 6):
+        (tmp_path / "content" / "blog" / f"post-{idx}.md").write_text(f"---\ntitle: Post {idx}\n---\n")
+
+
+def test_first_page(client, settings, tmp_path: Path):
+    settings.BASE_DIR = tmp_path
+    _write_blog(tmp_path)
+
+    response = client.get("/blog/")
+    assert response.status_code == 200
+
+    actual = response.content.decode()
+    assert "Post 1" in actual
+    assert "Post 3" not in actual
+    assert 'href="/blog/page/2/"' in actual
+
+
+def test_page(client, settings, tmp_path: Path):
+    settings.BASE_DIR = tmp_path
+    _write_blog(tmp_path)
+
+    response = client.get("/blog/page/2/")
+    assert response.status_code == 200
+
+    actual = response.content.decode()
+    assert "Post 1" not in actual
+    assert "Post 3" in actual
+    assert "Post 4" in actual
+    assert 'href="/blog/page/3/"' in actual
+
+
+def test_page_out_of_range(client, settings, tmp_path: Path):
+    settings.BASE_DIR = tmp_path
+    _write_blog(tmp_path)
+
+    response = client.get("/blog/page/4/")
+    assert response.status_code == 404
+
+
+def test_page_of_content_that_is_not_paginated(client, settings, tmp_path: Path):
+    settings.BASE_DIR = tmp_path
+    _write_blog(tmp_path)
+
+    response = client.get("/about/page/2/")
+    assert response.status_code == 404
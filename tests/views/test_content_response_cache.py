@@ -0,0 +1,239 @@
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from django.http import HttpResponse
+from django.utils.http import http_date
+
+from coltrane.dependencies import record_dependencies
+from coltrane.views import _render_content, checked_responses
+
+
+@pytest.fixture
+def response_cache_settings(settings, tmp_path: Path):
+    settings.BASE_DIR = tmp_path
+    settings.COLTRANE = {"RESPONSE_CACHE": {"SECONDS": 15}}
+    settings.CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": str(tmp_path),
+        }
+    }
+
+    (tmp_path / "content").mkdir()
+
+    checked_responses.clear()
+
+    return settings
+
+
+def test_response_cache_sets_etag(client, response_cache_settings, tmp_path: Path):
+    (tmp_path / "content" / "test.md").write_text("# test")
+
+    response = client.get("/test")
+    assert response.status_code == 200
+    assert response.headers["ETag"]
+    assert response.headers["Last-Modified"]
+
+
+def test_response_cache_last_modified(client, response_cache_settings, tmp_path: Path):
+    (tmp_path / "data").mkdir()
+    data_path = tmp_path / "data" / "author.json"
+    data_path.write_text('{"name": "Alice"}')
+
+    # Newer than the templates that render the page
+    os.utime(data_path, (2_000_000_000, 2_000_000_000))
+
+    (tmp_path / "content" / "test.md").write_text("{{ data.author.name }}")
+
+    response = client.get("/test")
+    assert response.headers["Last-Modified"] == http_date(2_000_000_000)
+
+    with patch("coltrane.views._render_content") as _render_content:
+        response = client.get("/test", headers={"If-Modified-Since": http_date(2_000_000_000)})
+
+    _render_content.assert_not_called()
+    assert response.status_code == 304
+
+
+def test_response_cache_does_not_render_again(client, response_cache_settings, tmp_path: Path):
+    (tmp_path / "content" / "test.md").write_text("# test")
+
+    expected = client.get("/test")
+
+    with patch("coltrane.views._render_content") as _render_content:
+        actual = client.get("/test")
+
+    _render_content.assert_not_called()
+    assert actual.status_code == 200
+    assert actual.content == expected.content
+    assert actual.headers["ETag"] == expected.headers["ETag"]
+
+
+def test_response_cache_not_modified(client, response_cache_settings, tmp_path: Path):
+    (tmp_path / "content" / "test.md").write_text("# test")
+
+    response = client.get("/test")
+    etag = response.headers["ETag"]
+
+    with patch("coltrane.views._render_content") as _render_content:
+        response = client.get("/test", headers={"If-None-Match": etag})
+
+    _render_content.assert_not_called()
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+
+
+def test_response_cache_content_changed(client, response_cache_settings, tmp_path: Path):
+    content_path = tmp_path / "content" / "test.md"
+    content_path.write_text("# test")
+    os.utime(content_path, (1, 1))
+
+    response = client.get("/test")
+    etag = response.headers["ETag"]
+
+    content_path.write_text("# test 2")
+
+    response = client.get("/test", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert '<h1 id="test-2">test 2</h1>' in response.content.decode()
+
+
+def test_response_cache_data_changed(client, response_cache_settings, tmp_path: Path):
+    (tmp_path / "data").mkdir()
+    data_path = tmp_path / "data" / "author.json"
+    data_path.write_text('{"name": "Alice"}')
+    os.utime(data_path, (1, 1))
+
+    (tmp_path / "content" / "test.md").write_text("{{ data.author.name }}")
+
+    response = client.get("/test")
+    assert "Alice" in response.content.decode()
+
+    data_path.write_text('{"name": "Bob"}')
+
+    response = client.get("/test")
+    assert "Bob" in response.content.decode()
+
+
+def test_response_cache_index_created(client, response_cache_settings, tmp_path: Path):
+    (tmp_path / "content" / "test").mkdir()
+    (tmp_path / "content" / "test" / "index.md").write_text("# index")
+
+    response = client.get("/test")
+    assert '<h1 id="index">index</h1>' in response.content.decode()
+
+    # A markdown file with the same slug takes precedence over the index
+    (tmp_path / "content" / "test.md").write_text("# test")
+
+    response = client.get("/test")
+    assert '<h1 id="test">test</h1>' in response.content.decode()
+
+
+def test_response_cache_is_not_enabled(client, settings, tmp_path: Path):
+    settings.BASE_DIR = tmp_path
+
+    (tmp_path / "content").mkdir()
+    (tmp_path / "content" / "test.md").write_text("# test")
+
+    response = client.get("/test")
+    assert response.status_code == 200
+    assert "ETag" not in response.headers
+
+
+def test_response_cache_keeps_headers(client, response_cache_settings):
+    rendered_response = HttpResponse("<h1>test</h1>", content_type="text/html; charset=utf-8")
+    rendered_response.headers["Cache-Control"] = "max-age=15"
+    rendered_response.headers["Content-Language"] = "en"
+
+    with patch("coltrane.views._render_content", return_value=rendered_response):
+        expected = client.get("/test")
+
+    with patch("coltrane.views._render_content") as _render_content:
+        actual = client.get("/test")
+
+    _render_content.assert_not_called()
+    assert actual.headers["Cache-Control"] == "max-age=15"
+    assert actual.headers["Content-Language"] == "en"
+    assert actual.headers == expected.headers
+
+
+def test_response_cache_view_cache_records_content(rf, response_cache_settings, tmp_path: Path):
+    content_path = tmp_path / "content" / "test.md"
+    content_path.write_text("# test")
+
+    context = {"template": "coltrane/content.html", "content": "<h1>test</h1>"}
+
+    # Rendered from the view cache, so the markdown file isn't rendered
+    with patch("coltrane.views._get_from_cache_if_enabled", return_value=("coltrane/content.html", context)):
+        with record_dependencies() as dependencies:
+            _render_content(rf.get("/test"), "test")
+
+    assert f"content:{content_path}" in dependencies
+
+
+def test_response_cache_skips_csrf_token(client, response_cache_settings, tmp_path: Path):
+    (tmp_path / "content" / "form.md").write_text("<form>{% csrf_token %}</form>")
+
+    response = client.get("/form")
+    assert response.status_code == 200
+    assert "csrfmiddlewaretoken" in response.content.decode()
+
+    with patch("coltrane.views._render_content", return_value=HttpResponse("rendered")) as _render_content:
+        response = client.get("/form")
+
+    _render_content.assert_called_once()
+    assert response.content == b"rendered"
+
+
+def test_response_cache_skips_cookies(client, response_cache_settings):
+    rendered_response = HttpResponse("<h1>test</h1>")
+    rendered_response.set_cookie("visitor", "1")
+
+    with patch("coltrane.views._render_content", return_value=rendered_response):
+        client.get("/test")
+
+    with patch("coltrane.views._render_content", return_value=HttpResponse("rendered")) as _render_content:
+        client.get("/test")
+
+    _render_content.assert_called_once()
+
+
+def test_response_cache_skips_vary_cookie(client, response_cache_settings):
+    rendered_response = HttpResponse("<h1>test</h1>")
+    rendered_response.headers["Vary"] = "Cookie"
+
+    with patch("coltrane.views._render_content", return_value=rendered_response):
+        client.get("/test")
+
+    with patch("coltrane.views._render_content", return_value=HttpResponse("rendered")) as _render_content:
+        client.get("/test")
+
+    _render_content.assert_called_once()
+
+
+def test_response_cache_checks_files_once_a_second(client, response_cache_settings, tmp_path: Path):
+    content_path = tmp_path / "content" / "test.md"
+    content_path.write_text("# test")
+    os.utime(content_path, (1, 1))
+
+    client.get("/test")
+
+    with patch("coltrane.views.monotonic", return_value=100):
+        client.get("/test")
+
+        # The files were just checked, so the change isn't noticed yet
+        content_path.write_text("# test 2")
+
+        with patch("coltrane.views.CachedResponse.is_current") as is_current:
+            response = client.get("/test")
+
+        is_current.assert_not_called()
+        assert '<h1 id="test">test</h1>' in response.content.decode()
+
+    with patch("coltrane.views.monotonic", return_value=101):
+        response = client.get("/test")
+
+    assert '<h1 id="test-2">test 2</h1>' in response.content.decode()
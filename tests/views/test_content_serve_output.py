@@ -0,0 +1,93 @@
+import gzip
+import os
+from pathlib import Path
+
+import pytest
+
+from coltrane.compression import compress_file, get_encodings
+from coltrane.views import _get_output_response
+
+
+@pytest.fixture
+def serve_output_settings(settings, tmp_path: Path):
+    settings.BASE_DIR = tmp_path
+    settings.COLTRANE = {"SERVE_OUTPUT": True}
+
+    (tmp_path / "content").mkdir()
+    (tmp_path / "output" / "test").mkdir(parents=True)
+
+    html_path = tmp_path / "output" / "test" / "index.html"
+    html_path.write_text("<h1>output</h1>")
+    os.utime(html_path, (1, 1))
+
+    compress_file(html_path, get_encodings())
+
+    return settings
+
+
+def test_serve_output_gzip(client, serve_output_settings):
+    response = client.get("/test", headers={"Accept-Encoding": "gzip"})
+
+    assert response.status_code == 200
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.headers["Content-Type"] == "text/html; charset=utf-8"
+    assert "Accept-Encoding" in response.headers["Vary"]
+    assert gzip.decompress(response.content) == b"<h1>output</h1>"
+
+
+def test_serve_output_brotli(client, serve_output_settings):
+    response = client.get("/test", headers={"Accept-Encoding": "gzip, br"})
+
+    assert response.status_code == 200
+    assert response.headers["Content-Encoding"] == "br"
+
+
+def test_serve_output_uncompressed(client, serve_output_settings):
+    response = client.get("/test")
+
+    assert response.status_code == 200
+    assert "Content-Encoding" not in response.headers
+    assert response.content == b"<h1>output</h1>"
+
+
+def test_serve_output_missing_renders_markdown(client, serve_output_settings, tmp_path: Path):
+    (tmp_path / "content" / "other.md").write_text("# other")
+
+    response = client.get("/other")
+
+    assert response.status_code == 200
+    assert '<h1 id="other">other</h1>' in response.content.decode()
+
+
+def test_serve_output_disabled(client, settings, tmp_path: Path):
+    settings.BASE_DIR = tmp_path
+
+    (tmp_path / "content").mkdir()
+    (tmp_path / "content" / "test.md").write_text("# test")
+    (tmp_path / "output" / "test").mkdir(parents=True)
+    (tmp_path / "output" / "test" / "index.html").write_text("<h1>output</h1>")
+
+    response = client.get("/test")
+
+    assert response.status_code == 200
+    assert '<h1 id="test">test</h1>' in response.content.decode()
+
+
+@pytest.mark.parametrize("slug", ["../secret", "test/../../secret", "test//index", "./test"])
+def test_serve_output_outside_of_output_directory(rf, serve_output_settings, tmp_path: Path, slug):
+    (tmp_path / "secret").mkdir()
+    (tmp_path / "secret" / "index.html").write_text("<h1>secret</h1>")
+
+    actual = _get_output_response(rf.get("/"), slug)
+
+    assert actual is None
+
+
+def test_serve_output_symlink_outside_of_output_directory(rf, serve_output_settings, tmp_path: Path):
+    (tmp_path / "secret").mkdir()
+    (tmp_path / "secret" / "index.html").write_text("<h1>secret</h1>")
+    (tmp_path / "output" / "linked").symlink_to(tmp_path / "secret")
+
+    actual = _get_output_response(rf.get("/"), "linked")
+
+    assert actual is None
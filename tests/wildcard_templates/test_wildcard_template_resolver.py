@@ -0,0 +1,129 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from coltrane.wildcard_templates import WildcardTemplateResolver, get_potential_wildcard_templates
+
+
+@pytest.fixture
+def templates_directory(tmp_path: Path) -> Path:
+    templates_directory = tmp_path / "templates"
+    templates_directory.mkdir()
+
+    return templates_directory
+
+
+def _write_template(templates_directory: Path, template_name: str) -> None:
+    path = templates_directory / template_name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(template_name)
+
+
+def test_resolve(templates_directory: Path):
+    _write_template(templates_directory, "*.html")
+
+    actual = WildcardTemplateResolver().resolve("test", [templates_directory])
+
+    assert actual == "*.html"
+
+
+def test_resolve_missing(templates_directory: Path):
+    _write_template(templates_directory, "*.html")
+
+    actual = WildcardTemplateResolver().resolve("test/this", [templates_directory])
+
+    assert actual is None
+
+
+def test_resolve_ignores_templates_without_wildcards(templates_directory: Path):
+    _write_template(templates_directory, "test/this.html")
+
+    actual = WildcardTemplateResolver().resolve("test/this", [templates_directory])
+
+    assert actual is None
+
+
+def test_resolve_literal_segment(templates_directory: Path):
+    _write_template(templates_directory, "blog/*.html")
+    _write_template(templates_directory, "news/*.html")
+
+    actual = WildcardTemplateResolver().resolve("news/today", [templates_directory])
+
+    assert actual == "news/*.html"
+
+
+@pytest.mark.parametrize(
+    "slug",
+    [
+        "test",
+        "test/this",
+        "test/this/now",
+        "test/this/now/later",
+    ],
+)
+def test_resolve_same_order_as_potential_wildcard_templates(templates_directory: Path, slug: str):
+    # Only templates with the same number of segments as the slug can match
+    potential_wildcard_templates = [
+        template_name
+        for template_name in dict.fromkeys(get_potential_wildcard_templates(slug))
+        if template_name.count("/") == slug.count("/")
+    ]
+    resolver = WildcardTemplateResolver()
+
+    # Remove the best template one at a time; the next one should be resolved every time
+    for template_name in potential_wildcard_templates:
+        _write_template(templates_directory, template_name)
+
+    for template_name in potential_wildcard_templates:
+        assert resolver.resolve(slug, [templates_directory]) == template_name
+
+        (templates_directory / template_name).unlink()
+
+    assert resolver.resolve(slug, [templates_directory]) is None
+
+
+def test_resolve_first_directory(tmp_path: Path):
+    _write_template(tmp_path / "first", "*.html")
+    _write_template(tmp_path / "second", "*.html")
+
+    actual = WildcardTemplateResolver().resolve("test", [tmp_path / "missing", tmp_path / "first", tmp_path / "second"])
+
+    assert actual == "*.html"
+
+
+def test_resolve_prefix(tmp_path: Path):
+    _write_template(tmp_path, "*.html")
+    _write_template(tmp_path, "example/templates/blog/*.html")
+
+    resolver = WildcardTemplateResolver()
+
+    assert resolver.resolve("blog/post", [tmp_path], prefix="example/templates") == "example/templates/blog/*.html"
+    assert resolver.resolve("post", [tmp_path], prefix="example/templates") is None
+    assert resolver.resolve("post", [tmp_path]) == "*.html"
+
+
+def test_resolve_refreshes_when_template_is_added(templates_directory: Path):
+    resolver = WildcardTemplateResolver()
+
+    assert resolver.resolve("blog/post", [templates_directory]) is None
+
+    _write_template(templates_directory, "blog/*.html")
+
+    # Make sure the last modified time is different even on file systems with a coarse resolution
+    os.utime(templates_directory, ns=(0, 0))
+
+    assert resolver.resolve("blog/post", [templates_directory]) == "blog/*.html"
+
+
+def test_resolve_refreshes_when_template_is_removed(templates_directory: Path):
+    _write_template(templates_directory, "blog/*.html")
+
+    resolver = WildcardTemplateResolver()
+
+    assert resolver.resolve("blog/post", [templates_directory]) == "blog/*.html"
+
+    (templates_directory / "blog" / "*.html").unlink()
+    os.utime(templates_directory / "blog", ns=(0, 0))
+
+    assert resolver.resolve("blog/post", [templates_directory]) is None